@@ -0,0 +1,61 @@
+import pandas as pd
+
+
+# Named aggregations computed per (team, season) in a single groupby pass.
+# Only additive quantities (sums and counts) are stored, so the all-seasons rollup is a sum of them.
+PARTIAL_AGGREGATES = {
+    'matches': ('gf', 'size'),
+    'goals_scored': ('gf', 'sum'),
+    'goals_conceded': ('ga', 'sum'),
+    'cmp_sum': ('cmp%', 'sum'),
+    'cmp_count': ('cmp%', 'count'),
+    'poss_sum': ('poss', 'sum'),
+    'poss_count': ('poss', 'count'),
+}
+
+
+# Function to aggregate raw match rows into additive per (team_id, season_id) totals.
+def partial_aggregates(match_rows):
+    totals = match_rows.groupby(['team_id', 'season_id'], sort=False).agg(**PARTIAL_AGGREGATES)
+    return totals.astype('float64').astype({'matches': 'int64', 'cmp_count': 'int64', 'poss_count': 'int64'})
+
+
+# Function to derive the mean columns shown on the dashboards from the additive totals.
+def _with_means(totals):
+    totals = totals.copy()
+    totals['cmp_mean'] = totals['cmp_sum'] / totals['cmp_count']
+    totals['poss_mean'] = totals['poss_sum'] / totals['poss_count']
+    return totals
+
+
+# Materialized summary of the match table used by create_dashboard and create_dashboard_allseasons.
+# by_team_season is keyed by (team_id, season_id); all_seasons is the per-team rollup keyed by team_id.
+# A summary is never modified: with_seasons() derives a new one in which only some seasons are re-aggregated.
+class TeamSeasonSummary:
+
+    def __init__(self, epl_teams_df=None, totals=None):
+        if totals is None:
+            totals = partial_aggregates(epl_teams_df).sort_index()
+        self._totals = totals
+        self.by_team_season = _with_means(totals)
+        self.all_seasons = _with_means(totals.groupby(level='team_id').sum())
+
+    # Function to create a new summary in which the given seasons are re-aggregated from match_rows
+    # (their rows only) and the totals of every other season are reused. This summary is not changed.
+    def with_seasons(self, match_rows, season_ids):
+        kept = self._totals[~self._totals.index.get_level_values('season_id').isin(list(season_ids))]
+        return TeamSeasonSummary(totals=pd.concat([kept, partial_aggregates(match_rows)]).sort_index())
+
+    # Function to return the summary row for a team-season, or None if it is unknown.
+    def team_season(self, team_id, season_id):
+        try:
+            return self.by_team_season.loc[(team_id, season_id)]
+        except KeyError:
+            return None
+
+    # Function to return the all-seasons summary row for a team, or None if it is unknown.
+    def team_all_seasons(self, team_id):
+        try:
+            return self.all_seasons.loc[team_id]
+        except KeyError:
+            return None
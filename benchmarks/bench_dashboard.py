@@ -0,0 +1,259 @@
+# Benchmark harness for every stage of the dashboard, on synthetic datasets of growing size.
+# For each scale a fresh worker process generates a dataset (see synthetic_data.py), renders the
+# app end to end through Streamlit's AppTest (no browser) and then times each stage in isolation:
+#   csv_read          reading the five source CSVs
+#   store_import      importing the match CSVs into an empty match store
+#   build_datasets    load / clean / merge from a populated match store
+#   artifact_load     reading the prebuilt Parquet artifact (the app's startup path)
+#   team_index        building the (team, season) index
+#   filter_team       one filter_team lookup (team-season, team and season selections)
+#   team_summary      building the per team-season summary
+#   season_progress   the grouped cumulative points / form pass over every team-season
+#   standings_engine  precomputing the table of every season after every matchweek
+#   as_of_table       one as-of-matchweek table lookup
+#   split_index       precomputing every team's opponent / venue / formation / referee splits
+#   split_query       one split lookup in the index (each split of the team in turn)
+#   split_scan        the same split by scanning and grouping the match table, for comparison
+#   head_to_head      one head-to-head record and match list lookup
+#   trendline_fit     fitting the correlation trendlines of one team-season
+#   team_page_figures building every chart of a team-season page (figure cache cleared)
+#   standings_view    building the season standings view (figure cache cleared)
+#   points_race       building the season points race of every team (figure cache cleared)
+#   matchweek_table   the season view's table-by-matchweek section (what a slider move reruns)
+# Results go to a JSON file (default benchmarks/results/dashboard-<commit>.json); pass --compare
+# with an earlier file to print the change of every stage.
+# Run from the repository root: python benchmarks/bench_dashboard.py [--scales 1 10 100] [--repeat 5]
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_DIR, 'streamlit_demo.py')
+RESULTS_DIR = os.path.join(REPO_DIR, 'benchmarks', 'results')
+
+sys.path.insert(0, REPO_DIR)
+
+# Selections rendered by the end-to-end runs and timed by the stage benchmarks; they exist at every scale.
+TEAM = 'Arsenal'
+SEASON = '2023/24'
+
+
+def _summary(seconds):
+    return {'median_s': statistics.median(seconds), 'min_s': min(seconds), 'runs': len(seconds)}
+
+
+# Function to time a stage `repeat` times; setup() runs before every repetition and is not timed.
+def timed(stages, name, run, repeat, setup=None):
+    seconds = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - start)
+    stages[name] = _summary(seconds)
+
+
+# Function to render the app through AppTest: first run, the three page types, and a rerun.
+def end_to_end(stages, repeat, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+
+    def run(name):
+        start = time.perf_counter()
+        app.run()
+        seconds = time.perf_counter() - start
+        if app.exception:
+            raise RuntimeError(f'{name}: {app.exception[0].value}')
+        return seconds
+
+    stages['e2e_first_run'] = _summary([run('e2e_first_run')])
+    for name, team, season in (
+        ('e2e_team_season', TEAM, SEASON),
+        ('e2e_team_all_seasons', TEAM, 'All seasons'),
+        ('e2e_standings_view', '', SEASON),
+    ):
+        app.sidebar.selectbox[0].set_value(team)
+        app.sidebar.selectbox[1].set_value(season)
+        stages[name] = _summary([run(name)])
+    app.sidebar.selectbox[0].set_value(TEAM)
+    app.sidebar.selectbox[1].set_value(SEASON)
+    stages['e2e_team_season_rerun'] = _summary([run('e2e_team_season_rerun') for _ in range(repeat)])
+
+
+# Function to run every benchmark of one scale; EPL_DATA_DIR must point at an empty directory.
+def run_scale(scale, repeat, timeout):
+    import synthetic_data
+
+    data_dir = os.environ['EPL_DATA_DIR']
+    start = time.perf_counter()
+    dataset = synthetic_data.generate(data_dir, scale)
+    dataset['generate_s'] = time.perf_counter() - start
+    synthetic_data.register_teams(scale)
+
+    import pandas as pd
+
+    import data_loader
+    from aggregates import TeamSeasonSummary
+    from match_store import MatchStore
+    from regression import CORRELATION_PAIRS, fit_pairs
+    from season_progress import add_progress_columns
+    from split_index import SPLITS, SplitIndex, scan_split
+    from standings_engine import StandingsEngine
+    from team_registry import season_id
+    from team_index import TeamSeasonIndex
+
+    stages = {}
+    # Builds the Parquet artifact and the app's match store; the app then starts from them as in production.
+    data_loader.load_datasets()
+    end_to_end(stages, repeat, timeout)
+
+    timed(stages, 'csv_read', lambda: [pd.read_csv(data_loader._source_path(name)) for name in data_loader.SOURCE_FILES], repeat)
+
+    store_dirs = []
+    timed(stages, 'store_import', lambda: data_loader.sync_match_store(MatchStore(store_dirs[-1])), max(1, repeat // 2),
+          setup=lambda: store_dirs.append(tempfile.mkdtemp(dir=data_dir)))
+    timed(stages, 'build_datasets', lambda: data_loader.build_datasets(MatchStore(store_dirs[-1])), repeat)
+    timed(stages, 'artifact_load', data_loader.load_datasets, repeat)
+
+    epl_teams_df, _ = data_loader.load_datasets()
+    timed(stages, 'team_index', lambda: TeamSeasonIndex(epl_teams_df), repeat)
+    team_index = TeamSeasonIndex(epl_teams_df)
+    selections = [(TEAM, SEASON), (TEAM, 'All seasons'), ('', SEASON)] * 100
+    timed(stages, 'filter_team', lambda: [team_index.slice(team, season) for team, season in selections], repeat)
+    stages['filter_team'] = {key: value / len(selections) if key.endswith('_s') else value for key, value in stages['filter_team'].items()}
+    timed(stages, 'team_summary', lambda: TeamSeasonSummary(epl_teams_df), repeat)
+    timed(stages, 'season_progress', lambda: add_progress_columns(epl_teams_df), repeat)
+    timed(stages, 'standings_engine', lambda: StandingsEngine(epl_teams_df), repeat)
+    standings_engine = StandingsEngine(epl_teams_df)
+    weeks = list(range(1, standings_engine.matchweeks(season_id(SEASON)) + 1)) * 10
+    timed(stages, 'as_of_table', lambda: [standings_engine.table(season_id(SEASON), week) for week in weeks], repeat)
+    stages['as_of_table'] = {key: value / len(weeks) if key.endswith('_s') else value for key, value in stages['as_of_table'].items()}
+
+    timed(stages, 'split_index', lambda: SplitIndex(team_index.df), repeat)
+    split_index = SplitIndex(team_index.df)
+    splits = list(SPLITS) * 25
+    timed(stages, 'split_query', lambda: [split_index.split(TEAM, column) for column in splits], repeat)
+    team_id = team_index.registry.lookup(TEAM)
+    timed(stages, 'split_scan', lambda: [scan_split(team_index.df, team_id, column) for column in splits], repeat)
+    opponents = split_index.opponents(TEAM)
+    timed(stages, 'head_to_head', lambda: [split_index.head_to_head(TEAM, opponent) for opponent in opponents], repeat)
+    for name, count in (('split_query', len(splits)), ('split_scan', len(splits)), ('head_to_head', len(opponents))):
+        stages[name] = {key: value / count if key.endswith('_s') else value for key, value in stages[name].items()}
+    team_df = team_index.slice(TEAM, SEASON)
+    timed(stages, 'trendline_fit', lambda: fit_pairs(team_df, CORRELATION_PAIRS), repeat)
+
+    # The page functions run in Streamlit's bare mode: their st.* calls are no-ops outside a session.
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        import streamlit_demo
+
+        def clear_caches():
+            streamlit_demo.figure_cache.clear()
+            streamlit_demo.trendline_cache._fits.clear()
+
+        def team_page():
+            team_df = streamlit_demo.filter_team(TEAM, SEASON)
+            streamlit_demo.create_dashboard(team_df)
+            streamlit_demo.create_points_chart(team_df)
+            streamlit_demo.correelation_pass_poss(team_df)
+            streamlit_demo.correlation_goals_cmp(team_df)
+            streamlit_demo.correlation_poss_gf(team_df)
+            streamlit_demo.correlation_goals_xg(team_df)
+            streamlit_demo.correlation_poss_ga(team_df)
+
+        timed(stages, 'team_page_figures', team_page, repeat, setup=clear_caches)
+        timed(stages, 'standings_view', lambda: streamlit_demo.create_standings_view(SEASON), repeat, setup=clear_caches)
+        timed(stages, 'points_race', lambda: streamlit_demo.create_points_race(SEASON), repeat, setup=clear_caches)
+        # Outside a session the fragment wrapper skips its body, so the section itself is timed.
+        matchweek_table = getattr(streamlit_demo.create_matchweek_table, '__wrapped__', streamlit_demo.create_matchweek_table)
+        timed(stages, 'matchweek_table', lambda: matchweek_table(SEASON), repeat)
+
+    return {'dataset': dataset, 'stages': stages}
+
+
+def _git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_DIR, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return commit + ('-dirty' if dirty else '')
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    print(f'\nChange against {baseline["commit"]} (median):')
+    for scale, result in results['scales'].items():
+        previous = baseline['scales'].get(scale)
+        if previous is None:
+            continue
+        for name, stage in result['stages'].items():
+            if name in previous['stages']:
+                ratio = stage['median_s'] / previous['stages'][name]['median_s']
+                print(f'  {scale:>4}x {name:24s} {ratio:6.2f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time every dashboard stage on synthetic datasets.')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=600, help='seconds allowed per AppTest run')
+    parser.add_argument('--output', help='result file (default benchmarks/results/dashboard-<commit>.json)')
+    parser.add_argument('--compare', help='earlier result file to compare against')
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        print(json.dumps(run_scale(args.worker, args.repeat, args.timeout)))
+        return
+
+    commit = _git_commit()
+    results = {
+        'commit': commit,
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'scales': {},
+    }
+    for scale in args.scales:
+        # Every scale runs in its own process and data directory, so no cache or import is shared.
+        with tempfile.TemporaryDirectory() as data_dir:
+            worker = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--worker', str(scale), '--repeat', str(args.repeat), '--timeout', str(args.timeout)],
+                cwd=REPO_DIR, env=dict(os.environ, EPL_DATA_DIR=data_dir), capture_output=True, text=True,
+            )
+        if worker.returncode != 0:
+            sys.stderr.write(worker.stderr)
+            sys.exit(f'scale {scale}x failed')
+        result = json.loads(worker.stdout.strip().splitlines()[-1])
+        results['scales'][str(scale)] = result
+
+        print(f'{scale}x: {result["dataset"]["rows"]} match rows, {result["dataset"]["teams"]} teams')
+        for name, stage in result['stages'].items():
+            print(f'  {name:24s} median {stage["median_s"] * 1000:10.2f} ms   min {stage["min_s"] * 1000:10.2f} ms')
+
+    output = args.output or os.path.join(RESULTS_DIR, f'dashboard-{commit}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=1)
+    print(f'Results written to {output}')
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# Benchmark of the Match Finder distance ranking: vectorized haversine + partial sort
+# against the original iterrows + geopy geodesic loop, on synthetic fixture tables.
+# Run from the repository root: python benchmarks/bench_distance.py
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from geopy.distance import geodesic
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from distance import GEODESIC_REL_TOLERANCE, nearest
+
+
+# Function to create n fixtures with stadium coordinates spread over Western Europe.
+def synthetic_fixtures(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Home Team': [f'Home {i}' for i in range(n)],
+        'Away Team': [f'Away {i}' for i in range(n)],
+        'Latitude': rng.uniform(36.0, 58.0, n),
+        'Longitude': rng.uniform(-9.0, 15.0, n),
+    })
+
+
+# Function reproducing the original row-by-row geodesic ranking.
+def geodesic_ranking(data, origin, k):
+    distances = []
+    for _, row in data.iterrows():
+        distances.append(geodesic(origin, (row['Latitude'], row['Longitude'])).kilometers)
+    data = data.copy()
+    data['Distance (km)'] = distances
+    return data.sort_values(by='Distance (km)').head(k)
+
+
+def main():
+    origin = (51.5072, -0.1276)  # London
+    for n in (100, 1000, 5000):
+        fixtures = synthetic_fixtures(n)
+
+        start = time.perf_counter()
+        expected = geodesic_ranking(fixtures, origin, 5)
+        geodesic_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = nearest(fixtures, origin, k=5)
+        vectorized_seconds = time.perf_counter() - start
+
+        all_distances = nearest(fixtures, origin, k=n)['Distance (km)']
+        reference = [geodesic(origin, (lat, lon)).kilometers
+                     for lat, lon in zip(fixtures.loc[all_distances.index, 'Latitude'], fixtures.loc[all_distances.index, 'Longitude'])]
+        max_rel_error = float(np.max(np.abs(all_distances.to_numpy() - reference) / reference))
+
+        print(f'n={n:5d}  geodesic loop {geodesic_seconds * 1000:9.1f} ms  '
+              f'vectorized {vectorized_seconds * 1000:7.2f} ms  '
+              f'max rel. error {max_rel_error:.4%}  '
+              f'same top-5: {list(result.index) == list(expected.index)}')
+        assert max_rel_error < GEODESIC_REL_TOLERANCE
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# Benchmark of the ESPN fixtures parser: single-pass strainer parser against the original
+# full-tree, per-table DataFrame rebuild. Pass a directory of saved ESPN fixture pages
+# ('<YYYYMMDD>.html', e.g. the EPL_FIXTURES_DIR recordings); without one, synthetic pages of
+# increasing size are generated.
+# Run from the repository root: python benchmarks/bench_fixture_parser.py [pages_dir]
+import glob
+import os
+import random
+import sys
+import time
+import warnings
+from datetime import timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixture_parser import parse_fixtures
+
+VENUES = [
+    ('Emirates Stadium', 'London', 'England'),
+    ('Santiago Bernabeu', 'Madrid', 'Spain'),
+    ('Allianz Arena', 'Munich', 'Germany'),
+    ('San Siro', 'Milan', 'Italy'),
+    ('Parc des Princes', 'Paris', 'France'),
+    ('MetLife Stadium', 'East Rutherford', 'USA'),
+]
+
+
+# Function to generate an ESPN-like fixtures page with n_tables competitions of n_rows matches.
+def synthetic_page(n_tables, n_rows, seed=0):
+    rng = random.Random(seed)
+    parts = ['<html><body><header>' + '<div>nav</div>' * 200 + '</header>']
+    for t in range(n_tables):
+        parts.append('<table class="Table"><thead><tr><th>match</th><th></th><th>time</th>'
+                     '<th>TV</th><th>location</th><th>tickets</th></tr></thead><tbody>')
+        for i in range(n_rows):
+            stadium, city, country = rng.choice(VENUES)
+            parts.append(f'<tr><td><a>Home {t}-{i}</a></td><td><span>v</span><a>Away {t}-{i}</a></td>'
+                         f'<td><a>{rng.randint(1, 12)}:{rng.choice(["00", "30"])} {rng.choice(["AM", "PM"])}</a></td>'
+                         f'<td>ESPN</td><td><div>{stadium}, {city}, {country}</div></td><td>Tickets</td></tr>')
+        parts.append('</tbody></table>')
+    parts.append('<footer>' + '<p>links</p>' * 200 + '</footer></body></html>')
+    return ''.join(parts)
+
+
+# Function reproducing the original parsing code of the Match Finder.
+def legacy_parse(page_text):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(page_text, 'html.parser')
+    table = soup.find_all('table', class_='Table')
+    all_rows = []
+    for tabl in table:
+        for row in tabl.find_all('tr'):
+            all_rows.append([cell.get_text(strip=True) for cell in row.find_all(['td', 'th'])])
+        df = pd.DataFrame(all_rows, columns=['Home Team', 'Away Team', 'Time', '4', 'Location', '6'])
+        df = df[~df.apply(lambda row: row.astype(str).str.contains('location').any(), axis=1)]
+        df = df.drop(columns=['4', '6'])
+        df['Away Team'] = df['Away Team'].str[1:]
+    time_format = '%I:%M %p'
+    df['Time'] = pd.to_datetime(df['Time'], format=time_format, errors='coerce')
+    df = df.dropna(subset=['Time'])
+    df['Time'] = (df['Time'] - timedelta(hours=3, minutes=30)).dt.strftime(time_format)
+    df[['Stadium', 'City', 'Country']] = df['Location'].str.split(',', expand=True, n=2)
+    df = df.drop(columns=['Location']).reset_index(drop=True)
+    df['Location'] = df['City'] + ', ' + df['Country']
+    df = df.drop(['City', 'Country'], axis=1).dropna(subset=['Location'])
+    return df[df['Location'].str.endswith(('England', 'Spain', 'Italy', 'France', 'Germany'))]
+
+
+def _best_of(func, page_text, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(page_text)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    warnings.simplefilter('ignore')
+    if len(sys.argv) > 1:
+        pages = [(os.path.basename(path), open(path, encoding='utf-8').read())
+                 for path in sorted(glob.glob(os.path.join(sys.argv[1], '*.html')))]
+    else:
+        pages = [(f'synthetic {n_tables}x{n_rows}', synthetic_page(n_tables, n_rows))
+                 for n_tables, n_rows in ((5, 10), (20, 10), (40, 12))]
+
+    for name, page_text in pages:
+        legacy_seconds, legacy = _best_of(legacy_parse, page_text)
+        new_seconds, fixtures = _best_of(parse_fixtures, page_text)
+        print(f'{name:22s} {len(page_text) / 1024:7.0f} KiB  legacy {legacy_seconds * 1000:8.1f} ms  '
+              f'parse_fixtures {new_seconds * 1000:7.1f} ms  rows {len(legacy)} / {len(fixtures)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# Benchmark of the load path the app runs when the source files change, for archives of growing size:
+# the match store sync (upserting a new matchweek of 2023_matches.csv, which writes only the new rows
+# to the current season's partition) and build_datasets (reading every partition, preparing the rows
+# and merging the standings), as run by Dataset.load before the Parquet artifact is written.
+# Larger archives are made by copying the real seasons under earlier season years, so only the number
+# of stored seasons grows.
+# Run from the repository root: python benchmarks/bench_partitions.py [--copies 1 4 16]
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_loader import _file_digest, _source_path, build_datasets, epl_teams_csv, update_teams_csv
+from match_store import MatchStore
+
+
+# Function to build a store holding `copies` times the seasons of the match CSVs, recorded as
+# imported from the current source files so build_datasets does not re-import the archive.
+def synthetic_store(directory, rows, copies):
+    store = MatchStore(directory)
+    seasons = sorted(rows['season'].unique())
+    latest = seasons[-1]
+    for copy in range(copies):
+        for season in seasons:
+            year = season - copy * len(seasons)
+            season_rows = rows[rows['season'] == season].assign(season=year)
+            store.replace_season(year, season_rows, frozen=year < latest)
+    store.set_source_digest(epl_teams_csv, _file_digest(_source_path(epl_teams_csv)))
+    store.set_source_digest(update_teams_csv, _file_digest(_source_path(update_teams_csv)))
+    return store
+
+
+# Function to make the rows of a new matchweek: the latest matchweek of the current season a week later.
+def next_matchweek(rows):
+    current = rows[rows['season'] == rows['season'].max()]
+    last = current[current['date'] == current.groupby('team')['date'].transform('max')]
+    return last.assign(date=(pd.to_datetime(last['date']) + pd.Timedelta(days=7)).dt.strftime('%Y-%m-%d'))
+
+
+def timed(run):
+    start = time.perf_counter()
+    result = run()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the match store sync and dataset build for growing archives.')
+    parser.add_argument('--copies', type=int, nargs='+', default=[1, 4, 16])
+    args = parser.parse_args()
+
+    rows = pd.concat([pd.read_csv(_source_path(epl_teams_csv)), pd.read_csv(_source_path(update_teams_csv))], ignore_index=True)
+    rows = rows.drop(columns=[c for c in rows.columns if c.startswith('Unnamed:')]).drop_duplicates(subset=['team', 'date'])
+    new_rows = next_matchweek(rows)
+
+    for copies in args.copies:
+        with tempfile.TemporaryDirectory() as directory:
+            synthetic_store(directory, rows, copies)
+
+            # Every step uses a fresh store, as every dataset build does, so nothing is served from memory.
+            upsert_seconds, written = timed(lambda: MatchStore(directory).upsert(new_rows))
+            build_seconds, (epl_teams_df, _) = timed(lambda: build_datasets(MatchStore(directory)))
+
+            print(f'{len(MatchStore(directory).seasons()):3d} seasons {len(epl_teams_df):7d} rows  '
+                  f'upsert matchweek {upsert_seconds * 1000:6.1f} ms ({written} rows)  '
+                  f'build_datasets {build_seconds * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# Benchmark of the chart payloads as seasons accumulate: for the 'All seasons' view of one team with
+# growing history, the JSON payload of every correlation chart and the time to build it and to
+# serialize it (which Streamlit does on every rerun), unbinned and binned on the server.
+# The history is the team's real matches repeated once per extra 7 seasons, with a little noise.
+# Run from the repository root: python benchmarks/bench_payload.py [--team Arsenal] [--seasons 7 28 112 448]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_loader
+from chart_payload import scatter_chart
+from regression import CORRELATION_PAIRS, add_trendline, fit_pairs
+
+
+# Function to repeat a team's match rows until they cover `seasons` seasons, jittering the copies.
+def team_history(team_df, seasons, seed=0):
+    n_seasons = team_df['season_id'].nunique()
+    copies = max(-(-seasons // n_seasons), 1)
+    history = pd.concat([team_df] * copies, ignore_index=True)
+    rng = np.random.default_rng(seed)
+    for column in ['cmp%', 'poss', 'xg']:
+        values = history[column].to_numpy(dtype='float64')
+        history[column] = values + rng.normal(0, 0.5, len(values)) * (np.arange(len(values)) >= len(team_df))
+    return history
+
+
+def measure(team_df, max_points, repeat):
+    import plotly.io as pio
+
+    fits = fit_pairs(team_df, CORRELATION_PAIRS)
+    build_seconds, json_seconds, nbytes, traces = 0.0, 0.0, 0, set()
+    for x, y in CORRELATION_PAIRS:
+        start = time.perf_counter()
+        fig = add_trendline(scatter_chart(team_df, x, y, max_points=max_points), fits[(x, y)])
+        build_seconds += time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(repeat):
+            payload = pio.to_json(fig, validate=False)
+        json_seconds += (time.perf_counter() - start) / repeat
+        nbytes += len(payload)
+        traces.add(fig.data[0].type)
+    return nbytes, build_seconds, json_seconds, '/'.join(sorted(traces))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the correlation chart payloads of a growing team history.')
+    parser.add_argument('--team', default='Arsenal')
+    parser.add_argument('--seasons', type=int, nargs='+', default=[7, 28, 112, 448])
+    parser.add_argument('--max-points', type=int, default=400)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    epl_teams_df, _ = data_loader.load_datasets()
+    team_df = epl_teams_df[epl_teams_df['team'] == args.team].reset_index(drop=True)
+
+    print(f'{len(CORRELATION_PAIRS)} correlation charts of {args.team}, binned above {args.max_points} points')
+    print(f'{"seasons":>8} {"rows":>7}  {"mode":8} {"trace":10} {"KB":>8} {"build ms":>9} {"json ms":>8}')
+    for seasons in args.seasons:
+        history = team_history(team_df, seasons)
+        for mode, max_points in [('raw', len(history)), ('binned', args.max_points)]:
+            nbytes, build_seconds, json_seconds, trace = measure(history, max_points, args.repeat)
+            print(f'{seasons:8d} {len(history):7d}  {mode:8} {trace:10} {nbytes / 1024:8.1f} {build_seconds * 1000:9.1f} {json_seconds * 1000:8.2f}')
+
+
+if __name__ == '__main__':
+    main()
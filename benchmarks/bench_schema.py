@@ -0,0 +1,35 @@
+# Memory report of the merged match DataFrame with and without the typed schema.
+# Run from the repository root: python benchmarks/bench_schema.py
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import data_loader
+from schema import memory_report
+
+
+# Function to build the merged match DataFrame as it was before the typed schema: all columns, default dtypes.
+def untyped_datasets():
+    matches = data_loader.sync_match_store().read()
+    crests = pd.read_csv(data_loader._source_path(data_loader.img_teams_csv))
+    matches = data_loader._prepare_matches(matches, crests)
+    standings = data_loader._read_standings_csvs()
+    return data_loader._merge_standings(standings, matches)
+
+
+def main():
+    typed_df, _ = data_loader.build_datasets()
+    raw_df = untyped_datasets()
+
+    for name, df in (('untyped', raw_df), ('typed', typed_df)):
+        report = memory_report(df)
+        print(f'{name}: {len(df)} rows, {len(df.columns)} columns, {report["bytes"].sum() / 1e6:.2f} MB')
+        print(report.to_string(formatters={'share': '{:.1%}'.format}))
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+# Benchmark of the season simulator: simulated seasons per second in the app process and on process
+# pools of growing size, and a check that a fixed seed gives the same projection either way.
+# Run from the repository root: python benchmarks/bench_simulator.py [--runs 20000] [--workers 1 2 4]
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_loader
+from season_simulator import CHUNK_RUNS, simulate_season
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the Monte Carlo season simulator.')
+    parser.add_argument('--runs', type=int, default=20000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    epl_teams_df, epl_teams_standings = data_loader.load_datasets()
+    season = int(epl_teams_df['season_id'].max())
+    print(f'{os.cpu_count()} cores, season {season}, {args.runs} runs')
+
+    projections = {}
+    for workers in args.workers:
+        pool = None
+        if workers > 1:
+            # Started (and warmed up with one chunk per worker) before timing, as the app keeps its pool between projections.
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            simulate_season(epl_teams_df, epl_teams_standings, season, runs=workers * CHUNK_RUNS, seed=args.seed, pool=pool)
+        start = time.perf_counter()
+        projections[workers] = simulate_season(epl_teams_df, epl_teams_standings, season, runs=args.runs, seed=args.seed, pool=pool)
+        seconds = time.perf_counter() - start
+        if pool is not None:
+            pool.shutdown()
+        print(f'  {workers} worker(s): {seconds * 1000:8.1f} ms  {args.runs / seconds:10.0f} seasons/s')
+
+    baseline = projections[args.workers[0]]
+    same = all(projection.equals(baseline) for projection in projections.values())
+    print('Same projection for every worker count:', same)
+    print(baseline.head(5).to_string(index=False, float_format='{:.3f}'.format))
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
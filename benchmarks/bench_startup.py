@@ -0,0 +1,110 @@
+# Startup-time budget for the dashboard.
+# Imports streamlit_demo in fresh interpreters with `python -X importtime` and checks that
+# - the startup time the app adds on top of Streamlit and pandas (its own imports plus the module body,
+#   which loads the prebuilt dataset) stays within the budget, and
+# - the view-specific dependencies in LAZY_MODULES are not imported at startup.
+# Exits with status 1 when a check fails, so it can gate a CI job.
+# The budget is a ratio to the Streamlit and pandas imports measured in the same interpreter, so a slower
+# or busier machine slows both sides alike; the median over the runs is checked. --budget-ms adds an
+# absolute limit for a known machine.
+# Run from the repository root: python benchmarks/bench_startup.py [--budget-ratio R] [--budget-ms MS] [--runs N]
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Startup time the app may add on top of the framework imports, as a fraction of them.
+# The app measures about 0.21 of the framework imports, so a run is only flagged when it grows by half.
+DEFAULT_BUDGET_RATIO = 0.35
+
+# Imports every Streamlit worker pays regardless of the app; they are reported but not budgeted.
+FRAMEWORK_MODULES = ['streamlit', 'pandas']
+
+# Modules only needed once a chart is drawn or the Match Finder is used.
+LAZY_MODULES = ['plotly.express', 'plotly.graph_objects', 'statsmodels', 'geopy', 'bs4', 'lxml', 'distance', 'fixture_parser', 'fixtures', 'geocoding', 'web_scrape_scripts', 'season_simulator']
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+# Lazy modules the framework imports by itself (Streamlit loads parts of Plotly) are not held against the app.
+CHECK_LAZY = (
+    'import sys, streamlit, pandas; before = set(sys.modules); import streamlit_demo; '
+    'print(",".join(m for m in {!r} if m in sys.modules and m not in before))'
+)
+
+
+# Function to import the app once in a fresh interpreter.
+# Returns the cumulative import time of the app and of each module it imports directly, in microseconds.
+def measure_once():
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import streamlit_demo'],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True,
+    )
+    children = {}
+    total = None
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        cumulative, depth, name = int(match.group(2)), len(match.group(3)), match.group(4)
+        if depth == 1 and name == 'streamlit_demo':
+            total = cumulative
+        elif depth == 3:
+            children[name] = cumulative
+    return total, children
+
+
+def imported_lazy_modules():
+    result = subprocess.run(
+        [sys.executable, '-c', CHECK_LAZY.format(LAZY_MODULES)],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True,
+    )
+    return [name for name in result.stdout.strip().split(',') if name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the dashboard startup time against a budget.')
+    parser.add_argument('--budget-ratio', type=float, default=float(os.environ.get('EPL_STARTUP_BUDGET_RATIO', DEFAULT_BUDGET_RATIO)))
+    parser.add_argument('--budget-ms', type=float, default=float(os.environ.get('EPL_STARTUP_BUDGET_MS', 0)) or None,
+                        help='absolute limit on the app startup time (default: none)')
+    parser.add_argument('--runs', type=int, default=7)
+    args = parser.parse_args()
+
+    # The first import builds the dataset artifact if needed; it is not measured.
+    measure_once()
+    runs = [measure_once() for _ in range(args.runs)]
+
+    framework = [sum(children.get(name, 0) for name in FRAMEWORK_MODULES) for _, children in runs]
+    app = [total - framework_us for (total, _), framework_us in zip(runs, framework)]
+    total_ms = statistics.median(total for total, _ in runs) / 1000
+    framework_ms = statistics.median(framework) / 1000
+    app_ms = statistics.median(app) / 1000
+    ratio = statistics.median(app_us / framework_us for app_us, framework_us in zip(app, framework))
+
+    modules = sorted(runs[0][1], key=lambda name: -statistics.median(children.get(name, 0) for _, children in runs))
+    for name in modules[:10]:
+        print(f'{name:30s} {statistics.median(children.get(name, 0) for _, children in runs) / 1000:8.1f} ms')
+    print(f'streamlit_demo total {total_ms:.1f} ms = framework {framework_ms:.1f} ms + app {app_ms:.1f} ms '
+          f'(app/framework {ratio:.2f}, budget {args.budget_ratio:.2f}, median of {args.runs} runs)')
+
+    failed = False
+    if ratio > args.budget_ratio:
+        print(f'FAIL: app startup is {ratio:.2f} of the framework imports, over the budget of {args.budget_ratio:.2f}')
+        failed = True
+    if args.budget_ms is not None and app_ms > args.budget_ms:
+        print(f'FAIL: app startup {app_ms:.1f} ms exceeds the budget of {args.budget_ms:.0f} ms')
+        failed = True
+    eager = imported_lazy_modules()
+    if eager:
+        print(f'FAIL: imported at startup but meant to be lazy: {", ".join(eager)}')
+        failed = True
+    if failed:
+        sys.exit(1)
+    print('OK')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+# Throughput benchmark of the JSON stats service (stats_service.py), started as its own process on a free local port.
+# Every (team, season) selection is requested by concurrent keep-alive clients in three rounds: first requests
+# (stats read from the dataset), repeated requests (cached bodies) and conditional requests with the ETag of the
+# previous response (304 Not Modified).
+# Run from the repository root: python benchmarks/bench_stats_service.py [--clients 4] [--requests 2000]
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlencode
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+# Function to start the service and wait until it answers (the first request loads the dataset).
+def start_service(port, timeout):
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, 'stats_service.py'), '--port', str(port)], cwd=ROOT, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+            connection.request('GET', '/teams')
+            teams = json.loads(connection.getresponse().read())
+            connection.close()
+            return process, teams
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    sys.exit('the stats service did not start')
+
+
+# Function to send the requests of one round over `clients` keep-alive connections.
+# Returns (wall-clock seconds, latencies in seconds, status counts, ETag per path).
+def run_round(port, paths, clients, etags=None):
+    latencies, statuses, new_etags = [], {}, {}
+    lock = threading.Lock()
+
+    def client(client_paths):
+        connection = http.client.HTTPConnection('127.0.0.1', port)
+        for path in client_paths:
+            headers = {'If-None-Match': etags[path]} if etags and path in etags else {}
+            start = time.perf_counter()
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            seconds = time.perf_counter() - start
+            with lock:
+                latencies.append(seconds)
+                statuses[response.status] = statuses.get(response.status, 0) + 1
+                if response.getheader('ETag'):
+                    new_etags[path] = response.getheader('ETag')
+        connection.close()
+
+    threads = [threading.Thread(target=client, args=(paths[i::clients],)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, latencies, statuses, new_etags
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the throughput of the JSON stats service.')
+    parser.add_argument('--clients', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=2000, help='requests per round after the first')
+    parser.add_argument('--timeout', type=float, default=120)
+    args = parser.parse_args()
+
+    port = free_port()
+    process, teams = start_service(port, args.timeout)
+    try:
+        selections = [
+            '/stats?' + urlencode({'team': team, 'season': season})
+            for team in teams['teams'] for season in ['All seasons'] + teams['seasons']
+        ]
+        print(f'{len(selections)} selections, {args.clients} clients, {os.cpu_count()} cores')
+
+        def report(name, paths, result):
+            seconds, latencies, statuses, _ = result
+            p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+            print(f'  {name:12s} {len(paths):6d} requests {len(paths) / seconds:8.0f} req/s  p50 {p50:6.2f} ms  p99 {p99:6.2f} ms  {statuses}')
+
+        first = run_round(port, selections, args.clients)
+        report('first', selections, first)
+        # Teams that did not play in a season get a 404 and are not requested again.
+        etags = first[3]
+        found = [path for path in selections if path in etags]
+        repeated = [found[i % len(found)] for i in range(args.requests)]
+        report('repeated', repeated, run_round(port, repeated, args.clients))
+        report('conditional', repeated, run_round(port, repeated, args.clients, etags))
+    finally:
+        process.kill()
+        process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+# Generator of synthetic datasets with the same files and columns as the scraped CSVs.
+# Scale 1 is about the size of full_data.csv: 7 seasons of one 20-team league. Scale n plays n
+# leagues of 20 teams side by side, so matches, standings and teams all grow n times.
+# League 0 uses real team names; the other leagues use synthetic teams, which must be registered
+# with register_teams() in the process that loads the data.
+import os
+
+import numpy as np
+import pandas as pd
+
+from team_registry import TEAM_REGISTRY, TEAMS, season_label
+
+TEAMS_PER_LEAGUE = 20
+FIRST_SEASON = 2017
+LAST_SEASON = 2023
+# Matchweeks played so far in the last (current) season.
+CURRENT_MATCHWEEKS = 20
+
+MATCH_COLUMNS = ['date', 'time', 'comp', 'round', 'day', 'venue', 'result', 'gf', 'ga', 'opponent', 'xg', 'xga',
+                 'poss', 'attendance', 'captain', 'formation', 'referee', 'match report', 'notes', 'cmp%', 'season', 'team']
+STANDINGS_COLUMNS = ['Rk', 'Squad', 'MP', 'W', 'D', 'L', 'GF', 'GA', 'GD', 'Pts', 'Pts/MP', 'xG', 'xGA', 'xGD', 'xGD/90',
+                     'Attendance', 'Top Team Scorer', 'Goalkeeper', 'Notes', 'Season']
+
+FORMATIONS = np.array(['4-3-3', '4-2-3-1', '3-4-3', '4-4-2', '3-5-2', '5-3-2'])
+KICKOFFS = np.array(['12:30', '15:00', '17:30', '20:00'])
+REFEREES = np.array([f'Referee {i}' for i in range(24)])
+
+
+# Function to list the (canonical name, short name) of every team of a scale.
+# The short name is used where FBref uses short names: standings squads and opponents.
+def synthetic_teams(scale):
+    teams = [(name, aliases[0] if aliases else name) for name, aliases in TEAMS[:TEAMS_PER_LEAGUE]]
+    for league in range(1, scale):
+        for i in range(TEAMS_PER_LEAGUE):
+            teams.append((f'Synthetic {league:03d}-{i:02d} FC', f'Synthetic {league:03d}-{i:02d}'))
+    return teams
+
+
+def register_teams(scale, registry=TEAM_REGISTRY):
+    for name, short_name in synthetic_teams(scale):
+        registry.register(name, [short_name])
+
+
+# Function to build a double round-robin schedule with the circle method.
+# Returns (round, home, away) arrays with one entry per match, positions into a list of teams.
+def double_round_robin(n_teams):
+    positions = list(range(n_teams))
+    rounds, homes, aways = [], [], []
+    for round_number in range(n_teams - 1):
+        for i in range(n_teams // 2):
+            home, away = positions[i], positions[n_teams - 1 - i]
+            if round_number % 2:
+                home, away = away, home
+            rounds.append(round_number)
+            homes.append(home)
+            aways.append(away)
+        positions = [positions[0]] + [positions[-1]] + positions[1:-1]
+    rounds, homes, aways = np.array(rounds), np.array(homes), np.array(aways)
+    return (np.concatenate([rounds, rounds + n_teams - 1]),
+            np.concatenate([homes, aways]),
+            np.concatenate([aways, homes]))
+
+
+# Function to simulate every match of every league and season.
+# Returns one row per match with league-local team positions.
+def simulate_matches(scale, rng):
+    rounds, homes, aways = double_round_robin(TEAMS_PER_LEAGUE)
+    seasons = np.arange(FIRST_SEASON, LAST_SEASON + 1)
+    n_fixtures = len(rounds)
+    n = n_fixtures * len(seasons) * scale
+
+    matches = pd.DataFrame({
+        'season': np.repeat(seasons, n_fixtures * scale),
+        'league': np.tile(np.repeat(np.arange(scale), n_fixtures), len(seasons)),
+        'round': np.tile(rounds, len(seasons) * scale) + 1,
+        'home': np.tile(homes, len(seasons) * scale),
+        'away': np.tile(aways, len(seasons) * scale),
+    })
+    current = (matches['season'] == LAST_SEASON) & (matches['round'] > CURRENT_MATCHWEEKS)
+    matches = matches[~current].reset_index(drop=True)
+    n = len(matches)
+
+    matches['home_xg'] = rng.gamma(4.0, 0.38, n).round(1)
+    matches['away_xg'] = rng.gamma(4.0, 0.30, n).round(1)
+    matches['home_goals'] = rng.poisson(matches['home_xg'])
+    matches['away_goals'] = rng.poisson(matches['away_xg'])
+    matches['home_poss'] = np.clip(rng.normal(52, 10, n), 20, 80).round()
+    matches['attendance'] = rng.integers(10000, 75000, n).astype(float)
+    matches['date'] = (pd.to_datetime(matches['season'].astype(str) + '-08-12')
+                       + pd.to_timedelta((matches['round'] - 1) * 7 + rng.integers(0, 3, n), unit='D'))
+    matches['time'] = KICKOFFS[rng.integers(0, len(KICKOFFS), n)]
+    matches['referee'] = REFEREES[rng.integers(0, len(REFEREES), n)]
+    return matches
+
+
+# Function to turn the simulated matches into team rows as in full_data.csv: one row per team and match.
+def team_rows(matches, teams, rng):
+    names = np.array([name for name, _ in teams], dtype=object)
+    short_names = np.array([short_name for _, short_name in teams], dtype=object)
+    offset = matches['league'].to_numpy() * TEAMS_PER_LEAGUE
+
+    sides = []
+    for venue, team, opponent, gf, ga, xg, xga, poss in (
+        ('Home', 'home', 'away', 'home_goals', 'away_goals', 'home_xg', 'away_xg', 'home_poss'),
+        ('Away', 'away', 'home', 'away_goals', 'home_goals', 'away_xg', 'home_xg', None),
+    ):
+        team_ids = offset + matches[team].to_numpy()
+        possession = matches['home_poss'] if poss else 100 - matches['home_poss']
+        sides.append(pd.DataFrame({
+            'date': matches['date'].dt.strftime('%Y-%m-%d'),
+            'time': matches['time'],
+            'comp': 'Premier League',
+            'round': 'Matchweek ' + matches['round'].astype(str),
+            'day': matches['date'].dt.strftime('%a'),
+            'venue': venue,
+            'result': np.select([matches[gf] > matches[ga], matches[gf] == matches[ga]], ['W', 'D'], 'L'),
+            'gf': matches[gf].astype(float),
+            'ga': matches[ga].astype(float),
+            'opponent': short_names[offset + matches[opponent].to_numpy()],
+            'xg': matches[xg],
+            'xga': matches[xga],
+            'poss': possession,
+            'attendance': matches['attendance'],
+            'captain': 'Captain ' + pd.Series(team_ids).astype(str),
+            'formation': FORMATIONS[rng.integers(0, len(FORMATIONS), len(matches))],
+            'referee': matches['referee'],
+            'match report': 'Match Report',
+            'notes': np.nan,
+            'cmp%': np.clip(rng.normal(65, 6, len(matches)) + (possession - 50) * 0.4, 50, 95).round(1),
+            'season': matches['season'],
+            'team': names[team_ids],
+            'team_pos': team_ids,
+        }))
+    rows = pd.concat(sides, ignore_index=True)
+    return rows.sort_values(['season', 'team_pos', 'date'], kind='mergesort').reset_index(drop=True)
+
+
+# Function to derive the league tables from the team rows, as in end_tables.csv / fresh_table.csv.
+def standings(rows, teams):
+    short_names = np.array([short_name for _, short_name in teams], dtype=object)
+    table = rows.assign(
+        W=rows['result'] == 'W', D=rows['result'] == 'D', L=rows['result'] == 'L',
+        league=rows['team_pos'] // TEAMS_PER_LEAGUE,
+    ).groupby(['season', 'league', 'team_pos']).agg(
+        MP=('result', 'size'), W=('W', 'sum'), D=('D', 'sum'), L=('L', 'sum'),
+        GF=('gf', 'sum'), GA=('ga', 'sum'), xG=('xg', 'sum'), xGA=('xga', 'sum'), Attendance=('attendance', 'mean'),
+    ).reset_index()
+
+    table['GD'] = table['GF'] - table['GA']
+    table['Pts'] = table['W'] * 3 + table['D']
+    table['Pts/MP'] = (table['Pts'] / table['MP']).round(2)
+    table['xGD'] = (table['xG'] - table['xGA']).round(1)
+    table['xGD/90'] = (table['xGD'] / table['MP']).round(2)
+    table = table.sort_values(['season', 'league', 'Pts', 'GD', 'GF'], ascending=[True, True, False, False, False])
+    table['Rk'] = table.groupby(['season', 'league']).cumcount() + 1
+    table['Squad'] = short_names[table['team_pos'].to_numpy()]
+    table['Attendance'] = table['Attendance'].round().astype(int)
+    table['Top Team Scorer'] = 'Player - ' + (table['GF'] // 4).astype(int).astype(str)
+    table['Goalkeeper'] = 'Goalkeeper ' + table['team_pos'].astype(str)
+    table['Notes'] = ''
+    table['Season'] = table['season'].map(season_label)
+    for column in ['GF', 'GA', 'GD', 'Pts']:
+        table[column] = table[column].astype(int)
+    return table
+
+
+# Function to write a synthetic dataset of the given scale into a directory.
+# Writes full_data.csv, 2023_matches.csv, imgurls.csv, end_tables.csv and fresh_table.csv.
+# Returns the number of match rows and of teams.
+def generate(directory, scale=1, seed=0):
+    rng = np.random.default_rng(seed)
+    teams = synthetic_teams(scale)
+    os.makedirs(directory, exist_ok=True)
+
+    rows = team_rows(simulate_matches(scale, rng), teams, rng)
+    rows[MATCH_COLUMNS].to_csv(os.path.join(directory, 'full_data.csv'))
+    rows.loc[rows['season'] == LAST_SEASON, MATCH_COLUMNS].to_csv(os.path.join(directory, '2023_matches.csv'))
+
+    table = standings(rows, teams)
+    table.loc[table['season'] < LAST_SEASON, STANDINGS_COLUMNS].to_csv(os.path.join(directory, 'end_tables.csv'), index=False)
+    fresh_table = table[table['season'] == LAST_SEASON].copy()
+    fresh_table['Last 5'] = 'W D L W D'
+    fresh_table[STANDINGS_COLUMNS[:15] + ['Last 5'] + STANDINGS_COLUMNS[15:]].to_csv(os.path.join(directory, 'fresh_table.csv'), index=False)
+
+    crests = pd.DataFrame({
+        'cresturl': [f'https://example.invalid/crests/{i}.png' for i in range(len(teams))],
+        'team': [name for name, _ in teams],
+    })
+    crests.to_csv(os.path.join(directory, 'imgurls.csv'))
+    return {'rows': len(rows), 'teams': len(teams)}
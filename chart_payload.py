@@ -0,0 +1,70 @@
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# Points per chart above which traces are drawn with WebGL (scattergl) instead of SVG.
+DEFAULT_WEBGL_POINTS = 1000
+# Points per scatter above which it is binned on the server.
+DEFAULT_MAX_POINTS = 2000
+
+
+# Function to read the payload limits from the environment: EPL_WEBGL_POINTS points before a chart
+# switches to WebGL and EPL_SCATTER_MAX_POINTS points before a scatter is binned on the server (0 never bins).
+# Returns (webgl_points, max_points), with max_points None when scatters are never binned.
+def limits_from_env():
+    max_points = int(os.environ.get('EPL_SCATTER_MAX_POINTS', DEFAULT_MAX_POINTS))
+    return int(os.environ.get('EPL_WEBGL_POINTS', DEFAULT_WEBGL_POINTS)), (max_points or None)
+
+
+WEBGL_POINTS, MAX_POINTS = limits_from_env()
+
+
+# Function to pick Plotly Express' render mode for a chart of n_points points.
+def render_mode(n_points, webgl_points=None):
+    return 'webgl' if n_points > (WEBGL_POINTS if webgl_points is None else webgl_points) else 'svg'
+
+
+# Function to keep only the columns a chart draws, without rows missing any of them,
+# so neither the figure nor its JSON payload carries the rest of the match rows.
+def chart_columns(df, columns):
+    return df[list(columns)].dropna()
+
+
+# Function to bin a dense scatter into a grid of at most max_points cells: each occupied cell becomes one
+# point at the mean of its rows, with the number of rows in 'matches' (used as the marker size).
+# Frames with at most max_points rows are returned as they are.
+def bin_points(df, x, y, max_points):
+    if max_points is None or len(df) <= max_points:
+        return df
+    cells = max(int(math.isqrt(max_points)), 1)
+    values = df[[x, y]].to_numpy(dtype='float64')
+    low, high = values.min(axis=0), values.max(axis=0)
+    span = np.where(high > low, high - low, 1.0)
+    grid = np.minimum(((values - low) / span * cells).astype(np.intp), cells - 1)
+    cell = grid[:, 0] * cells + grid[:, 1]
+    binned = pd.DataFrame({x: values[:, 0], y: values[:, 1], 'cell': cell}).groupby('cell', sort=True)
+    return binned[[x, y]].mean().assign(matches=binned.size()).reset_index(drop=True)
+
+
+# Function to create a Plotly Express scatter of two columns that sends only what it draws:
+# the two columns, rendered with WebGL above the point threshold and binned above max_points.
+def scatter_chart(df, x, y, max_points=None, webgl_points=None, **kwargs):
+    import plotly.express as px
+
+    points = bin_points(chart_columns(df, [x, y]), x, y, MAX_POINTS if max_points is None else max_points)
+    if 'matches' in points.columns:
+        kwargs.setdefault('size', 'matches')
+        kwargs['labels'] = {'matches': 'Matches', **kwargs.get('labels', {})}
+    return px.scatter(points, x=x, y=y, render_mode=render_mode(len(points), webgl_points), **kwargs)
+
+
+# Function to create a Plotly Express line chart of y against x with one line per `color` value,
+# from only those columns and rendered with WebGL above the point threshold.
+def line_chart(df, x, y, color, webgl_points=None, **kwargs):
+    import plotly.express as px
+
+    lines = chart_columns(df, [color, x, y])
+    return px.line(lines, x=x, y=y, color=color, render_mode=render_mode(len(lines), webgl_points), **kwargs)
@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from io_utils import write_atomic, write_text_atomic
+from match_store import MatchStore
+from schema import apply_schema
+from season_progress import add_progress_columns
+from team_registry import TEAM_REGISTRY, season_id, season_label
+
+
+# Directory holding the scraped CSV files and the prebuilt dataset artifacts.
+# EPL_DATA_DIR points the app at another data directory, e.g. a synthetic benchmark dataset.
+DATA_DIR = os.environ.get('EPL_DATA_DIR') or os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(DATA_DIR, ".epl_cache")
+MATCH_STORE_DIR = os.path.join(CACHE_DIR, "match_store")
+
+# Defining CSV file names with scraped data
+epl_teams_csv = "full_data.csv"
+img_teams_csv = "imgurls.csv"
+update_teams_csv = "2023_matches.csv"
+end_standings_csv = "end_tables.csv"
+current_standings_csv = "fresh_table.csv"
+
+SOURCE_FILES = [epl_teams_csv, img_teams_csv, update_teams_csv, end_standings_csv, current_standings_csv]
+
+# Bump whenever build_datasets changes so old artifacts are not reused.
+PIPELINE_VERSION = 5
+
+# Content digests memoized on (size, mtime) so unchanged files are not re-read.
+_digest_memo = {}
+
+
+def _source_path(name):
+    return os.path.join(DATA_DIR, name)
+
+
+# Function to compute the content hash of a single source file.
+# The hash is only recomputed when the file's size or mtime changes.
+def _file_digest(path):
+    stat = os.stat(path)
+    stat_key = (path, stat.st_size, stat.st_mtime_ns)
+    digest = _digest_memo.get(stat_key)
+    if digest is None:
+        sha = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        _digest_memo[stat_key] = digest
+    return digest
+
+
+# Function to fingerprint all source CSVs plus the pipeline version and the registered teams.
+# Any change to a file's content or to team_registry.TEAMS yields a new fingerprint and thus a new artifact.
+def source_fingerprint():
+    sha = hashlib.sha1(f'pipeline-{PIPELINE_VERSION}-teams-{TEAM_REGISTRY.digest()}'.encode())
+    for name in SOURCE_FILES:
+        sha.update(name.encode())
+        sha.update(_file_digest(_source_path(name)).encode())
+    return sha.hexdigest()[:16]
+
+
+# Function to bring the match store up to date with the match CSVs.
+# The archive (full_data.csv) is only re-imported when its content changes; all but its latest
+# season are stored as frozen partitions. Rows of 2023_matches.csv are upserted, which writes
+# only the rows the store does not hold yet and lets them take precedence over archive rows.
+def sync_match_store(store=None):
+    store = store if store is not None else MatchStore(MATCH_STORE_DIR)
+
+    archive_digest = _file_digest(_source_path(epl_teams_csv))
+    if store.source_digest(epl_teams_csv) != archive_digest:
+        archive = pd.read_csv(_source_path(epl_teams_csv))
+        latest_season = archive['season'].max()
+        for season, season_rows in archive.groupby('season'):
+            store.replace_season(season, season_rows, frozen=season < latest_season)
+        store.set_source_digest(epl_teams_csv, archive_digest)
+        store.set_source_digest(update_teams_csv, None)
+
+    update_digest = _file_digest(_source_path(update_teams_csv))
+    if store.source_digest(update_teams_csv) != update_digest:
+        store.upsert(pd.read_csv(_source_path(update_teams_csv)))
+        store.set_source_digest(update_teams_csv, update_digest)
+
+    return store
+
+
+# Function to add team and season IDs to the match rows, label their season, attach the team crests
+# and compute the points per match. Crests are joined on the team ID.
+# When the rows carry dates and rounds, they are ordered by date within each team-season and get the
+# cumulative points and form columns (see season_progress).
+def _prepare_matches(epl_teams_df, img_teams_df):
+    epl_teams_df['team_id'] = TEAM_REGISTRY.team_ids(epl_teams_df['team'])
+    if 'opponent' in epl_teams_df.columns:
+        epl_teams_df['opponent_id'] = TEAM_REGISTRY.team_ids(epl_teams_df['opponent'])
+    epl_teams_df['season_id'] = epl_teams_df['season'].astype('int16')
+    labels = {year: season_label(year) for year in epl_teams_df['season_id'].unique()}
+    epl_teams_df['season'] = epl_teams_df['season_id'].map(labels)
+
+    crests = img_teams_df[['cresturl']].assign(team_id=TEAM_REGISTRY.team_ids(img_teams_df['team']))
+    epl_teams_df = pd.merge(epl_teams_df, crests.drop_duplicates(subset='team_id'), on='team_id', how='left')
+
+    # Calculate points gathered each matchweek.
+    if 'result' in epl_teams_df.columns:
+        epl_teams_df['points_added'] = epl_teams_df['result'].map({'W': 3, 'D': 1}).fillna(0)
+        if {'date', 'round'} <= set(epl_teams_df.columns):
+            epl_teams_df = add_progress_columns(epl_teams_df)
+    return epl_teams_df
+
+
+# Function to concatenate and clean up the end-of-season and current standings.
+# Squad names are resolved to team IDs through the team registry and replaced by the canonical names.
+def _prepare_standings(end_standings, current_standings):
+    epl_teams_standings = pd.concat([end_standings, current_standings], ignore_index=True)
+    epl_teams_standings = epl_teams_standings.rename(columns={'Season': 'season', 'Squad': 'team'})
+    epl_teams_standings['season'] = epl_teams_standings['season'].str.replace(' ', '')
+    epl_teams_standings['season'] = epl_teams_standings['season'].str.replace(',', '')
+    epl_teams_standings['team_id'] = TEAM_REGISTRY.team_ids(epl_teams_standings['team'])
+    epl_teams_standings['team'] = TEAM_REGISTRY.team_names(epl_teams_standings['team_id'])
+    epl_teams_standings['season_id'] = epl_teams_standings['season'].map(season_id).astype('int16')
+    return epl_teams_standings
+
+
+# Function to merge the standings into the match rows, joining on (season_id, team_id).
+def _merge_standings(epl_teams_standings, epl_teams_df):
+    return pd.merge(epl_teams_standings.drop(columns=['season', 'team']), epl_teams_df, on=['season_id', 'team_id'], how='right')
+
+
+def _read_standings_csvs():
+    return _prepare_standings(
+        pd.read_csv(_source_path(end_standings_csv)),
+        pd.read_csv(_source_path(current_standings_csv)),
+    )
+
+
+# Function to run the full load / clean / merge pipeline.
+# Match rows come deduplicated from the match store; standings and crests are read from their CSVs.
+# Returns the merged match DataFrame, typed and pruned to schema.MATCH_SCHEMA, and the standings DataFrame.
+def build_datasets(store=None):
+    # Loading data from the match store and CSV files into dataframes
+    epl_teams_df = sync_match_store(store).read()
+    img_teams_df = pd.read_csv(_source_path(img_teams_csv))
+    epl_teams_standings = _read_standings_csvs()
+
+    # Data Cleaning and Transformation, then merge the standings into the match rows.
+    epl_teams_df = _prepare_matches(epl_teams_df, img_teams_df)
+    epl_teams_df = _merge_standings(epl_teams_standings, epl_teams_df)
+
+    return apply_schema(epl_teams_df), epl_teams_standings
+
+
+# The artifact of a fingerprint: the match rows, the standings and the team names by team ID
+# (which include the teams that got an ID on first use while building it).
+def _artifact_paths(fingerprint):
+    return (
+        os.path.join(CACHE_DIR, f'epl_teams_{fingerprint}.parquet'),
+        os.path.join(CACHE_DIR, f'epl_teams_standings_{fingerprint}.parquet'),
+        os.path.join(CACHE_DIR, f'epl_teams_registry_{fingerprint}.json'),
+    )
+
+
+# Function to write a DataFrame atomically, so a concurrent reader never sees a partial file.
+def _write_parquet(df, path):
+    write_atomic(path, lambda tmp_path: df.to_parquet(tmp_path, index=False))
+
+
+# Function to remove artifacts built from older versions of the source files.
+def _remove_stale_artifacts(fingerprint):
+    for name in os.listdir(CACHE_DIR):
+        if name.endswith(('.parquet', '.json')) and fingerprint not in name:
+            try:
+                os.remove(os.path.join(CACHE_DIR, name))
+            except OSError:
+                pass
+
+
+# Function to load the prebuilt datasets for the given fingerprint.
+# Reads the Parquet artifact when one exists, after giving its team names the IDs they have in it
+# (see TeamRegistry.restore); otherwise, or when those IDs clash with this process's, runs
+# build_datasets and stores the result. The registry names are written last, so an artifact is only
+# used once complete. Falls back to an in-memory build when Parquet support (pyarrow) is not installed.
+def load_datasets(fingerprint=None):
+    if fingerprint is None:
+        fingerprint = source_fingerprint()
+    teams_path, standings_path, registry_path = _artifact_paths(fingerprint)
+
+    try:
+        if os.path.exists(registry_path):
+            with open(registry_path, encoding='utf-8') as f:
+                TEAM_REGISTRY.restore(json.load(f))
+            return pd.read_parquet(teams_path), pd.read_parquet(standings_path)
+    except ImportError:
+        return build_datasets()
+    except (OSError, ValueError):
+        pass
+
+    epl_teams_df, epl_teams_standings = build_datasets()
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _write_parquet(epl_teams_df, teams_path)
+        _write_parquet(epl_teams_standings, standings_path)
+        write_text_atomic(registry_path, json.dumps(TEAM_REGISTRY.names))
+        _remove_stale_artifacts(fingerprint)
+    except (ImportError, OSError):
+        pass
+    return epl_teams_df, epl_teams_standings
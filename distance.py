@@ -0,0 +1,41 @@
+import numpy as np
+
+
+# Mean Earth radius (IUGG) in kilometres.
+EARTH_RADIUS_KM = 6371.0088
+
+# Haversine treats the Earth as a sphere; against the WGS-84 geodesic used by
+# geopy.distance.geodesic its relative error stays below this bound.
+GEODESIC_REL_TOLERANCE = 0.006
+
+
+# Function to compute great-circle distances (km) from one point to arrays of points.
+# All arguments are in degrees; the computation is a single vectorized NumPy expression.
+def haversine_km(lat, lon, lats, lons):
+    lat1 = np.radians(lat)
+    lon1 = np.radians(lon)
+    lat2 = np.radians(np.asarray(lats, dtype=float))
+    lon2 = np.radians(np.asarray(lons, dtype=float))
+
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+# Function to return the k rows of a DataFrame closest to origin, nearest first.
+# origin is a (latitude, longitude) tuple; rows without coordinates are ignored.
+# Only rows within radius_km are kept when a radius is given.
+# Uses a partial sort (argpartition) so only the k selected rows are fully ordered.
+def nearest(df, origin, k=5, radius_km=None, lat_col='Latitude', lon_col='Longitude', distance_col='Distance (km)'):
+    distances = haversine_km(origin[0], origin[1], df[lat_col].to_numpy(dtype=float), df[lon_col].to_numpy(dtype=float))
+
+    candidates = np.flatnonzero(np.isfinite(distances))
+    if radius_km is not None:
+        candidates = candidates[distances[candidates] <= radius_km]
+
+    if len(candidates) > k:
+        candidates = candidates[np.argpartition(distances[candidates], k - 1)[:k]]
+    candidates = candidates[np.argsort(distances[candidates], kind='stable')]
+
+    result = df.iloc[candidates].copy()
+    result[distance_col] = distances[candidates]
+    return result
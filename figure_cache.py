@@ -0,0 +1,98 @@
+import os
+import threading
+from collections import OrderedDict
+
+
+# Default limits, overridable with the EPL_FIGURE_CACHE_ENTRIES / EPL_FIGURE_CACHE_BYTES environment variables.
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = None
+
+
+# Function to estimate the size of a Plotly figure as the length of its JSON payload.
+def figure_nbytes(fig):
+    return len(fig.to_json())
+
+
+# Thread-safe LRU cache of built Plotly figures shared by all sessions.
+# Keys should contain the chart type, the selection and a dataset version stamp,
+# e.g. ('points_chart', ('Arsenal', '2022/23'), season_version).
+# Entries are evicted least-recently-used first once max_entries or max_bytes is exceeded;
+# byte accounting is only done (one JSON serialization per build) when max_bytes is set,
+# otherwise a figure is serialized for its size only when payload_nbytes() asks for it.
+# Cached figures are shared, so callers must not modify a figure returned by get_or_build.
+class FigureCache:
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # Function to create a cache sized from the environment.
+    @classmethod
+    def from_env(cls):
+        max_entries = int(os.environ.get('EPL_FIGURE_CACHE_ENTRIES', DEFAULT_MAX_ENTRIES))
+        max_bytes = os.environ.get('EPL_FIGURE_CACHE_BYTES')
+        return cls(max_entries=max_entries, max_bytes=int(max_bytes) if max_bytes else DEFAULT_MAX_BYTES)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    # Function to return the cached figure for key, calling build() to create it on a miss.
+    # build() runs outside the lock, so concurrent sessions never wait on each other's charts.
+    def get_or_build(self, key, build):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        fig = build()
+        size = figure_nbytes(fig) if self.max_bytes is not None else None
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._nbytes -= previous[1] or 0
+            self._entries[key] = (fig, size)
+            self._nbytes += size or 0
+            self._evict()
+        return fig
+
+    # Function to return the JSON payload size of a cached figure (None when key is not cached).
+    # The size is measured once per cached figure, on first request when max_bytes is not set.
+    def payload_nbytes(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        fig, size = entry
+        if size is None:
+            size = figure_nbytes(fig)
+            with self._lock:
+                # Replacing the value of a key keeps its place in the LRU order.
+                if self._entries.get(key) is entry:
+                    self._entries[key] = (fig, size)
+        return size
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._nbytes > self.max_bytes and len(self._entries) > 1)
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._nbytes -= size or 0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
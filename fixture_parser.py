@@ -0,0 +1,71 @@
+from collections import namedtuple
+from datetime import timedelta
+
+import pandas as pd
+
+
+# Raw cells of one fixture row in an ESPN 'Table' element.
+FixtureRow = namedtuple('FixtureRow', ['home_team', 'away_team', 'time', 'location'])
+
+COLUMNS = ['Home Team', 'Away Team', 'Time', 'Stadium', 'Location']
+
+# Only matches played in these countries are kept.
+COUNTRIES = ('England', 'Spain', 'Italy', 'France', 'Germany')
+
+TIME_FORMAT = '%I:%M %p'
+# ESPN India lists kick-off in IST; shift back to CET.
+TIME_SHIFT = timedelta(hours=3, minutes=30)
+
+
+# Function to pick the fastest installed HTML parser for BeautifulSoup.
+def _html_parser():
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return 'html.parser'
+    return 'lxml'
+
+
+# Function to stream the fixture rows of an ESPN fixtures page.
+# Only the table.Table elements are parsed (SoupStrainer); every other part of the page is skipped.
+# Yields one FixtureRow per table row with at least five cells, header rows included.
+def iter_fixture_rows(page_text):
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    soup = BeautifulSoup(page_text, _html_parser(), parse_only=SoupStrainer('table', class_='Table'))
+    for row in soup.find_all('tr'):
+        cells = [cell.get_text(strip=True) for cell in row.find_all(['td', 'th'])]
+        if len(cells) >= 5:
+            yield FixtureRow(cells[0], cells[1], cells[2], cells[4])
+
+
+# Function to parse an ESPN fixtures page into a DataFrame of matches.
+# The frame is built once from the streamed rows; header filtering, the kick-off time shift
+# and the 'Stadium, City, Country' split are vectorized column operations.
+# Returns the columns in COLUMNS, keeping only matches played in one of the given countries.
+def parse_fixtures(page_text, countries=COUNTRIES):
+    rows = pd.DataFrame.from_records(list(iter_fixture_rows(page_text)), columns=FixtureRow._fields).astype(object)
+
+    # Drop the header rows of every table
+    is_header = pd.Series(False, index=rows.index)
+    for column in FixtureRow._fields:
+        is_header |= rows[column].str.contains('location', regex=False, na=False)
+    rows = rows[~is_header]
+
+    times = pd.to_datetime(rows['time'], format=TIME_FORMAT, errors='coerce')
+
+    parts = rows['location'].str.split(',', n=2, expand=True).reindex(columns=range(3)).astype(object)
+    stadium = parts[0].str.strip()
+    city = parts[1].str.strip()
+    country = parts[2].str.strip()
+
+    keep = times.notna() & country.str.endswith(tuple(countries), na=False) & city.notna()
+
+    fixtures = pd.DataFrame({
+        'Home Team': rows['home_team'],
+        'Away Team': rows['away_team'].str[1:],
+        'Time': (times - TIME_SHIFT).dt.strftime(TIME_FORMAT),
+        'Stadium': stadium,
+        'Location': city + ', ' + country,
+    }, columns=COLUMNS)
+    return fixtures[keep].reset_index(drop=True)
@@ -0,0 +1,131 @@
+import datetime
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from io_utils import RequestsTransport
+
+
+logger = logging.getLogger(__name__)
+
+ESPN_FIXTURES_URL = 'https://www.espn.in/football/fixtures/_/date/{date}'
+
+# Fixture pages are re-fetched after this many seconds (kick-off times and venues rarely change).
+DEFAULT_TTL_SECONDS = 600
+
+# Upper bound on concurrent requests to ESPN.
+DEFAULT_MAX_WORKERS = 4
+
+# Longest date range fetched at once, and the number of fixture pages kept in memory.
+MAX_RANGE_DAYS = 31
+DEFAULT_MAX_ENTRIES = 366
+
+
+# Transport serving recorded fixture pages from a directory, one '<YYYYMMDD>.html' file per date.
+# Stands in for ESPN in tests and offline runs; missing dates answer with status 404.
+# Like io_utils.RequestsTransport, get() returns (status_code, headers, text).
+class DirectoryTransport:
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def get(self, url, headers=None):
+        date = url.rstrip('/').rsplit('/', 1)[-1]
+        path = os.path.join(self.directory, f'{date}.html')
+        if not os.path.exists(path):
+            return 404, {}, ''
+        with open(path, encoding='utf-8') as f:
+            return 200, {}, f.read()
+
+
+# Function to list the dates of an inclusive date range as ESPN URL keys ('YYYYMMDD').
+# Ranges longer than max_days are cut to their first max_days days.
+def date_keys(start, end, max_days=MAX_RANGE_DAYS):
+    if end < start:
+        start, end = end, start
+    days = min((end - start).days + 1, max_days)
+    return [(start + datetime.timedelta(days=offset)).strftime('%Y%m%d') for offset in range(days)]
+
+
+# Fetcher for ESPN fixture pages with bounded concurrency and a per-date TTL cache.
+# Only successful responses are cached; one instance is meant to be shared by all sessions.
+# The cache holds at most max_entries pages: expired pages are dropped, then the least recently used.
+# A request for more than MAX_RANGE_DAYS dates is rejected with ValueError.
+class FixtureFetcher:
+
+    def __init__(self, transport, ttl=DEFAULT_TTL_SECONDS, max_workers=DEFAULT_MAX_WORKERS, max_entries=DEFAULT_MAX_ENTRIES):
+        self.transport = transport
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Function to create a fetcher from the environment.
+    # EPL_FIXTURES_DIR selects recorded pages instead of live ESPN requests.
+    @classmethod
+    def from_env(cls):
+        directory = os.environ.get('EPL_FIXTURES_DIR')
+        return cls(DirectoryTransport(directory) if directory else RequestsTransport(timeout=15, pool_size=DEFAULT_MAX_WORKERS, verify=False))
+
+    def __len__(self):
+        return len(self._cache)
+
+    def _cached(self, date):
+        with self._lock:
+            entry = self._cache.get(date)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= self.ttl:
+                del self._cache[date]
+                return None
+            self._cache.move_to_end(date)
+            return entry[1]
+
+    # Function to fetch the page of one date. A request that fails (timeout, connection error) answers
+    # with status None for that date only, and is not cached.
+    def _fetch(self, date):
+        try:
+            status, _, text = self.transport.get(ESPN_FIXTURES_URL.format(date=date))
+        except OSError as error:
+            logger.warning('Fetching the fixtures of %s failed: %s', date, error)
+            return None, ''
+        if status == 200:
+            with self._lock:
+                now = time.monotonic()
+                self._cache[date] = (now, text)
+                self._cache.move_to_end(date)
+                if len(self._cache) > self.max_entries:
+                    for expired in [key for key, (fetched_at, _) in self._cache.items() if now - fetched_at >= self.ttl]:
+                        del self._cache[expired]
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        return status, text
+
+    # Function to fetch the fixture pages of several dates ('YYYYMMDD').
+    # Cached pages are returned directly; the rest are fetched concurrently.
+    # Returns a dict date -> (status_code, text), in the order of the given dates; status_code is None
+    # for dates whose request failed.
+    def fetch(self, dates):
+        if len(dates) > MAX_RANGE_DAYS:
+            raise ValueError(f'At most {MAX_RANGE_DAYS} dates can be fetched at once, got {len(dates)}')
+        pages = {}
+        missing = []
+        for date in dates:
+            text = self._cached(date)
+            if text is None:
+                missing.append(date)
+            else:
+                pages[date] = (200, text)
+
+        if len(missing) == 1:
+            pages[missing[0]] = self._fetch(missing[0])
+        elif missing:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as pool:
+                for date, result in zip(missing, pool.map(self._fetch, missing)):
+                    pages[date] = result
+
+        return {date: pages[date] for date in dates}
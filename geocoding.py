@@ -0,0 +1,155 @@
+import contextlib
+import csv
+import os
+import re
+import sqlite3
+import threading
+import time
+
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".epl_cache", "geocode.sqlite")
+
+# Locations that could not be found are retried after this many seconds.
+NEGATIVE_TTL_SECONDS = 7 * 24 * 3600
+
+# Nominatim's usage policy allows at most one request per second.
+NOMINATIM_MIN_DELAY_SECONDS = 1.0
+
+
+# Function to normalize a free-text location into a cache key.
+# 'London ,  England' and 'london, england' map to the same key.
+def normalize_location(location):
+    location = re.sub(r'\s*,\s*', ', ', str(location).strip().lower())
+    return re.sub(r'\s+', ' ', location)
+
+
+# Geocoding backend using the public Nominatim service through geopy.
+class NominatimBackend:
+    min_delay_seconds = NOMINATIM_MIN_DELAY_SECONDS
+
+    def __init__(self, user_agent="stadium_coordinates", timeout=10):
+        from geopy.geocoders import Nominatim
+
+        self._geolocator = Nominatim(user_agent=user_agent, timeout=timeout)
+
+    # Function to return (latitude, longitude) for a location, or None if it was not found.
+    def lookup(self, location):
+        result = self._geolocator.geocode(location)
+        if result is None:
+            return None
+        return (result.latitude, result.longitude)
+
+
+# Geocoding backend reading a local gazetteer CSV with 'location', 'latitude' and 'longitude' columns.
+# Used for tests and offline deployments in place of Nominatim.
+class GazetteerBackend:
+    min_delay_seconds = 0.0
+
+    def __init__(self, path):
+        self._places = {}
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                self._places[normalize_location(row['location'])] = (float(row['latitude']), float(row['longitude']))
+
+    def lookup(self, location):
+        return self._places.get(normalize_location(location))
+
+
+# Geocoder with a persistent SQLite cache in front of a pluggable, rate-limited backend.
+# Found locations are cached permanently; misses are cached for negative_ttl seconds.
+# geocode_many deduplicates the normalized locations of a batch before calling the backend.
+class Geocoder:
+
+    def __init__(self, backend, db_path=DEFAULT_DB_PATH, negative_ttl=NEGATIVE_TTL_SECONDS):
+        self.backend = backend
+        self.db_path = db_path
+        self.negative_ttl = negative_ttl
+        self._rate_lock = threading.Lock()
+        self._last_request = 0.0
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS geocode ('
+                ' location TEXT PRIMARY KEY,'
+                ' latitude REAL,'
+                ' longitude REAL,'
+                ' fetched_at REAL NOT NULL)'
+            )
+
+    # Function to create a geocoder from the environment.
+    # EPL_GEOCODER_GAZETTEER selects a local gazetteer file instead of Nominatim.
+    @classmethod
+    def from_env(cls):
+        gazetteer = os.environ.get('EPL_GEOCODER_GAZETTEER')
+        backend = GazetteerBackend(gazetteer) if gazetteer else NominatimBackend()
+        return cls(backend, db_path=os.environ.get('EPL_GEOCODER_DB', DEFAULT_DB_PATH))
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # Function to read the cached coordinates of normalized locations.
+    # Returns a dict key -> (lat, lon) or None; expired misses and unknown keys are left out.
+    def _read_cache(self, keys):
+        if not keys:
+            return {}
+        now = time.time()
+        cached = {}
+        with self._connect() as conn:
+            placeholders = ','.join('?' * len(keys))
+            rows = conn.execute(
+                f'SELECT location, latitude, longitude, fetched_at FROM geocode WHERE location IN ({placeholders})',
+                list(keys),
+            )
+            for key, latitude, longitude, fetched_at in rows:
+                if latitude is not None:
+                    cached[key] = (latitude, longitude)
+                elif now - fetched_at < self.negative_ttl:
+                    cached[key] = None
+        return cached
+
+    def _write_cache(self, results):
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO geocode (location, latitude, longitude, fetched_at) VALUES (?, ?, ?, ?)',
+                [(key, *(coords if coords else (None, None)), now) for key, coords in results.items()],
+            )
+
+    # Function to call the backend while keeping at least min_delay_seconds between requests.
+    def _lookup(self, location):
+        with self._rate_lock:
+            wait = self._last_request + self.backend.min_delay_seconds - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                return self.backend.lookup(location)
+            finally:
+                self._last_request = time.monotonic()
+
+    # Function to geocode a batch of locations.
+    # Returns a list of (latitude, longitude) tuples, or None for locations that were not found.
+    def geocode_many(self, locations):
+        keys = [normalize_location(location) for location in locations]
+        unique_keys = list(dict.fromkeys(keys))
+        results = self._read_cache(unique_keys)
+
+        fetched = {}
+        for key in unique_keys:
+            if key not in results:
+                fetched[key] = self._lookup(key)
+        if fetched:
+            self._write_cache(fetched)
+            results.update(fetched)
+
+        return [results[key] for key in keys]
+
+    # Function to geocode a single location, returning (latitude, longitude) or None.
+    def geocode(self, location):
+        return self.geocode_many([location])[0]
@@ -0,0 +1,48 @@
+import os
+import threading
+
+
+# Browser User-Agent sent to FBref and ESPN, which refuse the default one of requests.
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/109.0.0.0 Safari/537.36',
+}
+
+
+# Function to write a file atomically, so a concurrent reader never sees a partial file:
+# write(tmp_path) creates it under a temporary name, which then replaces path.
+def write_atomic(path, write):
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def write_text_atomic(path, text):
+    def write(tmp_path):
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+    write_atomic(path, write)
+
+
+# Transport doing real HTTP requests over one pooled requests.Session, shared by the scrapers and the Match Finder.
+# get() returns (status_code, headers with lower-case names, text).
+class RequestsTransport:
+
+    def __init__(self, timeout=30, pool_size=2, verify=True):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self._session = requests.Session()
+        self._session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        self.timeout = timeout
+        self.verify = verify
+
+    def get(self, url, headers=None):
+        response = self._session.get(url, headers=headers, timeout=self.timeout, verify=self.verify)
+        return response.status_code, {k.lower(): v for k, v in response.headers.items()}, response.text
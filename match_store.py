@@ -0,0 +1,243 @@
+import json
+import os
+import threading
+
+import pandas as pd
+
+from io_utils import write_atomic, write_text_atomic
+
+
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".epl_cache", "match_store")
+
+# A match row is identified by the team and the match date.
+KEY = ['team', 'date']
+
+# A mutable partition is rewritten as a single file once it has this many appended parts.
+COMPACT_AFTER_PARTS = 16
+
+# Parts are sorted by team and written in small row groups, so the Parquet min/max statistics
+# let a team filter skip the row groups of every other team.
+ROW_GROUP_SIZE = 64
+
+
+# Function to hash match rows for change detection, independent of the column dtypes they were read with:
+# numeric columns are hashed as float64 (so 5 and 5.0 are equal) and the others as strings, with every
+# missing value (NaN, None, NA) hashed the same.
+def _row_hashes(rows):
+    normalized = pd.DataFrame({
+        name: column.astype('float64') if pd.api.types.is_numeric_dtype(column) else column.astype('string')
+        for name, column in rows.items()
+    }, index=rows.index)
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+
+
+# Append-only store of match rows keyed on (team, date), partitioned by season.
+#
+# Each season lives in its own directory of Parquet part files. Finished seasons are frozen:
+# they are written once and never touched again. The current season is mutable: upsert()
+# appends only rows whose key is new or whose content changed as a new part file, so the
+# cost of adding a matchweek depends on the new rows, not on the archive. Reading a mutable
+# season keeps the last version of every key.
+#
+# manifest.json records the partitions, the digests of the imported source files and a
+# version number that increases with every change, for downstream cache invalidation.
+class MatchStore:
+
+    def __init__(self, directory=DEFAULT_STORE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._manifest_path = os.path.join(directory, 'manifest.json')
+        self._lock = threading.RLock()
+        self._frames = {}
+        self._hashes = {}
+        self._manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            with open(self._manifest_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'version': 0, 'columns': None, 'partitions': {}, 'sources': {}}
+
+    def _save_manifest(self):
+        self._manifest['version'] += 1
+        write_text_atomic(self._manifest_path, json.dumps(self._manifest, indent=1, sort_keys=True))
+
+    @property
+    def version(self):
+        return self._manifest['version']
+
+    @property
+    def columns(self):
+        return self._manifest['columns']
+
+    # Function to list the stored seasons (start years), oldest first.
+    def seasons(self):
+        return sorted(int(season) for season in self._manifest['partitions'])
+
+    def is_frozen(self, season):
+        partition = self._manifest['partitions'].get(str(season))
+        return bool(partition and partition['frozen'])
+
+    # Function to return the digest recorded for an imported source file, or None.
+    def source_digest(self, name):
+        return self._manifest['sources'].get(name)
+
+    def set_source_digest(self, name, digest):
+        with self._lock:
+            self._manifest['sources'][name] = digest
+            self._save_manifest()
+
+    def _partition_dir(self, season):
+        return os.path.join(self.directory, f'season={season}')
+
+    # Function to allocate the file name of the next part of a partition.
+    def _next_part_name(self, partition):
+        number = partition.get('next_part', len(partition['parts']))
+        partition['next_part'] = number + 1
+        return f'part-{number:05d}.parquet'
+
+    def _write_part(self, season, rows, name):
+        os.makedirs(self._partition_dir(season), exist_ok=True)
+        path = os.path.join(self._partition_dir(season), name)
+        rows = rows.sort_values(KEY, kind='mergesort')
+        write_atomic(path, lambda tmp_path: rows.to_parquet(tmp_path, index=False, row_group_size=ROW_GROUP_SIZE))
+
+    def _conform(self, rows):
+        rows = rows.drop(columns=[c for c in rows.columns if c.startswith('Unnamed:')])
+        if self._manifest['columns'] is None:
+            self._manifest['columns'] = list(rows.columns)
+        return rows.reindex(columns=self._manifest['columns'])
+
+    # Function to read a partition from disk, optionally only some teams and columns.
+    # The team filter is pushed down to Parquet, which skips row groups of other teams.
+    def _read_partition(self, season, teams=None, columns=None):
+        partition = self._manifest['partitions'][str(season)]
+        read_columns = None if columns is None else list(dict.fromkeys(KEY + list(columns)))
+        filters = None if teams is None else [('team', 'in', list(teams))]
+        parts = [
+            pd.read_parquet(os.path.join(self._partition_dir(season), name), columns=read_columns, filters=filters)
+            for name in partition['parts']
+        ]
+        frame = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+        if not partition['frozen']:
+            frame = frame.drop_duplicates(subset=KEY, keep='last')
+        return frame.sort_values(KEY, kind='mergesort').reset_index(drop=True)
+
+    # Function to read one whole season, latest version of every key, sorted by (team, date).
+    # Whole seasons are kept in memory after the first read.
+    def read_season(self, season):
+        with self._lock:
+            frame = self._frames.get(season)
+            if frame is None:
+                frame = self._read_partition(season)
+                self._frames[season] = frame
+            return frame
+
+    # Function to read match rows, newest season first.
+    # seasons, teams and columns restrict what is read: only the partitions of the given seasons are
+    # opened, and a team or column selection is read straight from disk without loading whole seasons.
+    def read(self, seasons=None, teams=None, columns=None):
+        seasons = self.seasons() if seasons is None else [int(season) for season in seasons]
+        frames = []
+        for season in sorted(seasons, reverse=True):
+            if str(season) not in self._manifest['partitions']:
+                continue
+            frame = self._frames.get(season)
+            if frame is None and (teams is not None or columns is not None):
+                frame = self._read_partition(season, teams, columns)
+            else:
+                frame = self.read_season(season)
+                if teams is not None:
+                    frame = frame[frame['team'].isin(teams)]
+            frames.append(frame if columns is None else frame[list(columns)])
+
+        if not frames:
+            return pd.DataFrame(columns=list(columns) if columns is not None else self.columns or [])
+        return pd.concat(frames, ignore_index=True)
+
+    # Function to (re)write a whole season partition, e.g. when importing the archive.
+    def replace_season(self, season, rows, frozen):
+        season = int(season)
+        with self._lock:
+            rows = self._conform(rows).drop_duplicates(subset=KEY, keep='first')
+            self._write_part(season, rows, 'part-00000.parquet')
+            self._remove_parts(season, keep=['part-00000.parquet'])
+            self._manifest['partitions'][str(season)] = {'frozen': bool(frozen), 'parts': ['part-00000.parquet'], 'next_part': 1}
+            self._frames.pop(season, None)
+            self._hashes.pop(season, None)
+            self._save_manifest()
+
+    def _remove_parts(self, season, keep):
+        for name in os.listdir(self._partition_dir(season)):
+            if name.endswith('.parquet') and name not in keep:
+                os.remove(os.path.join(self._partition_dir(season), name))
+
+    # Function to get the content hash of every stored key of a mutable season.
+    def _season_hashes(self, season):
+        hashes = self._hashes.get(season)
+        if hashes is None:
+            frame = self.read_season(season)
+            hashes = dict(zip(zip(frame['team'], frame['date']), _row_hashes(frame)))
+            self._hashes[season] = hashes
+        return hashes
+
+    # Function to insert new match rows and replace changed ones.
+    # Within the batch the first row of a key wins. Rows of frozen seasons are ignored.
+    # Returns the number of rows actually written.
+    def upsert(self, rows):
+        with self._lock:
+            rows = self._conform(rows).drop_duplicates(subset=KEY, keep='first')
+            written = 0
+            for season, season_rows in rows.groupby('season', sort=False):
+                season = int(season)
+                partition = self._manifest['partitions'].get(str(season))
+                if partition is None:
+                    self._write_part(season, season_rows, 'part-00000.parquet')
+                    self._manifest['partitions'][str(season)] = {'frozen': False, 'parts': ['part-00000.parquet'], 'next_part': 1}
+                    written += len(season_rows)
+                    continue
+                if partition['frozen']:
+                    continue
+
+                hashes = self._season_hashes(season)
+                new_hashes = _row_hashes(season_rows)
+                keys = list(zip(season_rows['team'], season_rows['date']))
+                changed = [hashes.get(key) != row_hash for key, row_hash in zip(keys, new_hashes)]
+                season_rows = season_rows[changed]
+                if season_rows.empty:
+                    continue
+
+                name = self._next_part_name(partition)
+                self._write_part(season, season_rows, name)
+                partition['parts'].append(name)
+                for key, row_hash, is_changed in zip(keys, new_hashes, changed):
+                    if is_changed:
+                        hashes[key] = row_hash
+                self._frames.pop(season, None)
+                written += len(season_rows)
+
+                if len(partition['parts']) > COMPACT_AFTER_PARTS:
+                    self._compact(season, partition)
+
+            if written:
+                self._save_manifest()
+            return written
+
+    def _compact(self, season, partition):
+        frame = self.read_season(season)
+        name = self._next_part_name(partition)
+        self._write_part(season, frame, name)
+        partition['parts'] = [name]
+        self._remove_parts(season, keep=[name])
+
+    # Function to mark a season as finished; it is compacted into one file and never changed again.
+    def freeze(self, season):
+        with self._lock:
+            partition = self._manifest['partitions'][str(season)]
+            if partition['frozen']:
+                return
+            self._compact(season, partition)
+            partition['frozen'] = True
+            self._hashes.pop(season, None)
+            self._save_manifest()
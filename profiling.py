@@ -0,0 +1,188 @@
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+
+from io_utils import write_text_atomic
+
+
+# Every Streamlit rerun runs on its own script thread, so the profile of the running rerun is thread-local.
+_local = threading.local()
+_rerun_ids = itertools.count(1)
+_export_lock = threading.Lock()
+
+
+class _NullSpan:
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+# Shared no-op span handed out while profiling is disabled, so a disabled span costs one attribute lookup.
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('profile', 'name', 'depth', 'start')
+
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.depth = self.profile._depth
+        self.profile._depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        duration = time.perf_counter() - self.start
+        self.profile._depth -= 1
+        self.profile.spans.append((self.name, self.depth, self.start - self.profile.started, duration))
+        return False
+
+
+# Timing spans of one rerun: (name, nesting depth, start offset, duration) in seconds.
+class RerunProfile:
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.rerun_id = next(_rerun_ids) if enabled else 0
+        self.started = time.perf_counter()
+        self.spans = []
+        self.payloads = []
+        self._depth = 0
+
+    def span(self, name):
+        return _Span(self, name) if self.enabled else NULL_SPAN
+
+    # Function to record the JSON payload size of a chart sent to the browser in this rerun.
+    def payload(self, chart, nbytes):
+        if self.enabled and nbytes is not None:
+            self.payloads.append((chart, nbytes))
+
+    def total_seconds(self):
+        return time.perf_counter() - self.started
+
+    # Function to list the spans in the order they started, as dicts with millisecond timings.
+    def records(self):
+        return [
+            {'rerun': self.rerun_id, 'span': name, 'depth': depth,
+             'start_ms': round(start * 1000, 3), 'duration_ms': round(duration * 1000, 3)}
+            for name, depth, start, duration in sorted(self.spans, key=lambda s: s[2])
+        ]
+
+    # Function to list the chart payloads in the order they were sent, as dicts with their size in bytes.
+    def payload_records(self):
+        return [{'rerun': self.rerun_id, 'chart': chart, 'payload_bytes': nbytes} for chart, nbytes in self.payloads]
+
+    def payload_bytes(self):
+        return sum(nbytes for _, nbytes in self.payloads)
+
+
+_DISABLED = RerunProfile(enabled=False)
+
+
+# Process-wide totals per span name over all profiled reruns, for the Prometheus export.
+class SpanTotals:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seconds = {}
+        self._calls = {}
+        self._payloads = {}
+        self.reruns = 0
+
+    def add(self, profile):
+        with self._lock:
+            self.reruns += 1
+            for name, _, _, duration in profile.spans:
+                self._seconds[name] = self._seconds.get(name, 0.0) + duration
+                self._calls[name] = self._calls.get(name, 0) + 1
+            self._payloads.update(profile.payloads)
+
+    # Function to render the totals in the Prometheus text exposition format.
+    def to_prometheus(self):
+        with self._lock:
+            seconds, calls, payloads, reruns = dict(self._seconds), dict(self._calls), dict(self._payloads), self.reruns
+        lines = [
+            '# HELP epl_profiled_reruns_total Reruns recorded by the profiler.',
+            '# TYPE epl_profiled_reruns_total counter',
+            f'epl_profiled_reruns_total {reruns}',
+            '# HELP epl_span_seconds_total Time spent in each dashboard section.',
+            '# TYPE epl_span_seconds_total counter',
+        ]
+        lines += [f'epl_span_seconds_total{{span="{name}"}} {seconds[name]:.6f}' for name in sorted(seconds)]
+        lines += [
+            '# HELP epl_span_calls_total Number of times each dashboard section ran.',
+            '# TYPE epl_span_calls_total counter',
+        ]
+        lines += [f'epl_span_calls_total{{span="{name}"}} {calls[name]}' for name in sorted(calls)]
+        lines += [
+            '# HELP epl_chart_payload_bytes JSON payload size of each chart when it was last sent.',
+            '# TYPE epl_chart_payload_bytes gauge',
+        ]
+        lines += [f'epl_chart_payload_bytes{{chart="{chart}"}} {payloads[chart]}' for chart in sorted(payloads)]
+        return '\n'.join(lines) + '\n'
+
+
+TOTALS = SpanTotals()
+
+
+# Function to check whether profiling is switched on for the whole process (EPL_PROFILE=1).
+def enabled_from_env():
+    return os.environ.get('EPL_PROFILE', '') not in ('', '0')
+
+
+# Function to start collecting the spans of a new rerun on the current thread.
+def start_rerun(enabled):
+    profile = RerunProfile(enabled) if enabled else _DISABLED
+    _local.profile = profile
+    return profile
+
+
+def current():
+    return getattr(_local, 'profile', _DISABLED)
+
+
+# Function to open a span in the profile of the running rerun, e.g. `with span('load_datasets'):`
+def span(name):
+    return current().span(name)
+
+
+# Decorator recording every call of a function as a span named after it.
+def profiled(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profile = current()
+        if not profile.enabled:
+            return func(*args, **kwargs)
+        with profile.span(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def to_json_lines(records):
+    return ''.join(json.dumps(record) + '\n' for record in records)
+
+
+# Function to finish a rerun: its spans are added to the totals and, when EPL_PROFILE_EXPORT is set,
+# exported to that file - appended as JSON lines, or for a '.prom' path the Prometheus totals are rewritten.
+def finish_rerun(profile, export_path=None):
+    if not profile.enabled:
+        return
+    TOTALS.add(profile)
+    export_path = export_path or os.environ.get('EPL_PROFILE_EXPORT')
+    if not export_path:
+        return
+    with _export_lock:
+        if export_path.endswith('.prom'):
+            write_text_atomic(export_path, TOTALS.to_prometheus())
+        else:
+            with open(export_path, 'a', encoding='utf-8') as f:
+                f.write(to_json_lines(profile.records() + profile.payload_records()))
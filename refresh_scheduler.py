@@ -0,0 +1,148 @@
+import argparse
+import logging
+import os
+import threading
+import time
+
+import data_loader
+
+
+logger = logging.getLogger(__name__)
+
+# Refreshes are off unless EPL_REFRESH_SECONDS is set; FBref should not be asked more than every few minutes.
+MIN_INTERVAL = 60.0
+PAGE_CACHE_DIR = os.path.join(data_loader.CACHE_DIR, "pages")
+
+
+# Function to create the HTTP client of the scraper: saved HTML pages from snapshot_dir when given
+# (for tests and offline runs), FBref otherwise. Pages are cached next to the dataset artifacts.
+def scrape_client(snapshot_dir=None):
+    from web_scrape_scripts.http_client import DEFAULT_MIN_INTERVAL, HttpClient, SnapshotTransport
+
+    if snapshot_dir:
+        return HttpClient(SnapshotTransport(snapshot_dir), cache_dir=PAGE_CACHE_DIR, min_interval=0)
+    return HttpClient(cache_dir=PAGE_CACHE_DIR, min_interval=DEFAULT_MIN_INTERVAL)
+
+
+def _run_pipeline(out_dir, client):
+    from web_scrape_scripts.pipeline import run
+
+    return run(out_dir=out_dir, client=client)
+
+
+# Background worker refreshing the current-season data (fresh_table.csv and 2023_matches.csv) on a schedule.
+# Every `interval` seconds the scraper pipeline runs on a daemon thread; it only fetches matches newer than
+# the stored ones. When shared_dataset is given, the new files are then loaded into a new Dataset (deriving
+# only the changed seasons) and swapped in, while reruns keep reading the current one meanwhile.
+# Without shared_dataset (a separate refresh process) the app picks the files up at its next check.
+# status() reports the time, duration and outcome of the last refresh.
+class RefreshScheduler:
+
+    def __init__(self, interval, shared_dataset=None, out_dir=data_loader.DATA_DIR, client=None, run=_run_pipeline):
+        self.interval = interval
+        self.shared_dataset = shared_dataset
+        self.out_dir = out_dir
+        self._client = client
+        self._run = run
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.refreshes = 0
+        self.last_refresh_at = None
+        self.last_duration = None
+        self.last_summary = None
+        self.last_error = None
+
+    # Function to create a scheduler from the environment: EPL_REFRESH_SECONDS sets the interval
+    # (unset or 0 disables refreshes), EPL_REFRESH_SNAPSHOTS serves saved FBref pages from a directory.
+    @classmethod
+    def from_env(cls, shared_dataset=None):
+        interval = float(os.environ.get('EPL_REFRESH_SECONDS') or 0)
+        if interval and interval < MIN_INTERVAL and not os.environ.get('EPL_REFRESH_SNAPSHOTS'):
+            logger.warning('EPL_REFRESH_SECONDS=%s is below %s seconds; using %s', interval, MIN_INTERVAL, MIN_INTERVAL)
+            interval = MIN_INTERVAL
+        snapshot_dir = os.environ.get('EPL_REFRESH_SNAPSHOTS')
+        return cls(interval or None, shared_dataset, client=scrape_client(snapshot_dir) if snapshot_dir else None)
+
+    @property
+    def enabled(self):
+        return bool(self.interval)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    # Function to start the background thread; the first refresh runs one interval after the start.
+    def start(self):
+        if not self.enabled or self.running:
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name='epl-refresh', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.refresh_once()
+
+    # Function to scrape the current season now and publish the new data.
+    # Never raises: a failure is logged, kept in last_error, and the current data stays in place.
+    # Returns True when the refresh succeeded.
+    def refresh_once(self):
+        with self._refresh_lock:
+            started_at = time.time()
+            started = time.perf_counter()
+            try:
+                if self._client is None:
+                    self._client = scrape_client()
+                self.last_summary = self._run(self.out_dir, self._client)
+                if self.shared_dataset is not None:
+                    self.shared_dataset.refresh()
+                self.last_error = None
+            except Exception as e:
+                logger.exception('Refreshing the current-season data failed')
+                self.last_error = f'{type(e).__name__}: {e}'
+            self.last_refresh_at = started_at
+            self.last_duration = time.perf_counter() - started
+            self.refreshes += 1
+            return self.last_error is None
+
+    # Function to describe the last refresh, e.g. for the sidebar or a health check.
+    def status(self):
+        return {
+            'enabled': self.enabled,
+            'interval_s': self.interval,
+            'refreshes': self.refreshes,
+            'last_refresh_at': self.last_refresh_at,
+            'last_duration_s': self.last_duration,
+            'new_matches': (self.last_summary or {}).get('new_matches'),
+            'last_error': self.last_error,
+        }
+
+
+# Runs the scheduler as its own process, next to one or more app processes reading the same data directory.
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the current-season CSVs from FBref on a schedule.")
+    parser.add_argument('--interval', type=float, default=float(os.environ.get('EPL_REFRESH_SECONDS') or 900), help="seconds between refreshes")
+    parser.add_argument('--snapshots', default=os.environ.get('EPL_REFRESH_SNAPSHOTS'), help="serve saved HTML snapshots from this directory instead of FBref")
+    parser.add_argument('--once', action='store_true', help="refresh once and exit")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    scheduler = RefreshScheduler(args.interval, client=scrape_client(args.snapshots))
+    while True:
+        ok = scheduler.refresh_once()
+        status = scheduler.status()
+        logger.info('Refresh %s in %.1f s (%s new matches)', 'done' if ok else 'failed', status['last_duration_s'], status['new_matches'])
+        if args.once:
+            raise SystemExit(0 if ok else 1)
+        time.sleep(args.interval)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+from collections import namedtuple
+
+import numpy as np
+
+
+# Metric pairs (x, y) plotted by the correlation_* charts on a team page.
+CORRELATION_PAIRS = [
+    ('cmp%', 'poss'),
+    ('cmp%', 'gf'),
+    ('xg', 'gf'),
+    ('poss', 'ga'),
+    ('poss', 'gf'),
+]
+
+# Result of a simple least-squares fit y = slope * x + intercept over n points.
+LinearFit = namedtuple('LinearFit', ['slope', 'intercept', 'r', 'r_squared', 'n', 'x_min', 'x_max'])
+
+
+# Function to fit ordinary least squares lines for several (x, y) column pairs at once.
+# Uses the closed-form solution on stacked NumPy arrays, so all pairs share one pass over the rows.
+# Rows where either value is missing are ignored for that pair only.
+# Returns a dict mapping each (x, y) pair to a LinearFit.
+def fit_pairs(df, pairs):
+    x_cols = [x for x, _ in pairs]
+    y_cols = [y for _, y in pairs]
+    x = df[x_cols].to_numpy(dtype=float)
+    y = df[y_cols].to_numpy(dtype=float)
+
+    mask = np.isfinite(x) & np.isfinite(y)
+    n = mask.sum(axis=0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_mean = np.where(mask, x, 0.0).sum(axis=0) / n
+        y_mean = np.where(mask, y, 0.0).sum(axis=0) / n
+        dx = np.where(mask, x - x_mean, 0.0)
+        dy = np.where(mask, y - y_mean, 0.0)
+        sxx = (dx * dx).sum(axis=0)
+        syy = (dy * dy).sum(axis=0)
+        sxy = (dx * dy).sum(axis=0)
+
+        slope = sxy / sxx
+        intercept = y_mean - slope * x_mean
+        r = sxy / np.sqrt(sxx * syy)
+
+    x_min = np.where(mask, x, np.inf).min(axis=0, initial=np.inf)
+    x_max = np.where(mask, x, -np.inf).max(axis=0, initial=-np.inf)
+
+    return {
+        pair: LinearFit(float(slope[i]), float(intercept[i]), float(r[i]), float(r[i] ** 2),
+                        int(n[i]), float(x_min[i]), float(x_max[i]))
+        for i, pair in enumerate(pairs)
+    }
+
+
+# Memo of fitted trendlines per selection (e.g. (team, season)).
+# One instance is meant to live as long as the dataset it was computed from.
+class TrendlineCache:
+
+    def __init__(self, pairs=CORRELATION_PAIRS):
+        self.pairs = list(pairs)
+        self._fits = {}
+
+    # Function to return the fits for every pair of the given selection, fitting them on first use.
+    def fits(self, key, df):
+        fits = self._fits.get(key)
+        if fits is None:
+            fits = fit_pairs(df, self.pairs)
+            self._fits[key] = fits
+        return fits
+
+    # Function to create a new memo holding the fits of this one whose key keep(key) accepts.
+    def carry_over(self, keep):
+        cache = TrendlineCache(self.pairs)
+        cache._fits = {key: fits for key, fits in list(self._fits.items()) if keep(key)}
+        return cache
+
+
+# Function to draw a fitted line on a scatter figure and report its correlation coefficient.
+# Does nothing to the line when there are fewer than two distinct x values.
+def add_trendline(fig, fit):
+    import plotly.graph_objects as go
+
+    if fit.n >= 2 and np.isfinite(fit.slope):
+        x_line = [fit.x_min, fit.x_max]
+        y_line = [fit.slope * x_value + fit.intercept for x_value in x_line]
+        fig.add_trace(go.Scatter(
+            x=x_line,
+            y=y_line,
+            mode='lines',
+            name='OLS trendline',
+            showlegend=False,
+            hovertemplate=f'y = {fit.slope:.3f}x + {fit.intercept:.3f}<br>R² = {fit.r_squared:.3f}<extra></extra>',
+        ))
+
+    if np.isfinite(fit.r):
+        fig.add_annotation(
+            text=f'r = {fit.r:.2f} (R² = {fit.r_squared:.2f})',
+            xref='paper', yref='paper', x=1, y=1.08,
+            xanchor='right', showarrow=False,
+        )
+    return fig
@@ -0,0 +1,64 @@
+import pandas as pd
+
+
+# Typed schema of the merged match DataFrame (epl_teams_df), column -> storage dtype.
+# Team and season IDs (see team_registry) are int16, repeated labels are categoricals,
+# goal counts and standings ranks are small integers (nullable where a team-season has
+# no standings row) and measured stats are float32.
+# Columns not listed here are not used by any view and are dropped; the full standings
+# (MP, W, D, L, ...) stay available in epl_teams_standings.
+MATCH_SCHEMA = {
+    'team_id': 'int16',
+    'season_id': 'int16',
+    'opponent_id': 'int16',
+    'Rk': 'Int8',
+    'team': 'category',
+    'Pts': 'Int16',
+    'Pts/MP': 'float32',
+    'xG': 'float32',
+    'xGA': 'float32',
+    'season': 'category',
+    'date': 'datetime64[ns]',
+    'comp': 'category',
+    'round': 'category',
+    'day': 'category',
+    'venue': 'category',
+    'result': 'category',
+    'gf': 'int8',
+    'ga': 'int8',
+    'opponent': 'category',
+    'xg': 'float32',
+    'xga': 'float32',
+    'poss': 'float32',
+    'attendance': 'float32',
+    'captain': 'category',
+    'formation': 'category',
+    'referee': 'category',
+    'cmp%': 'float32',
+    'cresturl': 'category',
+    'points_added': 'int8',
+    'matchweek': 'int8',
+    'match_number': 'int8',
+    'cum_points': 'int16',
+    'form': 'category',
+}
+
+
+# Function to convert a match DataFrame to MATCH_SCHEMA.
+# With prune=True columns outside the schema are dropped; otherwise they are kept unchanged.
+def apply_schema(df, prune=True):
+    if prune:
+        df = df[[c for c in MATCH_SCHEMA if c in df.columns]]
+    return df.astype({c: dtype for c, dtype in MATCH_SCHEMA.items() if c in df.columns})
+
+
+# Function to report the memory used by every column of a DataFrame, largest first.
+# Returns a DataFrame with the dtype, the bytes used (strings included) and the share of the total.
+def memory_report(df):
+    usage = df.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        'dtype': df.dtypes.astype(str),
+        'bytes': usage,
+        'share': usage / usage.sum(),
+    })
+    return report.sort_values('bytes', ascending=False)
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+
+# Number of most recent results shown by the form indicator.
+FORM_LENGTH = 5
+
+PROGRESS_COLUMNS = ['matchweek', 'match_number', 'cum_points', 'form']
+
+RESULT_SYMBOLS = ['W', 'D', 'L']
+
+
+# Function to turn an encoded form back into its string, most recent result first.
+def _form_string(code):
+    symbols = []
+    while code:
+        symbols.append(RESULT_SYMBOLS[code % 4 - 1] if code % 4 else '')
+        code //= 4
+    return ''.join(symbols)
+
+
+# Function to read the matchweek number from FBref round labels, e.g. 'Matchweek 12' -> 12 (0 when there is none).
+# Only the distinct labels (at most a few dozen) are parsed.
+def matchweek_numbers(rounds):
+    codes, labels = pd.factorize(rounds)
+    numbers = pd.to_numeric(pd.Series(labels, dtype=object).astype(str).str.extract(r'(\d+)', expand=False), errors='coerce')
+    numbers = np.append(numbers.fillna(0).astype('int64').to_numpy(), 0)
+    return numbers[codes]
+
+
+# Function to add the per team-season progress columns to match rows, in one grouped pass over all teams:
+# - matchweek: the scheduled matchweek, from the round label
+# - match_number: 1 for a team's first match of the season, 2 for the second, ... in date order
+# - cum_points: points after this match, summed in date order
+# - form: results of the last FORM_LENGTH matches up to this one, most recent first (e.g. 'WWDLW')
+# Rows are returned sorted by (team_id, season_id, date, matchweek), so no view depends on the CSV order.
+def add_progress_columns(match_rows):
+    match_rows = match_rows.assign(matchweek=matchweek_numbers(match_rows['round']))
+    match_rows = match_rows.sort_values(['team_id', 'season_id', 'date', 'matchweek'], kind='mergesort').reset_index(drop=True)
+    groups = match_rows.groupby(['team_id', 'season_id'], sort=False)
+
+    match_rows['match_number'] = groups.cumcount().to_numpy() + 1
+    match_rows['cum_points'] = groups['points_added'].cumsum().to_numpy()
+
+    # Each result is a base-4 digit (0 = no match), so a form is one integer; only its distinct values become strings.
+    results = match_rows['result'].astype(str).to_numpy()
+    codes = np.select([results == symbol for symbol in RESULT_SYMBOLS], np.arange(1, len(RESULT_SYMBOLS) + 1), 0)
+    played_before = match_rows['match_number'].to_numpy() - 1
+    form_codes = codes.astype('int64')
+    for lag in range(1, FORM_LENGTH):
+        previous = np.zeros_like(form_codes)
+        previous[lag:] = codes[:-lag]
+        form_codes += np.where(played_before >= lag, previous, 0) * 4 ** lag
+    distinct, positions = np.unique(form_codes, return_inverse=True)
+    match_rows['form'] = pd.Categorical.from_codes(positions, [_form_string(code) for code in distinct])
+    return match_rows
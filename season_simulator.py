@@ -0,0 +1,244 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+# Simulated seasons per projection, and per task handed to a worker process.
+DEFAULT_RUNS = 20000
+CHUNK_RUNS = 2500
+# Weight of a season in the rate fit relative to the season after it.
+HISTORY_DECAY = 0.5
+# Matches of league-average xG added to every team, so teams with little history are pulled towards the average.
+PRIOR_MATCHES = 10
+# Places at the top and bottom of the table reported as probabilities.
+TOP_PLACES = 4
+RELEGATION_PLACES = 3
+# Upper bound on worker processes; each holds its own NumPy import and simulation buffers.
+MAX_WORKERS = 4
+
+
+# Function to fit per-team attack and defence rates from the xG of every match up to a season.
+# Rates are relative to the league average: attack 1.2 means 20% more xG than average, defence 0.8
+# means 20% less xG conceded. Older seasons count less (HISTORY_DECAY per season).
+# Returns (rates indexed by team_id with 'attack' and 'defence', average xG per match, home and away factors).
+def fit_rates(epl_teams_df, season_id):
+    rows = epl_teams_df[(epl_teams_df['season_id'] <= season_id) & epl_teams_df['xg'].notna() & epl_teams_df['xga'].notna()]
+    weights = HISTORY_DECAY ** (season_id - rows['season_id'].to_numpy().astype('float64'))
+    xg = rows['xg'].to_numpy().astype('float64')
+    xga = rows['xga'].to_numpy().astype('float64')
+    average = np.average(xg, weights=weights)
+    home = (rows['venue'] == 'Home').to_numpy()
+    home_factor = np.average(xg[home], weights=weights[home]) / average if home.any() else 1.0
+    away_factor = np.average(xg[~home], weights=weights[~home]) / average if (~home).any() else 1.0
+
+    sums = pd.DataFrame({'team_id': rows['team_id'].to_numpy(), 'w': weights, 'wxg': weights * xg, 'wxga': weights * xga}).groupby('team_id').sum()
+    prior = PRIOR_MATCHES * average
+    rates = pd.DataFrame({
+        'attack': (sums['wxg'] + prior) / (sums['w'] + PRIOR_MATCHES) / average,
+        'defence': (sums['wxga'] + prior) / (sums['w'] + PRIOR_MATCHES) / average,
+    })
+    return rates, average, home_factor, away_factor
+
+
+# Function to group the teams of a season into leagues: teams are in the same league when they are
+# linked by the matches played (the connected components of the opponent graph).
+# Returns a league label per entry of team_ids.
+def league_labels(team_ids, season_rows):
+    positions = {team_id: i for i, team_id in enumerate(team_ids)}
+    labels = np.arange(len(team_ids))
+    pairs = [(positions[a], positions[b]) for a, b in zip(season_rows['team_id'], season_rows['opponent_id']) if a in positions and b in positions]
+    if not pairs:
+        return labels
+    a, b = np.array(pairs).T
+    while True:
+        merged = np.minimum(labels[a], labels[b])
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, a, merged)
+        np.minimum.at(new_labels, b, merged)
+        new_labels = new_labels[new_labels]
+        if np.array_equal(new_labels, labels):
+            return labels
+        labels = new_labels
+
+
+# Function to list the fixtures of a league that are still to be played: every team hosts every other
+# team once, minus the (home, away) pairs already in the match rows.
+# Returns (home, away) arrays of positions into team_ids.
+def remaining_fixtures(team_ids, season_rows):
+    positions = {team_id: i for i, team_id in enumerate(team_ids)}
+    played = set()
+    for team_id, opponent_id, venue in zip(season_rows['team_id'], season_rows['opponent_id'], season_rows['venue']):
+        if team_id in positions and opponent_id in positions:
+            played.add((team_id, opponent_id) if venue == 'Home' else (opponent_id, team_id))
+    fixtures = [(positions[h], positions[a]) for h in team_ids for a in team_ids if h != a and (h, a) not in played]
+    if not fixtures:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    home, away = np.array(fixtures, dtype=np.intp).T
+    return home, away
+
+
+# Function to simulate the remaining fixtures of one league `runs` times (run in a worker process).
+# Goals are Poisson draws for all runs and fixtures at once; points, goal difference and goals are
+# added up with one matrix product per side and every simulated table is ordered by
+# points, goal difference, goals scored and a random draw.
+# Returns (count of finishes per team and position, sum of final points per team).
+def simulate_chunk(task):
+    points, goal_diff, goals, home, away, home_rates, away_rates, runs, seed = task
+    rng = np.random.default_rng(seed)
+    n_teams = len(points)
+    home_goals = rng.poisson(home_rates, size=(runs, len(home)))
+    away_goals = rng.poisson(away_rates, size=(runs, len(away)))
+
+    home_onehot = np.zeros((len(home), n_teams), dtype=np.float32)
+    home_onehot[np.arange(len(home)), home] = 1
+    away_onehot = np.zeros((len(away), n_teams), dtype=np.float32)
+    away_onehot[np.arange(len(away)), away] = 1
+
+    home_points = np.where(home_goals > away_goals, 3, home_goals == away_goals).astype(np.float32)
+    away_points = np.where(away_goals > home_goals, 3, home_goals == away_goals).astype(np.float32)
+    margin = (home_goals - away_goals).astype(np.float32)
+    final_points = points + home_points @ home_onehot + away_points @ away_onehot
+    final_goal_diff = goal_diff + margin @ home_onehot - margin @ away_onehot
+    final_goals = goals + home_goals.astype(np.float32) @ home_onehot + away_goals.astype(np.float32) @ away_onehot
+
+    order = np.lexsort((rng.random((runs, n_teams)), -final_goals, -final_goal_diff, -final_points))
+    finishes = np.zeros((n_teams, n_teams), dtype=np.int64)
+    np.add.at(finishes, (order, np.broadcast_to(np.arange(n_teams), order.shape)), 1)
+    return finishes, final_points.sum(axis=0, dtype=np.float64)
+
+
+# Function to project the final table of a season by Monte Carlo simulation.
+# The current points, goal difference and goals come from the season's standings (so point deductions
+# count); the remaining fixtures of every league are simulated `runs` times, in chunks of CHUNK_RUNS spread
+# over the worker processes of `pool` when given. With a seed the result is reproducible, with or without a pool.
+# Returns one row per team of the season: team_id, team, league position probabilities for the title,
+# the top four and relegation, expected points and expected position; or None when nothing is left to play.
+def simulate_season(epl_teams_df, epl_teams_standings, season_id, runs=DEFAULT_RUNS, seed=None, pool=None):
+    standings = epl_teams_standings[epl_teams_standings['season_id'] == season_id].drop_duplicates(subset='team_id')
+    season_rows = epl_teams_df[epl_teams_df['season_id'] == season_id]
+    if standings.empty:
+        return None
+    rates, average, home_factor, away_factor = fit_rates(epl_teams_df, season_id)
+
+    team_ids = standings['team_id'].to_numpy()
+    labels = league_labels(team_ids, season_rows)
+    n_chunks = -(-runs // CHUNK_RUNS)
+    seeds = iter(np.random.SeedSequence(seed).spawn(len(np.unique(labels)) * n_chunks))
+    tasks, leagues = [], []
+    for label in np.unique(labels):
+        league_ids = team_ids[labels == label]
+        home, away = remaining_fixtures(league_ids, season_rows)
+        league = standings.set_index('team_id').loc[league_ids]
+        attack = rates['attack'].reindex(league_ids, fill_value=1.0).to_numpy()
+        defence = rates['defence'].reindex(league_ids, fill_value=1.0).to_numpy()
+        base = (league['Pts'].to_numpy(np.float32), (league['GF'] - league['GA']).to_numpy(np.float32), league['GF'].to_numpy(np.float32))
+        home_rates = average * home_factor * attack[home] * defence[away]
+        away_rates = average * away_factor * attack[away] * defence[home]
+        chunk_tasks = [base + (home, away, home_rates, away_rates, min(CHUNK_RUNS, runs - i * CHUNK_RUNS), next(seeds)) for i in range(n_chunks)]
+        leagues.append((league_ids, len(home), len(tasks), len(tasks) + len(chunk_tasks)))
+        tasks += chunk_tasks
+    if not any(n_fixtures for _, n_fixtures, _, _ in leagues):
+        return None
+
+    if pool is not None and len(tasks) > 1:
+        results = list(pool.map(simulate_chunk, tasks))
+    else:
+        results = [simulate_chunk(task) for task in tasks]
+
+    frames = []
+    for league_ids, _, first, last in leagues:
+        finishes = sum(result[0] for result in results[first:last])
+        probabilities = finishes / runs
+        n_teams = len(league_ids)
+        frames.append(pd.DataFrame({
+            'team_id': league_ids,
+            'title': probabilities[:, 0],
+            'top_four': probabilities[:, :TOP_PLACES].sum(axis=1),
+            'relegation': probabilities[:, max(n_teams - RELEGATION_PLACES, 0):].sum(axis=1),
+            'expected_points': sum(result[1] for result in results[first:last]) / runs,
+            'expected_position': probabilities @ np.arange(1, n_teams + 1),
+        }))
+    projection = pd.concat(frames, ignore_index=True)
+    projection.insert(1, 'team', standings.set_index('team_id').loc[projection['team_id'], 'team'].to_numpy())
+    return projection.sort_values('expected_position', kind='mergesort').reset_index(drop=True)
+
+
+# Process-wide cache of season projections, one per version of the season's data.
+# get() never blocks: for a version not projected yet it starts the simulation on a background
+# thread and returns None until the projection is ready. A simulation that fails is not cached, so the next
+# get() starts it again. With workers > 1 the simulated chunks run on a process pool that is started on
+# first use and kept for later versions, so process start-up is paid once.
+class ProjectionCache:
+
+    def __init__(self, runs=DEFAULT_RUNS, seed=None, workers=1):
+        self.runs = runs
+        self.seed = seed
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._projections = {}
+        self._pending = set()
+        self._pool = None
+        self.last_duration = None
+
+    # Function to create a cache from the environment: EPL_SIM_RUNS simulated seasons per projection,
+    # EPL_SIM_WORKERS worker processes (default: one per core, at most MAX_WORKERS) and
+    # EPL_SIM_SEED a fixed seed for reproducible results.
+    @classmethod
+    def from_env(cls):
+        seed = os.environ.get('EPL_SIM_SEED')
+        return cls(
+            runs=int(os.environ.get('EPL_SIM_RUNS', DEFAULT_RUNS)),
+            seed=int(seed) if seed else None,
+            workers=int(os.environ.get('EPL_SIM_WORKERS') or min(os.cpu_count() or 1, MAX_WORKERS)),
+        )
+
+    # Function to return the projection of a season of a Dataset, or None while it is being computed
+    # (or when the season has nothing left to play).
+    def get(self, dataset, season_id, season_label):
+        key = (season_id, dataset.version(season_label))
+        with self._lock:
+            if key in self._projections:
+                return self._projections[key]
+            if key in self._pending:
+                return None
+            self._pending.add(key)
+        threading.Thread(target=self._compute, args=(key, dataset), name='epl-simulation', daemon=True).start()
+        return None
+
+    # Function to return the shared process pool, created under the lock so concurrent simulations
+    # of different seasons do not each start one.
+    def _worker_pool(self):
+        with self._lock:
+            if self.workers > 1 and self._pool is None:
+                # Spawned workers do not inherit the threads (and locks) of the app process.
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+            return self._pool
+
+    def _compute(self, key, dataset):
+        started = time.perf_counter()
+        try:
+            projection = simulate_season(dataset.epl_teams_df, dataset.epl_teams_standings, key[0], self.runs, self.seed, self._worker_pool())
+        except Exception:
+            logger.exception('Simulating season %s failed', key[0])
+            with self._lock:
+                self._pending.discard(key)
+            return
+        with self._lock:
+            # Only the projections of the latest data version of each season are kept.
+            self._projections = {k: v for k, v in self._projections.items() if k[0] != key[0]}
+            self._projections[key] = projection
+            self._pending.discard(key)
+        self.last_duration = time.perf_counter() - started
+
+    # Function to check whether the projection of a season of a Dataset is still being computed.
+    def pending(self, dataset, season_id, season_label):
+        with self._lock:
+            return (season_id, dataset.version(season_label)) in self._pending
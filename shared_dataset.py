@@ -0,0 +1,154 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+
+import data_loader
+from aggregates import TeamSeasonSummary
+from regression import TrendlineCache
+from split_index import SplitIndex
+from standings_engine import StandingsEngine
+from team_index import TeamSeasonIndex
+from team_registry import season_id
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two checks of the source files for changes.
+DEFAULT_CHECK_INTERVAL = 2.0
+
+
+# Function to compute a content digest of every season of the match rows and standings, keyed by season label.
+# Rows are hashed independently and summed, so the digest does not depend on the row order.
+def season_digests(epl_teams_df, epl_teams_standings):
+    digests = {}
+    for df in (epl_teams_df, epl_teams_standings):
+        row_hashes = pd.util.hash_pandas_object(df, index=False)
+        for season, total in row_hashes.groupby(df['season'].astype(str).to_numpy()).sum().items():
+            digests[season] = digests.get(season, '') + f'{int(total):016x}'
+    return {season: hashlib.sha1(digest.encode()).hexdigest()[:16] for season, digest in digests.items()}
+
+
+# Everything the dashboard derives from one version of the source files.
+# A Dataset is built completely before it is published and is never modified afterwards,
+# so all sessions can read the same frames; treat them as read-only.
+# epl_teams_df is the index's sorted frame, so the match rows are held only once.
+# Given the previous Dataset, only the seasons whose rows changed (usually just the current one)
+# are re-aggregated, and the trendline fits of the other seasons are carried over.
+class Dataset:
+
+    def __init__(self, fingerprint, epl_teams_df, epl_teams_standings, previous=None):
+        self.fingerprint = fingerprint
+        self.team_index = TeamSeasonIndex(epl_teams_df)
+        self.epl_teams_df = self.team_index.df
+        self.epl_teams_standings = epl_teams_standings
+        self.season_digests = season_digests(self.epl_teams_df, epl_teams_standings)
+        # Splits span all seasons, so they are rebuilt for every version.
+        self.split_index = SplitIndex(self.epl_teams_df)
+
+        if previous is None:
+            self.changed_seasons = set(self.season_digests)
+            self.team_summary = TeamSeasonSummary(self.epl_teams_df)
+            self.standings_engine = StandingsEngine(self.epl_teams_df)
+            self.trendline_cache = TrendlineCache()
+        else:
+            self.changed_seasons = {
+                season for season in set(self.season_digests) | set(previous.season_digests)
+                if self.season_digests.get(season) != previous.season_digests.get(season)
+            }
+            changed_ids = [season_id(season) for season in self.changed_seasons]
+            changed_rows = self.epl_teams_df[self.epl_teams_df['season_id'].isin(changed_ids)]
+            self.team_summary = previous.team_summary.with_seasons(changed_rows, changed_ids)
+            self.standings_engine = previous.standings_engine.with_seasons(changed_rows, changed_ids)
+            stale = self.changed_seasons | ({'All seasons'} if self.changed_seasons else set())
+            self.trendline_cache = previous.trendline_cache.carry_over(lambda key: key[1] not in stale)
+        self.loaded_at = time.time()
+
+    @classmethod
+    def load(cls, fingerprint, previous=None):
+        epl_teams_df, epl_teams_standings = data_loader.load_datasets(fingerprint)
+        return cls(fingerprint, epl_teams_df, epl_teams_standings, previous)
+
+    # Function to return a version string for the data of one season label ('All seasons' for every season).
+    # It only changes when that season's rows change, so cached charts of the other seasons stay valid.
+    def version(self, season):
+        digest = self.season_digests.get(season)
+        return digest if digest is not None else self.fingerprint
+
+
+# Process-wide holder of the current Dataset, shared by all sessions.
+# get() checks the source files at most every check_interval seconds (by size and mtime, then
+# content hash, see data_loader.source_fingerprint). When they changed, a new Dataset is built on a
+# background thread while every rerun keeps getting the current one, and is then published with a
+# single reference swap, so a rerun never waits for or sees a half-built dataset. A failed build keeps
+# the current dataset and is retried at the next check. The new Dataset is derived from the current one,
+# see Dataset. last_build_seconds is the duration of the latest successful build.
+class SharedDataset:
+
+    def __init__(self, check_interval=DEFAULT_CHECK_INTERVAL, fingerprint=data_loader.source_fingerprint, load=Dataset.load):
+        self.check_interval = check_interval
+        self._fingerprint = fingerprint
+        self._load = load
+        self._build_lock = threading.Lock()
+        self._current = None
+        self._checked_at = 0.0
+        self.refreshes = 0
+        self.last_build_seconds = None
+
+    @classmethod
+    def from_env(cls):
+        return cls(check_interval=float(os.environ.get('EPL_DATASET_CHECK_SECONDS', DEFAULT_CHECK_INTERVAL)))
+
+    # Function to return the current Dataset. Only the first call waits for a load; a newer version
+    # of the files is loaded in the background and returned by the calls after it is swapped in.
+    def get(self):
+        current = self._current
+        if current is None:
+            return self.refresh()
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self.refresh(wait=False)
+        return current
+
+    # Function to check the source files now and swap in a new Dataset if they changed.
+    # With wait=False the new Dataset is built on a background thread and the current one is returned.
+    def refresh(self, wait=True):
+        current = self._current
+        fingerprint = self._fingerprint()
+        self._checked_at = time.monotonic()
+        if current is not None and current.fingerprint == fingerprint:
+            return current
+
+        if not wait and current is not None:
+            # At most one build runs; while it does, later checks keep serving the current dataset.
+            if self._build_lock.acquire(blocking=False):
+                threading.Thread(target=self._build_and_release, args=(fingerprint,), name='epl-dataset-build', daemon=True).start()
+            return current
+        with self._build_lock:
+            return self._build(fingerprint)
+
+    def _build_and_release(self, fingerprint):
+        try:
+            self._build(fingerprint)
+        finally:
+            self._build_lock.release()
+
+    # Function to load and publish the Dataset of a fingerprint; the caller holds the build lock.
+    def _build(self, fingerprint):
+        current = self._current
+        if current is not None and current.fingerprint == fingerprint:
+            return current
+        started = time.perf_counter()
+        try:
+            dataset = self._load(fingerprint, current)
+        except Exception:
+            if current is None:
+                raise
+            logger.exception('Reloading the dataset failed, still serving %s', current.fingerprint)
+            return current
+        self._current = dataset
+        self.refreshes += 1
+        self.last_build_seconds = time.perf_counter() - started
+        return dataset
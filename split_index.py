@@ -0,0 +1,97 @@
+import numpy as np
+
+from team_registry import TEAM_REGISTRY
+
+
+# Match columns a team's results can be split by, with the label shown for each.
+SPLITS = {
+    'opponent_id': 'Opponent',
+    'venue': 'Venue',
+    'formation': 'Formation',
+    'referee': 'Referee',
+}
+
+# Additive totals stored per (team, split value); the rates shown are derived from them.
+SPLIT_AGGREGATES = {
+    'MP': ('points_added', 'size'),
+    'W': ('won', 'sum'),
+    'D': ('drawn', 'sum'),
+    'L': ('lost', 'sum'),
+    'GF': ('gf', 'sum'),
+    'GA': ('ga', 'sum'),
+    'xG': ('xg', 'sum'),
+    'xGA': ('xga', 'sum'),
+    'Pts': ('points_added', 'sum'),
+}
+
+MATCH_COLUMNS = ['date', 'season', 'venue', 'result', 'gf', 'ga', 'xg', 'xga', 'formation', 'referee']
+
+
+# Function to aggregate match rows per team and value of a split column, in one groupby pass.
+# Returns the totals sorted by team_id (one contiguous block per team) with the derived rates.
+def split_totals(match_rows, column):
+    totals = match_rows.groupby(['team_id', column], observed=True, sort=True).agg(**SPLIT_AGGREGATES).reset_index()
+    totals[['xG', 'xGA']] = totals[['xG', 'xGA']].astype('float64').round(1)
+    totals['GD'] = totals['GF'] - totals['GA']
+    totals['Pts/MP'] = (totals['Pts'] / totals['MP']).round(2)
+    totals['Win %'] = (100 * totals['W'] / totals['MP']).round(1)
+    return totals
+
+
+# Precomputed splits of every team's results across all seasons: by opponent, venue, formation and referee.
+# Each split is one totals table sorted by team, so split() is a dict lookup plus a positional slice,
+# and the matches of every (team, opponent) pair are kept as row positions for head_to_head().
+class SplitIndex:
+
+    def __init__(self, epl_teams_df, registry=TEAM_REGISTRY):
+        self.registry = registry
+        results = epl_teams_df['result'].astype(str)
+        match_rows = epl_teams_df.assign(won=results == 'W', drawn=results == 'D', lost=results == 'L')
+
+        self._splits = {}
+        for column in SPLITS:
+            totals = split_totals(match_rows, column)
+            if column == 'opponent_id':
+                totals['opponent_id'] = registry.team_names(totals['opponent_id']).to_numpy()
+            else:
+                totals[column] = totals[column].astype(str)
+            # Within a team, the most played split values come first.
+            totals = totals.sort_values(['team_id', 'MP'], ascending=[True, False], kind='mergesort').reset_index(drop=True)
+            bounds = {
+                team_id: (positions[0], positions[-1] + 1)
+                for team_id, positions in totals.groupby('team_id', sort=False).indices.items()
+            }
+            self._splits[column] = (totals.drop(columns='team_id').rename(columns={column: SPLITS[column]}), bounds)
+
+        # Rows of a team-season are in date order (see season_progress), so reversed positions are most recent first.
+        self._matches = epl_teams_df[[c for c in MATCH_COLUMNS if c in epl_teams_df.columns]]
+        self._pair_positions = epl_teams_df.groupby(['team_id', 'opponent_id'], sort=False).indices
+
+    # Function to return a team's totals split by one of SPLITS (e.g. 'venue'), most matches first.
+    def split(self, team, column):
+        totals, bounds = self._splits[column]
+        start, stop = bounds.get(self.registry.lookup(team), (0, 0))
+        return totals.iloc[start:stop]
+
+    # Function to list the opponents a team has played, by name.
+    def opponents(self, team):
+        return self.split(team, 'opponent_id')['Opponent'].sort_values().tolist()
+
+    # Function to return the head-to-head record of two teams: (totals of the team against the opponent,
+    # their matches from the team's side, most recent first). The totals are None when they never met.
+    def head_to_head(self, team, opponent):
+        team_id, opponent_id = self.registry.lookup(team), self.registry.lookup(opponent)
+        totals = self.split(team, 'opponent_id')
+        record = totals[totals['Opponent'] == opponent]
+        positions = self._pair_positions.get((team_id, opponent_id), np.empty(0, dtype=np.intp))
+        matches = self._matches.take(positions[::-1]).reset_index(drop=True)
+        return (record.iloc[0] if len(record) else None), matches
+
+
+# Function to compute a team's split by scanning and grouping the whole match table, as before the index.
+# Kept as the reference the benchmark compares SplitIndex.split against.
+def scan_split(epl_teams_df, team_id, column):
+    team_rows = epl_teams_df[epl_teams_df['team_id'] == team_id]
+    results = team_rows['result'].astype(str)
+    totals = split_totals(team_rows.assign(won=results == 'W', drawn=results == 'D', lost=results == 'L'), column)
+    return totals.sort_values('MP', ascending=False, kind='mergesort')
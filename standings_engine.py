@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+from team_registry import TEAM_REGISTRY
+
+
+TABLE_COLUMNS = ['Position', 'Team', 'MP', 'W', 'D', 'L', 'GF', 'GA', 'GD', 'Pts']
+
+
+# Function to compute the league table of a season after every matchweek, from its match rows.
+# Per-team deltas are accumulated into a (team, matchweek) grid and summed over matchweeks in one
+# cumulative sum; every table is then sorted by points, goal difference, goals scored and team name.
+# Returns one frame with a block of n_teams rows per matchweek (matchweek 1 first), ready to slice.
+def season_snapshots(season_rows, registry=TEAM_REGISTRY):
+    weeks = season_rows['matchweek'].to_numpy().astype(np.intp)
+    n_weeks = int(weeks.max()) if len(weeks) else 0
+    team_ids, team_pos = np.unique(season_rows['team_id'].to_numpy(), return_inverse=True)
+    n_teams = len(team_ids)
+
+    results = season_rows['result'].astype(str).to_numpy()
+    values = np.column_stack([
+        np.ones(len(results), dtype=np.int32),
+        results == 'W',
+        results == 'D',
+        results == 'L',
+        season_rows['gf'].to_numpy(),
+        season_rows['ga'].to_numpy(),
+    ]).astype(np.int32)
+    # Matchweek 0 collects rows without a matchweek number; they are left out of every table.
+    deltas = np.zeros((n_weeks + 1, n_teams, values.shape[1]), dtype=np.int32)
+    np.add.at(deltas, (weeks, team_pos), values)
+    totals = deltas.cumsum(axis=0)[1:]
+    played, won, drawn, lost, scored, conceded = np.moveaxis(totals, 2, 0)
+    points = 3 * won + drawn
+    goal_diff = scored - conceded
+
+    names = registry.team_names(team_ids).to_numpy()
+    name_rank = np.broadcast_to(np.argsort(np.argsort(names)), points.shape)
+    order = np.lexsort((name_rank, -scored, -goal_diff, -points))
+
+    def ranked(column):
+        return np.take_along_axis(column, order, axis=1).ravel()
+
+    return pd.DataFrame({
+        'matchweek': np.repeat(np.arange(1, n_weeks + 1), n_teams),
+        'Position': np.tile(np.arange(1, n_teams + 1), n_weeks),
+        'Team': names[order].ravel(),
+        'MP': ranked(played),
+        'W': ranked(won),
+        'D': ranked(drawn),
+        'L': ranked(lost),
+        'GF': ranked(scored),
+        'GA': ranked(conceded),
+        'GD': ranked(goal_diff),
+        'Pts': ranked(points),
+    })
+
+
+# Precomputed league tables of every season after every matchweek, built from the match rows.
+# table(season_id, matchweek) is a positional slice of the season's snapshot frame, so an as-of
+# query costs a dict lookup. Tables only count results: point deductions are not applied.
+# with_seasons() derives new snapshots in which only some seasons are recomputed.
+class StandingsEngine:
+
+    def __init__(self, epl_teams_df=None, snapshots=None):
+        if snapshots is None:
+            snapshots = {
+                season: season_snapshots(season_rows)
+                for season, season_rows in epl_teams_df.groupby('season_id', sort=False)
+            }
+        self._snapshots = snapshots
+
+    # Function to create new snapshots in which the given seasons are recomputed from match_rows
+    # (their rows only) and the snapshots of every other season are reused. These snapshots are not changed.
+    def with_seasons(self, match_rows, season_ids):
+        season_ids = set(season_ids)
+        snapshots = {season: table for season, table in self._snapshots.items() if season not in season_ids}
+        for season, season_rows in match_rows.groupby('season_id', sort=False):
+            snapshots[season] = season_snapshots(season_rows)
+        return StandingsEngine(snapshots=snapshots)
+
+    # Function to return the last matchweek with results in a season (0 when the season is unknown).
+    def matchweeks(self, season_id):
+        table = self._snapshots.get(season_id)
+        return 0 if table is None or table.empty else int(table['matchweek'].iat[-1])
+
+    # Function to return the table of a season after a matchweek (clamped to the played matchweeks).
+    def table(self, season_id, matchweek):
+        table = self._snapshots.get(season_id)
+        n_weeks = self.matchweeks(season_id)
+        if n_weeks == 0:
+            return pd.DataFrame(columns=TABLE_COLUMNS)
+        n_teams = len(table) // n_weeks
+        matchweek = min(max(int(matchweek), 1), n_weeks)
+        return table.iloc[(matchweek - 1) * n_teams:matchweek * n_teams][TABLE_COLUMNS].reset_index(drop=True)
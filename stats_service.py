@@ -0,0 +1,176 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from refresh_scheduler import RefreshScheduler
+from shared_dataset import SharedDataset
+from team_stats import team_stats
+
+
+logger = logging.getLogger(__name__)
+
+# Defaults, overridable with the EPL_STATS_HOST / EPL_STATS_PORT / EPL_STATS_CACHE_ENTRIES environment variables.
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8502
+DEFAULT_MAX_ENTRIES = 1024
+
+ALL_SEASONS = 'All seasons'
+
+
+# Function to build the ETag of a response from its route and the version of the data it was made from.
+def make_etag(route, version):
+    return '"' + hashlib.sha1(json.dumps([route, version]).encode()).hexdigest()[:20] + '"'
+
+
+# Function to check an If-None-Match header against an ETag (weak and listed ETags included).
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or any(tag.removeprefix('W/') == etag for tag in tags)
+
+
+# The team-season stats of the dashboard (standing, basic stats, form and points) as JSON, without Streamlit.
+# Responses are made from the process-wide SharedDataset and its precomputed aggregates, so they are the numbers
+# the dashboard shows. Every response carries an ETag derived from the version of the data it covers: the digest
+# of its season, or the dataset fingerprint for 'All seasons' and the team list. A request whose If-None-Match
+# still matches gets a 304 without the stats being read; rendered bodies are kept in an LRU of max_entries.
+# Routes: /teams (teams and seasons) and /stats?team=<team>&season=<season or 'All seasons'>.
+class StatsService:
+
+    def __init__(self, shared_dataset, max_entries=DEFAULT_MAX_ENTRIES):
+        self.shared_dataset = shared_dataset
+        self.max_entries = max_entries
+        self._bodies = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Function to create a service over the dataset files configured in the environment.
+    @classmethod
+    def from_env(cls, shared_dataset=None):
+        return cls(
+            shared_dataset or SharedDataset.from_env(),
+            max_entries=int(os.environ.get('EPL_STATS_CACHE_ENTRIES', DEFAULT_MAX_ENTRIES)),
+        )
+
+    # Function to answer a GET request of a path and query string, e.g. ('/stats', 'team=Arsenal&season=2022/23').
+    # Returns (HTTP status, ETag or None, JSON body as bytes; empty for a 304).
+    def respond(self, path, query='', if_none_match=None):
+        dataset = self.shared_dataset.get()
+        params = {key: values[-1] for key, values in parse_qs(query).items()}
+        if path == '/teams':
+            route, version = ('teams',), dataset.fingerprint
+            build = lambda: {'teams': dataset.team_index.teams, 'seasons': dataset.team_index.seasons}
+        elif path == '/stats':
+            team, season = params.get('team'), params.get('season', ALL_SEASONS)
+            if not team:
+                return 400, None, _error('the team parameter is required')
+            if season != ALL_SEASONS and season not in dataset.team_index.seasons:
+                return 404, None, _error(f'unknown season {season!r}')
+            route, version = ('stats', team, season), dataset.version(season)
+            build = lambda: team_stats(dataset, team, season)
+        else:
+            return 404, None, _error(f'unknown path {path!r}')
+
+        etag = make_etag(route, version)
+        if etag_matches(if_none_match, etag):
+            return 304, etag, b''
+        body = self._body((route, version), build)
+        if body is None:
+            return 404, None, _error(f'no stats for {params.get("team")!r} in {params.get("season", ALL_SEASONS)!r}')
+        return 200, etag, body
+
+    def _body(self, key, build):
+        with self._lock:
+            if key in self._bodies:
+                self._bodies.move_to_end(key)
+                return self._bodies[key]
+        result = build()
+        body = None if result is None else json.dumps(result, separators=(',', ':')).encode()
+        with self._lock:
+            self._bodies[key] = body
+            while len(self._bodies) > self.max_entries:
+                self._bodies.popitem(last=False)
+        return body
+
+
+def _error(message):
+    return json.dumps({'error': message}).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive connections, so clients polling for changes do not reconnect for every request;
+    # without Nagle's algorithm a response is not held back waiting for the client's delayed ACK.
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            status, etag, body = self.server.service.respond(url.path, url.query, self.headers.get('If-None-Match'))
+        except Exception:
+            logger.exception('Request %s failed', self.path)
+            status, etag, body = 500, None, _error('internal error')
+        self.send_response(status)
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        if status != 304:
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+# Function to create the HTTP server of a StatsService (port 0 picks a free port); call serve_forever() on it.
+def make_server(service, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the dashboard's team-season stats as JSON.")
+    parser.add_argument('--host', default=os.environ.get('EPL_STATS_HOST', DEFAULT_HOST))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('EPL_STATS_PORT', DEFAULT_PORT)))
+    parser.add_argument('--team', help="write the stats of this team as JSON and exit instead of serving")
+    parser.add_argument('--season', default=ALL_SEASONS, help="season of --team, e.g. 2022/23 (default: all seasons)")
+    parser.add_argument('--out', help="file to write the JSON of --team to (default: stdout)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    service = StatsService.from_env()
+    if args.team:
+        status, _, body = service.respond('/stats', urlencode({'team': args.team, 'season': args.season}))
+        if args.out:
+            with open(args.out, 'wb') as f:
+                f.write(body)
+        else:
+            sys.stdout.write(body.decode() + '\n')
+        raise SystemExit(0 if status == 200 else 1)
+
+    # Like the app, the service can refresh the current-season data itself (EPL_REFRESH_SECONDS).
+    RefreshScheduler.from_env(service.shared_dataset).start()
+    server = make_server(service, args.host, args.port)
+    logger.info('Serving stats on http://%s:%d', *server.server_address[:2])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
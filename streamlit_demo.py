@@ -1,42 +1,75 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-
-
-# Defining CSV file names with scraped data
-epl_teams_csv = "full_data.csv"
-img_teams_csv = "imgurls.csv"
-update_teams_csv = "2023_matches.csv"
-end_standings_csv = "end_tables.csv"
-current_standings_csv = "fresh_table.csv"
-
-# Loading data from CSV files into dataframes
-epl_teams_df = pd.read_csv(epl_teams_csv)
-img_teams_df = pd.read_csv(img_teams_csv)
-update_teams_df = pd.read_csv(update_teams_csv)
-end_standings = pd.read_csv(end_standings_csv)
-current_standings = pd.read_csv(current_standings_csv)
-
-# Data Cleaning and Transformation:
-epl_teams_df = pd.concat([update_teams_df, epl_teams_df], ignore_index=True)
-epl_teams_df = epl_teams_df.drop_duplicates(subset=["team", "date"], keep="first")
-epl_teams_df['season'] = epl_teams_df['season'].astype(str)
-
-epl_teams_df['secondpartseason'] = (epl_teams_df['season'].str[-2:].astype(int) + 1).astype(str)
-epl_teams_df['season'] = epl_teams_df['season'] + '/' + epl_teams_df['secondpartseason']
-epl_teams_df = pd.merge(epl_teams_df, img_teams_df, on="team", how="left")
-
-# Calculate points gathered each matchweek.
-epl_teams_df['points_added'] = epl_teams_df['result'].map({'W': 3, 'D': 1}).fillna(0)
-# Concatenate and clean up the standings DataFrame.
-epl_teams_standings = pd.concat([end_standings, current_standings], ignore_index=True)
-epl_teams_standings = epl_teams_standings.rename(columns={'Season': 'season'})
-epl_teams_standings['season'] = epl_teams_standings['season'].str.replace(' ', '')
-epl_teams_standings['season'] = epl_teams_standings['season'].str.replace(',', '')
-# Rename columns, clean team names, and merge with the main DataFrame.
-epl_teams_standings.rename(columns={'Squad': 'team'}, inplace=True)
-epl_teams_standings['team'] = epl_teams_standings['team'].str.replace('Utd', 'United').str.replace("Nottingham Forest", "Nott'ham Forest").str.replace("West Brom", "West Bromwich Albion").str.replace("Tottenham", "Tottenham Hotspur")
-epl_teams_df = pd.merge(epl_teams_standings, epl_teams_df, on=['season', 'team'], how='right')
+
+import profiling
+from chart_payload import line_chart, scatter_chart
+from figure_cache import FigureCache
+from refresh_scheduler import RefreshScheduler
+from regression import add_trendline, fit_pairs
+from shared_dataset import SharedDataset
+from team_stats import dashboard_stats, standing_stats
+from team_registry import season_id
+
+
+# Function to create the process-wide dataset holder shared by every session.
+# It reloads the data when the source files change and swaps the new version in atomically.
+@st.cache_resource(show_spinner=False)
+def load_shared_dataset():
+    return SharedDataset.from_env()
+
+
+# Function to start the background refresh of the current-season data (when EPL_REFRESH_SECONDS is set).
+# One scheduler per process; refreshed data is swapped into the shared dataset.
+@st.cache_resource(show_spinner=False)
+def load_refresh_scheduler():
+    return RefreshScheduler.from_env(load_shared_dataset()).start()
+
+
+# Function to create the cache of season projections shared by every session (see season_simulator).
+@st.cache_resource(show_spinner=False)
+def load_projection_cache():
+    from season_simulator import ProjectionCache
+
+    return ProjectionCache.from_env()
+
+
+# Function to create the LRU figure cache shared by every session of this process.
+# Keys carry the version of the charted season, so it survives data refreshes and evicts stale charts by LRU.
+@st.cache_resource(show_spinner=False)
+def load_figure_cache():
+    return FigureCache.from_env()
+
+
+# Function to create the Match Finder geocoder, whose on-disk cache is shared by all sessions.
+@st.cache_resource(show_spinner=False)
+def load_geocoder():
+    from geocoding import Geocoder
+
+    return Geocoder.from_env()
+
+
+# Function to create the Match Finder fixture fetcher, whose page cache is shared by all sessions.
+@st.cache_resource(show_spinner=False)
+def load_fixture_fetcher():
+    from fixtures import FixtureFetcher
+
+    return FixtureFetcher.from_env()
+
+
+# Timing spans of this rerun, collected when EPL_PROFILE=1 is set or the page is opened with ?profile=1
+rerun_profile = profiling.start_rerun(profiling.enabled_from_env() or st.query_params.get('profile') == '1')
+
+# The whole rerun reads one dataset snapshot, even if a newer one is swapped in meanwhile.
+with profiling.span('load_datasets'):
+    dataset = load_shared_dataset().get()
+    epl_teams_df, epl_teams_standings = dataset.epl_teams_df, dataset.epl_teams_standings
+    team_index = dataset.team_index
+    team_summary = dataset.team_summary
+    standings_engine = dataset.standings_engine
+    split_index = dataset.split_index
+    trendline_cache = dataset.trendline_cache
+    figure_cache = load_figure_cache()
+    refresh_scheduler = load_refresh_scheduler()
 
 #Defining URLs for icons used in the dashboard 
 goal_img = "https://th.bing.com/th/id/OIP.z0AsMeV8Ihpi-VYoos-_HQAAAA?rs=1&pid=ImgDetMain"
@@ -48,160 +81,156 @@ xga_img = "https://cdn0.iconfinder.com/data/icons/business-analytics-5/96/Pictur
 # Function to filter the EPL teams DataFrame based on selected team and season.
 # If a specific team is selected, filter rows accordingly.
 # If a specific season (other than 'All seasons') is selected, filter rows based on the season.
-# Returns the filtered DataFrame.
+# Returns the filtered DataFrame as a slice of the prebuilt team index (no full-table copy or scan).
 def filter_team(selected_team, selected_season):
-    filtered_teams = epl_teams_df.copy()
+    return team_index.slice(selected_team, selected_season)
 
-    if selected_team:
-        filtered_teams = filtered_teams[filtered_teams['team'] == selected_team]
+# Function to process and format standing data from a team DataFrame.
+# Position (in a human-readable format), total points and points per match come from team_stats,
+# so the stats service returns the same numbers.
+@profiling.profiled
+def standing_data(team_df):
 
-    if selected_season and selected_season != 'All seasons':
-        filtered_teams = filtered_teams[filtered_teams['season'] == selected_season]
+    standing = standing_stats(team_df)
 
-    return filtered_teams
+    # Display tiles for goals scored and goals conceded
+    col1, col2, col3, = st.columns(3)
+    col1.metric('Position', standing['position_label'])
+    col2.metric('Points', standing['points'])
+    col3.metric("Points per Match", standing['points_per_match'])
 
-# Function to process and format standing data from a team DataFrame.
-# Extracts position and converts it to a human-readable format.
-# Determines an appropriate image URL based on the team's position.
-# Extracts total points and points per match for further use.
-def standing_data(team_df):
 
-    position = team_df['Rk'].astype(int).iloc[0]
+# Function to identify the selection a team slice belongs to, as a (team, season) key.
+# A slice spanning several seasons is keyed as 'All seasons'.
+def selection_key(team_df):
+    seasons = team_df['season']
+    season = seasons.iloc[0] if seasons.iloc[0] == seasons.iloc[-1] else 'All seasons'
+    return (team_df['team'].iloc[0], season)
 
-    if position == 1:
-        position_str = '1st'
-    elif position == 2:
-        position_str = '2nd'
-    elif position == 3:
-        position_str = '3rd'
-    else:
-        position_str = f'{position}th'
 
-    points = team_df['Pts'].astype(int).iloc[0]
-    points_per_match = team_df['Pts/MP'].iloc[0]
+# Function to fetch a chart from the shared figure cache, calling build() only on a miss.
+# The version of the selected season's data is part of the key, so charts of older data are never
+# served, while charts of seasons a refresh did not touch stay cached.
+# Profiled as 'chart:<name>', with a nested 'build:<name>' span when the chart had to be built,
+# and the size of the figure's JSON payload is recorded for the profiler panel.
+def cached_figure(chart, selection, build):
+    def profiled_build():
+        with profiling.span(f'build:{chart}'):
+            return build()
 
-    # Display tiles for goals scored and goals conceded
-    col1, col2, col3, = st.columns(3)
-    col1.metric('Position', position_str)
-    col2.metric('Points', points)
-    col3.metric("Points per Match", points_per_match)
+    key = (chart, selection, dataset.version(selection[1]))
+    with profiling.span(f'chart:{chart}'):
+        fig = figure_cache.get_or_build(key, profiled_build)
+    if rerun_profile.enabled:
+        rerun_profile.payload(chart, figure_cache.payload_nbytes(key))
+    return fig
+
+
+# Function to get the fitted trendlines of all correlation charts for a team slice.
+# Fits are memoized per (team, season).
+def trendline_fits(team_df):
+    return trendline_cache.fits(selection_key(team_df), team_df)
 
 
 # Function to create a scatter plot and calculate the correlation coefficient
+@profiling.profiled
 def correelation_pass_poss(team_df):
 
     # Scatter plot with correlation coefficient
-    fig = px.scatter(
-        team_df,
-        x='cmp%',
-        y='poss',
-        title='Correlation between Successful Passes and Possession',
-        labels={'cmp%': 'Successful Passes Percentage', 'poss': 'Possession Percentage'},
-        trendline='ols',  # Ordinary Least Squares regression line
-    )
+    def build():
+        fig = scatter_chart(
+            team_df,
+            'cmp%',
+            'poss',
+            title='Correlation between Successful Passes and Possession',
+            labels={'cmp%': 'Successful Passes Percentage', 'poss': 'Possession Percentage'},
+        )
+        # Ordinary Least Squares regression line and correlation coefficient
+        add_trendline(fig, trendline_fits(team_df)[('cmp%', 'poss')])
+        return fig
 
     # Show the plot
-    st.plotly_chart(fig)
+    st.plotly_chart(cached_figure('pass_poss', selection_key(team_df), build))
     
 # Function to create a scatter plot and calculate the correlation coefficient
+@profiling.profiled
 def correlation_goals_cmp(team_df): 
     # Scatter plot with correlation coefficient
-    fig = px.scatter(
-        team_df,
-        x='cmp%',
-        y='gf',
-        title='Correlation between Goals Scored and Passes Completed',
-        labels={'cmp%': 'Succesfull Passes Percentage', 'gf': 'Goals Scored'},
-        trendline='ols',  # Ordinary Least Squares regression line
-    )
+    def build():
+        fig = scatter_chart(
+            team_df,
+            'cmp%',
+            'gf',
+            title='Correlation between Goals Scored and Passes Completed',
+            labels={'cmp%': 'Succesfull Passes Percentage', 'gf': 'Goals Scored'},
+        )
+        # Ordinary Least Squares regression line and correlation coefficient
+        add_trendline(fig, trendline_fits(team_df)[('cmp%', 'gf')])
+        return fig
 
     # Show the plot in Streamlit app
-    st.plotly_chart(fig)
+    st.plotly_chart(cached_figure('goals_cmp', selection_key(team_df), build))
     
 # Function to create a scatter plot and calculate the correlation coefficient
+@profiling.profiled
 def correlation_goals_xg(team_df):
     # Scatter plot with correlation coefficient
-    fig = px.scatter(
-        team_df,
-        x='xg',
-        y='gf',
-        title='Correlation between Expected Goals (xG) and Goals Scored',
-        labels={'xg': 'Expected Goals', 'gf': 'Goals Scored'},
-        trendline='ols',  # Ordinary Least Squares regression line
-    )
-    st.plotly_chart(fig)
+    def build():
+        fig = scatter_chart(
+            team_df,
+            'xg',
+            'gf',
+            title='Correlation between Expected Goals (xG) and Goals Scored',
+            labels={'xg': 'Expected Goals', 'gf': 'Goals Scored'},
+        )
+        # Ordinary Least Squares regression line and correlation coefficient
+        add_trendline(fig, trendline_fits(team_df)[('xg', 'gf')])
+        return fig
+
+    st.plotly_chart(cached_figure('goals_xg', selection_key(team_df), build))
     
 # Function to create a scatter plot and calculate the correlation coefficient
+@profiling.profiled
 def correlation_poss_ga(team_df):
     # Scatter plot with correlation coefficient
-    fig = px.scatter(
-        team_df,
-        x='poss',
-        y='ga',
-        title='Correlation between Possesion (%) and Goals Conceded',
-        labels={'poss': 'Possesion (%)', 'ga': 'Goals Conceded'},
-        trendline='ols',  # Ordinary Least Squares regression line
-    )
-    st.plotly_chart(fig)
+    def build():
+        fig = scatter_chart(
+            team_df,
+            'poss',
+            'ga',
+            title='Correlation between Possesion (%) and Goals Conceded',
+            labels={'poss': 'Possesion (%)', 'ga': 'Goals Conceded'},
+        )
+        # Ordinary Least Squares regression line and correlation coefficient
+        add_trendline(fig, trendline_fits(team_df)[('poss', 'ga')])
+        return fig
+
+    st.plotly_chart(cached_figure('poss_ga', selection_key(team_df), build))
 
 # Function to create a scatter plot and calculate the correlation coefficient
+@profiling.profiled
 def correlation_poss_gf(team_df):
     # Scatter plot with correlation coefficient
-    fig = px.scatter(
-        team_df,
-        x='poss',
-        y='gf',
-        title='Correlation between Possesion (%) and Goals Scored',
-        labels={'poss': 'Possesion (%)', 'gf': 'Goals Scored'},
-        trendline='ols',  # Ordinary Least Squares regression line
-    )
-    st.plotly_chart(fig)
-
-
-
-# Function to create a dashboard using Streamlit for a given team DataFrame.
-# Display basic statistics, including total goals scored, total goals conceded, expected goals (xG), and expected goals conceded (xGA).
-# Display a stacked horizontal bar chart comparing average possession and average opponent possession.
-# Uses Plotly Express library for visualization with custom colors and formatting.
-# Display a pie chart illustrating the percentage of successful and unsuccessful passes.
-# Uses Plotly Express library for visualization with a hole in the center for improved clarity.
-def create_dashboard(team_df):
-
-    st.subheader(f'Basic Stats')
-
-    # Calculate total goals scored and total goals conceded
-    goals_scored = team_df['gf'].astype(int).sum()
-    goals_conceded = team_df['ga'].astype(int).sum()
-
-    xg = team_df['xG'].iloc[0]
-    xga = team_df['xGA'].iloc[0]
-
-    # Display tiles for goals scored and goals conceded
-    col1, col2, col3, col4 = st.columns(4)
-    col1.metric('Goals Scored', goals_scored)
-    col2.image(goal_img, width=80)
-    col3.metric('Goals Conceded', goals_conceded)
-    col4.image(goal_img, width=80)
-    
-    # Add new columns
-    new_column1 = col1.metric('Expect Goals', xg)
-    new_column2 = col2.image(xg_img, width=80)
-    new_column3 = col3.metric('Expected Goals Conceded', xga)
-    new_column4 = col4.image(xg_img, width=80)
-
-    st.subheader(f'Dashboard for {team_df["team"].iloc[0]} in {team_df["season"].iloc[0]}')
+    def build():
+        fig = scatter_chart(
+            team_df,
+            'poss',
+            'gf',
+            title='Correlation between Possesion (%) and Goals Scored',
+            labels={'poss': 'Possesion (%)', 'gf': 'Goals Scored'},
+        )
+        # Ordinary Least Squares regression line and correlation coefficient
+        add_trendline(fig, trendline_fits(team_df)[('poss', 'gf')])
+        return fig
 
-    # Calculate mean for "cmp%" column
-    pass_success = team_df['cmp%'].mean()
-    pass_failure = 100 - pass_success
+    st.plotly_chart(cached_figure('poss_gf', selection_key(team_df), build))
 
-    #Calculate mean for possesion
-    Teamposs = team_df['poss'].mean()
-    Opponentposs = 100 - Teamposs
 
-    goals_scored = team_df['gf'].sum()
-    goals_conceded = team_df['ga'].sum()
 
+# Function to create a stacked horizontal bar chart of average team vs. opponent possession.
+# Uses Plotly Express library for visualization with custom colors and formatting.
+def create_possession_bar(Teamposs, Opponentposs):
+    import plotly.express as px
 
     data = pd.DataFrame({
         'Metric': ['Possession'],
@@ -219,22 +248,19 @@ def create_dashboard(team_df):
         title='Average Possession vs Average Opponent Possession',
         color_discrete_map={'Team Possession': 'blue', 'Opponent Possession': 'red'},
         height=250  # Adjust the height as needed
-          # Adjust the width as needed
     )
 
     fig.update_traces(texttemplate='%{x:.2f}%', textposition='inside')
     fig.update_yaxes(showticklabels=False)
     # Remove legend label "index" from the left side
     fig.update_layout(legend=dict(title=''))
-    fig.update_layout(legend=dict(title=''))
-
-
+    return fig
 
 
-
-    # Show the chart
-    st.plotly_chart(fig)
-
+# Function to create a pie chart of successful vs. unsuccessful passes.
+# Uses Plotly Express library for visualization with a hole in the center for improved clarity.
+def create_pass_pie(pass_success, pass_failure):
+    import plotly.express as px
 
     # Create a DataFrame for the pie chart
     data = pd.DataFrame({
@@ -243,7 +269,7 @@ def create_dashboard(team_df):
     })
 
     # Create a pie chart
-    fig2 = px.pie(
+    return px.pie(
         data,
         names='Type',
         values='Percentage',
@@ -252,25 +278,25 @@ def create_dashboard(team_df):
         hole=0.4
     )
 
-    # Show the chart
-    st.plotly_chart(fig2)
 
-# Function to create a dashboard for all seasons using Streamlit for a given team DataFrame.
-# Display basic statistics, including total goals scored and total goals conceded.
-# Utilizes Streamlit columns and metric elements for a visually appealing layout.
+# Function to create a dashboard using Streamlit for a given team DataFrame.
+# Display basic statistics, including total goals scored, total goals conceded, expected goals (xG), and expected goals conceded (xGA).
 # Display a stacked horizontal bar chart comparing average possession and average opponent possession.
 # Uses Plotly Express library for visualization with custom colors and formatting.
 # Display a pie chart illustrating the percentage of successful and unsuccessful passes.
 # Uses Plotly Express library for visualization with a hole in the center for improved clarity.
-
-def create_dashboard_allseasons(team_df):
+@profiling.profiled
+def create_dashboard(team_df):
 
     st.subheader(f'Basic Stats')
 
-    # Calculate total goals scored and total goals conceded
-    goals_scored = team_df['gf'].astype(int).sum()
-    goals_conceded = team_df['ga'].astype(int).sum()
+    # Read precomputed totals and means for this team-season
+    stats = dashboard_stats(team_summary.team_season(team_df['team_id'].iloc[0], team_df['season_id'].iloc[0]), team_df)
+    goals_scored = stats['goals_scored']
+    goals_conceded = stats['goals_conceded']
 
+    xg = stats['xg']
+    xga = stats['xga']
 
     # Display tiles for goals scored and goals conceded
     col1, col2, col3, col4 = st.columns(4)
@@ -279,119 +305,323 @@ def create_dashboard_allseasons(team_df):
     col3.metric('Goals Conceded', goals_conceded)
     col4.image(goal_img, width=80)
     
+    # Add new columns
+    new_column1 = col1.metric('Expect Goals', xg)
+    new_column2 = col2.image(xg_img, width=80)
+    new_column3 = col3.metric('Expected Goals Conceded', xga)
+    new_column4 = col4.image(xg_img, width=80)
 
-    st.subheader(f'Dashboard for {team_df["team"].iloc[0]} (2017-2023)')
+    st.subheader(f'Dashboard for {team_df["team"].iloc[0]} in {team_df["season"].iloc[0]}')
 
-    # Calculate mean for "cmp%" column
-    pass_success = team_df['cmp%'].mean()
+    # Mean for "cmp%" column
+    pass_success = stats['pass_success']
     pass_failure = 100 - pass_success
 
-    #Calculate mean for possesion
-    Teamposs = team_df['poss'].mean()
+    # Mean for possesion
+    Teamposs = stats['possession']
     Opponentposs = 100 - Teamposs
 
-    goals_scored = team_df['gf'].sum()
-    goals_conceded = team_df['ga'].sum()
 
+    # Show the possession bar chart and the pass success pie chart
+    selection = selection_key(team_df)
+    st.plotly_chart(cached_figure('possession_bar', selection, lambda: create_possession_bar(Teamposs, Opponentposs)))
+    st.plotly_chart(cached_figure('pass_pie', selection, lambda: create_pass_pie(pass_success, pass_failure)))
 
-    data = pd.DataFrame({
-        'Metric': ['Possession'],
-        'Team Possession': [Teamposs],
-        'Opponent Possession': [Opponentposs]
-    })
-
-    # Create a stacked horizontal bar chart
-    fig = px.bar(
-        data,
-        x=['Team Possession', 'Opponent Possession'],
-        y='Metric',
-        orientation='h',
-        labels={'value': 'Possession Percentage'},
-        title='Average Possession vs Average Opponent Possession',
-        color_discrete_map={'Team Possession': 'blue', 'Opponent Possession': 'red'},
-        height=250  # Adjust the height as needed
-          # Adjust the width as needed
-    )
+# Function to create a dashboard for all seasons using Streamlit for a given team DataFrame.
+# Display basic statistics, including total goals scored and total goals conceded.
+# Utilizes Streamlit columns and metric elements for a visually appealing layout.
+# Display a stacked horizontal bar chart comparing average possession and average opponent possession.
+# Uses Plotly Express library for visualization with custom colors and formatting.
+# Display a pie chart illustrating the percentage of successful and unsuccessful passes.
+# Uses Plotly Express library for visualization with a hole in the center for improved clarity.
 
-    fig.update_traces(texttemplate='%{x:.2f}%', textposition='inside')
-    fig.update_yaxes(showticklabels=False)
-    # Remove legend label "index" from the left side
-    fig.update_layout(legend=dict(title=''))
-    fig.update_layout(legend=dict(title=''))
+@profiling.profiled
+def create_dashboard_allseasons(team_df):
 
+    st.subheader(f'Basic Stats')
 
+    # Read precomputed totals and means across all seasons
+    stats = dashboard_stats(team_summary.team_all_seasons(team_df['team_id'].iloc[0]))
+    goals_scored = stats['goals_scored']
+    goals_conceded = stats['goals_conceded']
 
 
+    # Display tiles for goals scored and goals conceded
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric('Goals Scored', goals_scored)
+    col2.image(goal_img, width=80)
+    col3.metric('Goals Conceded', goals_conceded)
+    col4.image(goal_img, width=80)
+    
 
-    # Show the chart
-    st.plotly_chart(fig)
+    st.subheader(f'Dashboard for {team_df["team"].iloc[0]} (2017-2023)')
 
+    # Mean for "cmp%" column
+    pass_success = stats['pass_success']
+    pass_failure = 100 - pass_success
 
-    # Create a DataFrame for the pie chart
-    data = pd.DataFrame({
-        'Type': ['Pass Successful', 'Pass Unsuccessful'],
-        'Percentage': [pass_success, pass_failure]
-    })
+    # Mean for possesion
+    Teamposs = stats['possession']
+    Opponentposs = 100 - Teamposs
 
-    # Create a pie chart
-    fig2 = px.pie(
-        data,
-        names='Type',
-        values='Percentage',
-        title='Pass Success vs. Pass Failure',
-        labels={'Percentage': ''},
-        hole=0.4
-    )
 
-    # Show the chart
-    st.plotly_chart(fig2)
+    # Show the possession bar chart and the pass success pie chart
+    selection = selection_key(team_df)
+    st.plotly_chart(cached_figure('possession_bar', selection, lambda: create_possession_bar(Teamposs, Opponentposs)))
+    st.plotly_chart(cached_figure('pass_pie', selection, lambda: create_pass_pie(pass_success, pass_failure)))
 
 # Function to create a line chart representing the cumulative points for a team across matchweeks.
+# Matches are in date order and their cumulative points are precomputed (see season_progress).
+@profiling.profiled
 def create_points_chart(team_df):
     st.subheader(f'Points Chart for {team_df["team"].iloc[0]} in {team_df["season"].iloc[0]}')
 
     # Create a line chart for matchweek vs. cumulative points
-    points_chart = px.line(
-        team_df,
-        x='round',
-        y=team_df['points_added'].cumsum(),
-        labels={'round': 'Matchweek', 'y': 'Cumulative Points'},  # Explicitly set the y-axis label
-        title=f'Cumulative Points for {team_df["team"].iloc[0]}',
-        )
-    st.plotly_chart(points_chart)
+    def build():
+        import plotly.express as px
+
+        return px.line(
+            team_df,
+            x='round',
+            y='cum_points',
+            labels={'round': 'Matchweek', 'cum_points': 'Cumulative Points'},  # Explicitly set the y-axis label
+            title=f'Cumulative Points for {team_df["team"].iloc[0]}',
+            )
+    st.plotly_chart(cached_figure('points_chart', selection_key(team_df), build))
 
 
 
 # Function to create an indicator for the last 5 matches' results.
+# The form string of the latest match holds them, most recent first.
+@profiling.profiled
 def create_form_indicator(team_df):
     st.subheader('Last 5 Matches')
 
-        # Get the last 5 matches, reverse the order, and create tiles based on the result
-    last_5_matches = team_df.tail(5).iloc[::-1]
-        
-    form_indicator_html = ""
-    for _, match in last_5_matches.iterrows():
-        result = match['result']
-        color = 'green' if result == 'W' else 'orange' if result == 'D' else 'red'
-        form_indicator_html += f'<div style="display:inline-block; background-color:{color}; color:white; width:20px; height:20px; text-align:center;">{result}</div> '
+    colors = {'W': 'green', 'D': 'orange'}
+    form_indicator_html = ''.join(
+        f'<div style="display:inline-block; background-color:{colors.get(result, "red")}; color:white; width:20px; height:20px; text-align:center;">{result}</div> '
+        for result in team_df['form'].iloc[-1]
+    )
 
     st.markdown(form_indicator_html, unsafe_allow_html=True)
 
 
+# Function to show the league table of a season after a matchweek picked with a slider.
+# Tables are precomputed for every matchweek (see standings_engine), so moving the slider is a lookup,
+# and as a fragment only this section reruns (Streamlit >= 1.37; older versions rerun the page).
+@getattr(st, 'fragment', lambda func: func)
+@profiling.profiled
+def create_matchweek_table(selected_season):
+    n_weeks = standings_engine.matchweeks(season_id(selected_season))
+    if n_weeks == 0:
+        return
+    st.subheader('Table by Matchweek')
+    if n_weeks > 1:
+        matchweek = st.slider('Matchweek', min_value=1, max_value=n_weeks, value=n_weeks, key=f'matchweek_{selected_season}')
+    else:
+        matchweek = n_weeks
+    st.caption(f'Table after matchweek {matchweek}, computed from the match results (point deductions are not applied).')
+    st.dataframe(standings_engine.table(season_id(selected_season), matchweek), hide_index=True)
+
+
+# Function to show a team's results across all seasons split by opponent, venue, formation or referee,
+# and its head-to-head record against one opponent. Every table is a lookup in the precomputed
+# split index, and as a fragment only this section reruns when a split or an opponent is picked.
+@getattr(st, 'fragment', lambda func: func)
+@profiling.profiled
+def create_split_view(selected_team):
+    from split_index import SPLITS
+
+    st.subheader('Splits')
+    split_column = st.selectbox('Split by', list(SPLITS), format_func=SPLITS.get, key='split_by')
+    st.dataframe(split_index.split(selected_team, split_column), hide_index=True)
+
+    st.subheader('Head to Head')
+    opponents = split_index.opponents(selected_team)
+    if not opponents:
+        return
+    opponent = st.selectbox('Opponent', opponents, key='head_to_head_opponent')
+    record, matches = split_index.head_to_head(selected_team, opponent)
+    if record is not None:
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric('Won', int(record['W']))
+        col2.metric('Drawn', int(record['D']))
+        col3.metric('Lost', int(record['L']))
+        col4.metric('Goals', f"{int(record['GF'])}-{int(record['GA'])}")
+    st.dataframe(matches, hide_index=True)
+
+
+# Function to show the projected end of the current season for a team: title, top four and relegation
+# chances from simulating the remaining fixtures. The simulation runs in the background; until it is
+# done the section polls for it (as a fragment, Streamlit >= 1.37) instead of holding up the page.
+@profiling.profiled
+def create_projection(team_df):
+    season = team_df['season'].iloc[0]
+    if season != team_index.seasons[0]:
+        return
+    team_id, current_season_id = team_df['team_id'].iloc[0], team_df['season_id'].iloc[0]
+    projection_cache = load_projection_cache()
+
+    def show():
+        projection = projection_cache.get(dataset, current_season_id, season)
+        if projection is None:
+            if projection_cache.pending(dataset, current_season_id, season):
+                st.caption('Projecting the rest of the season...')
+            return
+        team_projection = projection[projection['team_id'] == team_id]
+        if team_projection.empty:
+            return
+        team_projection = team_projection.iloc[0]
+        st.subheader('Season Projection')
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric('Title', f"{team_projection['title']:.0%}")
+        col2.metric('Top Four', f"{team_projection['top_four']:.0%}")
+        col3.metric('Relegation', f"{team_projection['relegation']:.0%}")
+        col4.metric('Expected Points', f"{team_projection['expected_points']:.0f}")
+        st.caption(f'From {projection_cache.runs:,} simulations of the remaining fixtures, with scoring rates fitted to xG.')
+
+    # While the projection is running, a fragment polls for it every 2 seconds; once it is done the whole
+    # app is rerun, which renders it with show() and stops the polling.
+    def poll():
+        if projection_cache.get(dataset, current_season_id, season) is not None \
+                or not projection_cache.pending(dataset, current_season_id, season):
+            st.rerun()
+        st.caption('Projecting the rest of the season...')
+
+    fragment = getattr(st, 'fragment', None)
+    if fragment is not None and projection_cache.get(dataset, current_season_id, season) is None \
+            and projection_cache.pending(dataset, current_season_id, season):
+        fragment(run_every=2)(poll)()
+    else:
+        show()
+
+
+# Function to create the points race of a season: the cumulative points of every team by matches played.
+# Reads the precomputed cumulative points of the season's rows, so no per-team work is done here.
+@profiling.profiled
+def create_points_race(selected_season):
+    st.subheader('Points Race')
+
+    def build():
+        season_df = filter_team('', selected_season)
+        race = season_df[['team', 'match_number', 'cum_points']].sort_values(['team', 'match_number'], kind='mergesort')
+        race['team'] = race['team'].astype(str)
+        return line_chart(
+            race,
+            'match_number',
+            'cum_points',
+            'team',
+            labels={'match_number': 'Matches Played', 'cum_points': 'Cumulative Points', 'team': 'Team'},
+            title=f'Points Race {selected_season}',
+        )
+    st.plotly_chart(cached_figure('points_race', ('', selected_season), build))
+
+
+# Function to create the full standings table of a season with its statistics and visualizations.
+@profiling.profiled
+def create_standings_view(selected_season):
+    import plotly.express as px
+
+    st.header(f"{selected_season} Full Standings Table")
+
+    epl_teams_standings_filtered = epl_teams_standings[epl_teams_standings['season_id'] == season_id(selected_season)]
+    epl_teams_standings_filtered = epl_teams_standings_filtered.drop(columns=['Goalkeeper', 'Notes', 'season', 'Last 5', 'team_id', 'season_id'])
+    epl_teams_standings_filtered = epl_teams_standings_filtered.rename(columns={'Rk': 'Position', 'team': 'Team'})
+
+    st.write(epl_teams_standings_filtered.reset_index(drop=True))
+
+    # Display various statistics and visualizations
+    st.subheader("Statistics and Visualizations")
+    selection = ('', selected_season)
+    
+
+    # Goal Difference Plot
+    st.write("Goal Difference Plot:")
+    goal_diff_chart = cached_figure('goal_diff', selection, lambda: px.bar(epl_teams_standings_filtered, x='Team', y='GD', title='Goal Difference'))
+    st.plotly_chart(goal_diff_chart)
+
+    
+    # Position vs. Points Scatter Plot
+    st.write("Position vs. Points Scatter Plot:")
+    scatter_plot = cached_figure('position_points', selection, lambda: px.scatter(epl_teams_standings_filtered, x='Position', y='Pts', text='Team', title='Position vs. Points'))
+    st.plotly_chart(scatter_plot)
+
+    # Goal For vs. Goal Against Scatter Plot
+    st.write("Goal For vs. Goal Against Scatter Plot:")
+    goal_scatter_plot = cached_figure('gf_ga', selection, lambda: px.scatter(epl_teams_standings_filtered, x='GF', y='GA', text='Team', title='Goals For vs. Goals Against'))
+    st.plotly_chart(goal_scatter_plot)
+
+    # Goal For vs. Expected Goals Scatter Plot
+    st.write("Goals Scored vs. Expected Goals:")
+    goal_scatter_plot = cached_figure('gf_xg', selection, lambda: px.scatter(epl_teams_standings_filtered, x='xG', y='GF', text='Team', title='Goals For vs. Expected Goals'))
+    st.plotly_chart(goal_scatter_plot)
+
+
+    # Scatter plot with correlation line
+    def build_attendance_chart():
+        scatter_fig = px.scatter(epl_teams_standings_filtered, x='Attendance', y='GF', title='Correlation between Attendance and Goals Scored')
+        add_trendline(scatter_fig, fit_pairs(epl_teams_standings_filtered, [('Attendance', 'GF')])[('Attendance', 'GF')])
+
+        # Customize the layout
+        scatter_fig.update_layout(
+            xaxis_title='Attendance',
+            yaxis_title='Goals Scored',
+        )
+        return scatter_fig
+
+    # Show the scatter plot
+    st.plotly_chart(cached_figure('attendance_gf', selection, build_attendance_chart))
+
+
+# Function to show when the current-season data was last refreshed, and how long that took.
+def show_refresh_status(scheduler):
+    status = scheduler.status()
+    if status['last_refresh_at'] is None:
+        st.sidebar.caption(f"Data refreshes every {status['interval_s']:.0f} s")
+        return
+    refreshed_at = pd.Timestamp(status['last_refresh_at'], unit='s', tz='UTC').strftime('%Y-%m-%d %H:%M UTC')
+    if status['last_error']:
+        st.sidebar.caption(f"Data refresh failed at {refreshed_at}: {status['last_error']}")
+    else:
+        st.sidebar.caption(f"Data refreshed at {refreshed_at} in {status['last_duration_s']:.1f} s")
+
+
+# Function to show the timing spans of this rerun in a sidebar debug panel, with the payload size of every chart sent.
+# The spans and payloads can be downloaded as JSON lines, the totals of all profiled reruns in Prometheus text format.
+def show_profiler(profile):
+    records = profile.records()
+    with st.sidebar.expander('Profiler', expanded=True):
+        st.write(f'Rerun {profile.rerun_id}: {profile.total_seconds() * 1000:.1f} ms')
+        st.dataframe(pd.DataFrame({
+            'Section': ['\u00a0\u00a0' * record['depth'] + record['span'] for record in records],
+            'ms': [record['duration_ms'] for record in records],
+        }), hide_index=True)
+        payloads = profile.payload_records()
+        if payloads:
+            st.write(f'Chart payloads: {profile.payload_bytes() / 1024:.1f} KB')
+            st.dataframe(pd.DataFrame({
+                'Chart': [record['chart'] for record in payloads],
+                'KB': [round(record['payload_bytes'] / 1024, 1) for record in payloads],
+            }), hide_index=True)
+        st.download_button('Spans (JSON lines)', profiling.to_json_lines(records + payloads), file_name='spans.jsonl')
+        st.download_button('Totals (Prometheus)', profiling.TOTALS.to_prometheus(), file_name='spans.prom')
+
+
 # Streamlit App - Main
 def main():
     import streamlit as st
     import pandas as pd
     
     # Sidebar with team dropdown and season dropdown
-    sorted_teams = sorted(epl_teams_df['team'].unique())
+    sorted_teams = team_index.teams
     selected_team = st.sidebar.selectbox('Select team', [''] + sorted_teams, format_func=lambda x: x.upper())
 
-    unique_seasons = epl_teams_df['season'].unique()
-    sorted_seasons = sorted(unique_seasons, reverse=True)
+    sorted_seasons = team_index.seasons
     # Create the season dropdown
     selected_season = st.sidebar.selectbox('Select season', ['All seasons'] + sorted_seasons)
     st.sidebar.text("")  # You can use st.sidebar.markdown("___") for a separator
+    if refresh_scheduler.enabled:
+        show_refresh_status(refresh_scheduler)
 
     st.sidebar.markdown("___")
 
@@ -403,154 +633,67 @@ def main():
 
     # Creating input fields for Match Finder
 
-    date = st.sidebar.date_input("Select a Date", pd.to_datetime("today"))
-    user_input = date.strftime("%Y%m%d")
+    today = pd.to_datetime("today").date()
+    selected_dates = st.sidebar.date_input("Select a date range", (today, today))
+    if not isinstance(selected_dates, (tuple, list)):
+        selected_dates = (selected_dates, selected_dates)
+    elif len(selected_dates) == 1:
+        selected_dates = (selected_dates[0], selected_dates[0])
     city_name = st.sidebar.text_input("Enter the name and country of the city (separated by comma):", "London, England")
+    max_distance = st.sidebar.number_input("Maximum distance in km (0 for any distance):", min_value=0, value=0, step=50)
     
     
     if st.sidebar.button("Find Matches"):
-
-        # Import libraries an making a request to a website
-        import requests
-        from bs4 import BeautifulSoup
-        import pandas as pd
-        from datetime import datetime, timedelta
-        import re
-        from datetime import datetime
-        import streamlit as st
-        import requests
-        from bs4 import BeautifulSoup
-        import pandas as pd
-        from datetime import datetime, timedelta
-        from geopy.geocoders import Nominatim
-        from geopy.distance import geodesic
-        
-        
-        url = f'https://www.espn.in/football/fixtures/_/date/{user_input}'
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/109.0.0.0 Safari/537.36',
-        }
-        
-        page = requests.get(url, headers= headers, verify = False)
-        
-        if page.status_code == 200:
+        # The Match Finder modules are only imported once the button is used
+        from distance import nearest
+        from fixture_parser import COLUMNS as FIXTURE_COLUMNS, parse_fixtures
+        from fixtures import MAX_RANGE_DAYS, date_keys
+
+        # Fetch the fixture pages of every selected day concurrently (cached per date)
+        if abs((selected_dates[1] - selected_dates[0]).days) >= MAX_RANGE_DAYS:
+            st.sidebar.warning(f'Only the first {MAX_RANGE_DAYS} days of the date range are searched.')
+        fetcher = load_fixture_fetcher()
+        with profiling.span('fetch_fixtures'):
+            pages = fetcher.fetch(date_keys(*selected_dates))
+
+        frames = []
+        for day, (status_code, page_text) in pages.items():
+            if status_code != 200:
+                st.write(f'Request failed for {day} with status code: {status_code}')
+                continue
+            day_fixtures = parse_fixtures(page_text)
+            day_fixtures.insert(0, 'Date', f'{day[:4]}-{day[4:6]}-{day[6:]}')
+            frames.append(day_fixtures)
+
+        if frames:
             st.write("Request succesfull")  # Print the content of the response
-        else:
-            st.write(f'Request failed with status code: {page.status_code}')
-
-        soup = BeautifulSoup(page.text)
-        table = soup.find_all('table', class_ = 'Table')
-
-        # Initialize lists to store the rows and cells
-        all_rows = []
-
-        # Now, 'df' does not contain rows with "location" in the "Location" column
-        column_names = ['Home Team', 'Away Team', 'Time', 'Location']
-        mydata = pd.DataFrame(columns = column_names)
-
-        for tabl in table:
-            rows = tabl.find_all('tr')
-                
-            for row in rows:
-                    cells = row.find_all(['td', 'th'])
-                    cell_data = [cell.get_text(strip=True) for cell in cells]
-                    all_rows.append(cell_data)
-
-            column_names = ['Home Team', 'Away Team', 'Time', '4', 'Location', '6']
-            df = pd.DataFrame(all_rows, columns = column_names)
-            df = df[~df.apply(lambda row: row.astype(str).str.contains('location').any(), axis=1)]
-            df = df.drop(columns=["4", "6"])
-            df['Away Team'] = df['Away Team'].str[1:]
-
-        time_format = '%I:%M %p'
-        df['Time'] = pd.to_datetime(df['Time'], format=time_format, errors='coerce')
-        df = df.dropna(subset=['Time'])
-        # Subtract 1.5 hours from the datetime values (adjust the time zone to CEE)
-        df['Time'] = df['Time'] - timedelta(hours=3, minutes=30)
-        df['Time'] = df['Time'].dt.strftime(time_format)
-
-        df = df.dropna(subset=['Time'])
-        # Format the datetime values back to the original time format
-
-        df[['Stadium', 'City', 'Country']] = df['Location'].str.split(',', expand=True, n=2)
-        df = df.drop(columns=["Location"])
-        # Reset the index of the DataFrame
-
-
-        df.reset_index(drop=True, inplace=True)
-        df['Location'] = df['City'] + ', ' + df['Country']
-
-        # Drop the original "City" and "Country" columns
-        df = df.drop(['City', 'Country'], axis=1)
-        df = df.dropna(subset=['Location'])
-
-        # List of countries to filter for
-        endings_to_filter = ['England', 'Spain', 'Italy', 'France', 'Germany']
-
-        # Filter the DataFrame using boolean indexing
-        df = df[df['Location'].str.endswith(tuple(endings_to_filter))]
-
-
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['Date'] + FIXTURE_COLUMNS)
 
-        from geopy import Nominatim
-        import pandas as pd
-
-        # Initialize the geolocator
-        geolocator = Nominatim(user_agent="stadium_coordinates")
-
-     
-        # Create empty lists to store the latitude and longitude
-        latitudes = []
-        longitudes = []
-
-        # Iterate through the rows of the DataFrame and geocode the stadium names
-        for stadium_name in df['Location']:
-            location = geolocator.geocode(stadium_name)
-
-            if location:
-                latitudes.append(location.latitude)
-                longitudes.append(location.longitude)
-            else:
-                latitudes.append(None)
-                longitudes.append(None)
+        # Geocode the stadium cities through the cached, rate-limited geocoder
+        geocoder = load_geocoder()
+        with profiling.span('geocode'):
+            coordinates = geocoder.geocode_many(df['Location'])
 
         # Add the latitude and longitude columns to DataFrame
-        df['Latitude'] = latitudes
-        df['Longitude'] = longitudes
-
-        from geopy import Nominatim
-        from geopy.distance import geodesic
-        import pandas as pd
-
-        # Create a geolocator object
-        geolocator = Nominatim(user_agent="stadium_coordinates")
-
-
+        df['Latitude'] = [coords[0] if coords else None for coords in coordinates]
+        df['Longitude'] = [coords[1] if coords else None for coords in coordinates]
 
         # Use geocoder to get the coordinates
-        your_location = geolocator.geocode(city_name)
-
-        data = df
-        data.dropna(subset=['Latitude', 'Longitude'], inplace=True)
-        # Create an empty list to store the distances
-        distances = []
-
-        # Iterate through the rows of the dataframe and calculate distances
-        for index, row in data.iterrows():
-            stadium_location = (row['Latitude'], row['Longitude'])
-            distance = geodesic(your_location.point, stadium_location).kilometers
-            distances.append(distance)
-
-        # Add the distances column to dataframe
-        data['Distance (km)'] = distances
+        your_location = geocoder.geocode(city_name)
 
-        data_sorted = data.sort_values(by='Distance (km)')
+        if your_location is None:
+            # Unknown cities (cached as misses by the geocoder) cannot be ranked against
+            st.sidebar.error(f'Could not find the location of "{city_name}". Enter the city and country, e.g. "London, England".')
+        else:
+            data = df.dropna(subset=['Latitude', 'Longitude'])
 
-        # Select the first 5 rows with the smallest distances
-        smallest_distances = data_sorted.head(5).reset_index(drop=True).drop(columns=['Latitude', 'Longitude'])
+            # Rank all stadiums by distance in one vectorized pass and keep the 5 closest
+            with profiling.span('nearest'):
+                smallest_distances = nearest(data, your_location, k=5, radius_km=max_distance or None)
+            smallest_distances = smallest_distances.reset_index(drop=True).drop(columns=['Latitude', 'Longitude'])
 
-        # Display the 5 rows with the smallest distances
-        st.write(smallest_distances)    
+            # Display the 5 rows with the smallest distances
+            st.write(smallest_distances)    
     
 
 
@@ -567,11 +710,11 @@ def main():
         if selected_team and selected_season and selected_season != 'All seasons':
             title = f"{selected_team} Stats ({selected_season})"
             col1, col2 = st.columns([3, 1])
-            team_row = epl_teams_df[epl_teams_df["team"] == selected_team]
-            img_url = team_row["cresturl"].iloc[0] if not team_row.empty else None
+            img_url = team_index.crest_url(selected_team)
             col1.header(title)
             col2.image(img_url, width=100)
             standing_data(filtered_results)
+            create_projection(filtered_results)
             create_form_indicator(filtered_results)
             create_dashboard(filtered_results)
             create_points_chart(filtered_results)
@@ -582,8 +725,7 @@ def main():
             correlation_poss_ga(filtered_results)
         elif selected_team:
             title = f"{selected_team} Stats (2017-2023)"
-            team_row = epl_teams_df[epl_teams_df["team"] == selected_team]
-            img_url = team_row["cresturl"].iloc[0] if not team_row.empty else None
+            img_url = team_index.crest_url(selected_team)
             col1, col2 = st.columns([3, 1])
             col1.header(title)
             col2.image(img_url, width=100)
@@ -593,58 +735,21 @@ def main():
             correlation_poss_gf(filtered_results)
             correlation_poss_ga(filtered_results)
             correlation_goals_xg(filtered_results)
+            create_split_view(selected_team)
             
 
         elif selected_season and selected_season != 'All seasons':
-            st.header(f"{selected_season} Full Standings Table")
-
-            epl_teams_standings_filtered = epl_teams_standings[epl_teams_standings['season'] == selected_season]
-            epl_teams_standings_filtered = epl_teams_standings_filtered.iloc[:, :-4]
-            epl_teams_standings_filtered = epl_teams_standings_filtered.rename(columns={'Rk': 'Position', 'team': 'Team'})
-
-            st.write(epl_teams_standings_filtered.reset_index(drop=True))
-
-            # Display various statistics and visualizations
-            st.subheader("Statistics and Visualizations")
-            
-
-            # Goal Difference Plot
-            st.write("Goal Difference Plot:")
-            goal_diff_chart = px.bar(epl_teams_standings_filtered, x='Team', y='GD', title='Goal Difference')
-            st.plotly_chart(goal_diff_chart)
-
-            
-            # Position vs. Points Scatter Plot
-            st.write("Position vs. Points Scatter Plot:")
-            scatter_plot = px.scatter(epl_teams_standings_filtered, x='Position', y='Pts', text='Team', title='Position vs. Points')
-            st.plotly_chart(scatter_plot)
-
-            # Goal For vs. Goal Against Scatter Plot
-            st.write("Goal For vs. Goal Against Scatter Plot:")
-            goal_scatter_plot = px.scatter(epl_teams_standings_filtered, x='GF', y='GA', text='Team', title='Goals For vs. Goals Against')
-            st.plotly_chart(goal_scatter_plot)
-
-            # Goal For vs. Expected Goals Scatter Plot
-            st.write("Goals Scored vs. Expected Goals:")
-            goal_scatter_plot = px.scatter(epl_teams_standings_filtered, x='xG', y='GF', text='Team', title='Goals For vs. Expected Goals')
-            st.plotly_chart(goal_scatter_plot)
-
-
-            # Scatter plot with correlation line
-            scatter_fig = px.scatter(epl_teams_standings_filtered, x='Attendance', y='GF', trendline='ols', title='Correlation between Attendance and Goals Scored')
-
-            # Customize the layout
-            scatter_fig.update_layout(
-                xaxis_title='Attendance',
-                yaxis_title='Goals Scored',
-            )
-
-            # Show the scatter plot
-            st.plotly_chart(scatter_fig)
+            create_standings_view(selected_season)
+            create_matchweek_table(selected_season)
+            create_points_race(selected_season)
 
     else:
         st.image(prem_img, width=100, use_column_width=True)
         st.subheader('Please select a team and/or a season.')
+
+    if rerun_profile.enabled:
+        profiling.finish_rerun(rerun_profile)
+        show_profiler(rerun_profile)
         
 
    
@@ -0,0 +1,63 @@
+import numpy as np
+
+from team_registry import TEAM_REGISTRY, season_id
+
+
+# Lookup structure over the match DataFrame, built once per dataset.
+# Rows are sorted by (team_id, season_id) so every team and every team-season is a contiguous
+# block; slices for those keys are positional iloc views found by a dict lookup on the integer IDs.
+# Season-wide slices gather the precomputed row positions of that season.
+# A small per-team table holds team metadata such as the name and the crest URL.
+class TeamSeasonIndex:
+
+    def __init__(self, epl_teams_df, registry=TEAM_REGISTRY):
+        self.registry = registry
+        # Stable sort keeps the original (CSV) order of matches within a team-season.
+        self.df = epl_teams_df.sort_values(['team_id', 'season_id'], kind='mergesort').reset_index(drop=True)
+
+        self._team_season_bounds = {
+            key: (positions[0], positions[-1] + 1)
+            for key, positions in self.df.groupby(['team_id', 'season_id'], sort=False).indices.items()
+        }
+        self._team_bounds = {
+            team_id: (positions[0], positions[-1] + 1)
+            for team_id, positions in self.df.groupby('team_id', sort=False).indices.items()
+        }
+        self._season_positions = self.df.groupby('season_id', sort=False).indices
+
+        self.teams_table = (
+            self.df.drop_duplicates(subset='team_id')[['team_id', 'team', 'cresturl']]
+            .set_index('team_id')
+        )
+        season_labels = self.df.drop_duplicates(subset='season_id').set_index('season_id')['season']
+        self.teams = sorted(self.teams_table['team'].astype(str))
+        self.seasons = [str(season_labels[key]) for key in sorted(self._season_positions, reverse=True)]
+
+    # Function to return the matches of a team, a season or a team-season.
+    # Mirrors filter_team: an empty team or 'All seasons' means no filter on that key.
+    def slice(self, team=None, season=None):
+        if season == 'All seasons':
+            season = None
+        team_id = self.registry.lookup(team) if team else None
+        season_key = season_id(season) if season else None
+
+        if team and season:
+            bounds = self._team_season_bounds.get((team_id, season_key))
+        elif team:
+            bounds = self._team_bounds.get(team_id)
+        elif season:
+            positions = self._season_positions.get(season_key, np.empty(0, dtype=np.intp))
+            return self.df.take(positions)
+        else:
+            return self.df
+
+        if bounds is None:
+            return self.df.iloc[0:0]
+        return self.df.iloc[bounds[0]:bounds[1]]
+
+    # Function to look up the crest URL of a team, or None if the team is unknown.
+    def crest_url(self, team):
+        team_id = self.registry.lookup(team)
+        if team_id not in self.teams_table.index:
+            return None
+        return self.teams_table.at[team_id, 'cresturl']
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import threading
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+# Canonical team names, as used in the match rows and the crest table, with the other names the
+# scraped sources use for the same club: FBref standings and opponent columns use short names
+# ('Manchester Utd', "Nott'ham Forest"), ESPN fixture pages names such as 'AFC Bournemouth'.
+# A team's ID is its position in this list; append new teams at the end so IDs stay stable.
+TEAMS = [
+    ('Arsenal', []),
+    ('Aston Villa', []),
+    ('Bournemouth', ['AFC Bournemouth']),
+    ('Brentford', []),
+    ('Brighton and Hove Albion', ['Brighton', 'Brighton & Hove Albion']),
+    ('Burnley', []),
+    ('Cardiff City', ['Cardiff']),
+    ('Chelsea', []),
+    ('Crystal Palace', []),
+    ('Everton', []),
+    ('Fulham', []),
+    ('Huddersfield Town', ['Huddersfield']),
+    ('Leeds United', ['Leeds']),
+    ('Leicester City', ['Leicester']),
+    ('Liverpool', []),
+    ('Luton Town', ['Luton']),
+    ('Manchester City', ['Man City']),
+    ('Manchester United', ['Manchester Utd', 'Man United']),
+    ('Newcastle United', ['Newcastle Utd', 'Newcastle']),
+    ('Norwich City', ['Norwich']),
+    ('Nottingham Forest', ["Nott'ham Forest", "Nott'm Forest"]),
+    ('Sheffield United', ['Sheffield Utd']),
+    ('Southampton', []),
+    ('Stoke City', ['Stoke']),
+    ('Swansea City', ['Swansea']),
+    ('Tottenham Hotspur', ['Tottenham', 'Spurs']),
+    ('Watford', []),
+    ('West Bromwich Albion', ['West Brom']),
+    ('West Ham United', ['West Ham']),
+    ('Wolverhampton Wanderers', ['Wolves', 'Wolverhampton']),
+]
+
+
+# Function to normalize a team name for alias lookup: case, surrounding spaces and '&' vs 'and' are ignored.
+def _normalize(name):
+    return ' '.join(str(name).replace('&', ' and ').split()).casefold()
+
+
+# Function to get the integer ID of a season: its start year, e.g. '2022/23' -> 2022 (years pass through).
+def season_id(season):
+    return int(str(season)[:4])
+
+
+# Function to format a season ID as shown in the app, e.g. 2023 -> '2023/24'
+def season_label(season_id):
+    return f'{season_id}/{str(season_id + 1)[-2:]}'
+
+
+# Registry mapping every known name of a team to one integer team ID.
+# Names that are not registered get a new ID on first use, with a warning, so a renamed team
+# shows up as a new team instead of silently missing its standings or crest.
+# Such IDs only exist in the process that assigned them: datasets saved with them store the
+# registry's names alongside, and restore() assigns the same IDs in the process that loads them.
+class TeamRegistry:
+
+    def __init__(self, teams=TEAMS):
+        self._lock = threading.Lock()
+        self.names = []
+        self._aliases = []
+        self._ids = {}
+        self._registered = []
+        for name, aliases in teams:
+            self._add(name, aliases, registered=True)
+
+    def _add(self, name, aliases=(), registered=False):
+        team_id = len(self.names)
+        self.names.append(name)
+        self._aliases.append([name] + list(aliases))
+        for alias in self._aliases[team_id]:
+            self._ids[_normalize(alias)] = team_id
+        if registered:
+            self._registered.append((team_id, self._aliases[team_id]))
+        return team_id
+
+    # Function to register a team with its aliases and return its ID; known teams keep their ID.
+    def register(self, name, aliases=()):
+        with self._lock:
+            team_id = self.lookup(name)
+            if team_id is None:
+                team_id = self._add(name, aliases, registered=True)
+            return team_id
+
+    # Function to fingerprint the registered teams (with their IDs and aliases), for cache keys of data
+    # joined on team IDs. Names given IDs on first use are not part of it.
+    def digest(self):
+        with self._lock:
+            return hashlib.sha1(json.dumps(self._registered).encode()).hexdigest()[:16]
+
+    # Function to give the names of a saved dataset (its registry's names, indexed by team ID) the same
+    # IDs here, registering the ones this process does not know yet.
+    # Raises ValueError when an ID already belongs to another team in this process.
+    def restore(self, names):
+        with self._lock:
+            for team_id, name in enumerate(names):
+                if team_id < len(self.names):
+                    if _normalize(self.names[team_id]) != _normalize(name):
+                        raise ValueError(f'Team ID {team_id} is {self.names[team_id]!r} here but {name!r} in the saved dataset')
+                elif self.lookup(name) is not None:
+                    raise ValueError(f'Team {name!r} has ID {self.lookup(name)} here but {team_id} in the saved dataset')
+                else:
+                    self._add(str(name))
+
+    # Function to return the ID of a team name or alias, or None if it is not registered.
+    def lookup(self, name):
+        return self._ids.get(_normalize(name))
+
+    # Function to return the ID of a team name or alias, registering unknown names as new teams.
+    def team_id(self, name):
+        team_id = self.lookup(name)
+        if team_id is None:
+            with self._lock:
+                team_id = self.lookup(name)
+                if team_id is None:
+                    warnings.warn(f'Unknown team name {name!r}; add it to team_registry.TEAMS', stacklevel=2)
+                    team_id = self._add(str(name))
+        return team_id
+
+    # Function to map a column of team names to team IDs, looking up every distinct name once.
+    def team_ids(self, names):
+        codes, uniques = pd.factorize(pd.Series(names), use_na_sentinel=False)
+        ids = np.array([self.team_id(name) for name in uniques], dtype='int16')
+        return pd.Series(ids[codes], index=getattr(names, 'index', None), dtype='int16')
+
+    # Function to map a column of team IDs to the canonical team names.
+    def team_names(self, team_ids):
+        return pd.Series(np.asarray(self.names, dtype=object)[np.asarray(team_ids)], index=getattr(team_ids, 'index', None))
+
+
+# Registry shared by the data pipeline and the app.
+TEAM_REGISTRY = TeamRegistry()
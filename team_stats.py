@@ -0,0 +1,85 @@
+import pandas as pd
+
+
+# Function to turn a value read from the data into a plain JSON number, rounded to `digits` decimals
+# when given (None for missing values).
+def _number(value, digits=None):
+    if pd.isna(value):
+        return None
+    if digits is None:
+        return int(value)
+    return round(float(value), digits)
+
+
+# Function to format a league position for display, e.g. 1 -> '1st', 12 -> '12th', and '—' when the
+# position is missing (seasons without a standings table, such as 2017/18).
+def position_label(position):
+    if position is None:
+        return '—'
+    elif position == 1:
+        return '1st'
+    elif position == 2:
+        return '2nd'
+    elif position == 3:
+        return '3rd'
+    return f'{position}th'
+
+
+# Function to read the standing of a team-season from its slice: position, points and points per match.
+def standing_stats(team_df):
+    position = _number(team_df['Rk'].iloc[0])
+    return {
+        'position': position,
+        'position_label': position_label(position),
+        'points': _number(team_df['Pts'].iloc[0]),
+        'points_per_match': _number(team_df['Pts/MP'].iloc[0], 2),
+    }
+
+
+# Function to read the basic stats of a team from its summary row (see aggregates.TeamSeasonSummary):
+# goals scored and conceded, mean pass success and possession. For a team-season slice, its expected
+# goals for and against are added.
+def dashboard_stats(summary, team_df=None):
+    stats = {
+        'goals_scored': _number(summary['goals_scored']),
+        'goals_conceded': _number(summary['goals_conceded']),
+        'pass_success': _number(summary['cmp_mean'], 2),
+        'possession': _number(summary['poss_mean'], 2),
+    }
+    if team_df is not None:
+        stats['xg'] = _number(team_df['xG'].iloc[0], 1)
+        stats['xga'] = _number(team_df['xGA'].iloc[0], 1)
+    return stats
+
+
+# Function to list the matches of a team-season in date order with the points accumulated after each.
+def points_stats(team_df):
+    return [
+        {'round': str(round_label), 'date': date.date().isoformat(), 'result': str(result), 'cum_points': int(points)}
+        for round_label, date, result, points in zip(team_df['round'], team_df['date'], team_df['result'], team_df['cum_points'])
+    ]
+
+
+# Function to collect the stats the dashboard shows for a team in a season of a Dataset, or across all
+# seasons when season is 'All seasons' (which has no standing, form or points). Returns None when the
+# team did not play in the season.
+def team_stats(dataset, team, season):
+    team_df = dataset.team_index.slice(team, season)
+    if team_df.empty:
+        return None
+    team_id = int(team_df['team_id'].iloc[0])
+    team = str(team_df['team'].iloc[0])
+    if season == 'All seasons':
+        return {
+            'team': team,
+            'season': season,
+            'dashboard': dashboard_stats(dataset.team_summary.team_all_seasons(team_id)),
+        }
+    return {
+        'team': team,
+        'season': season,
+        'standing': standing_stats(team_df),
+        'dashboard': dashboard_stats(dataset.team_summary.team_season(team_id, team_df['season_id'].iloc[0]), team_df),
+        'form': str(team_df['form'].iloc[-1]),
+        'points': points_stats(team_df),
+    }
@@ -0,0 +1,18 @@
+import os
+import sys
+import warnings
+
+import pytest
+
+# The modules live at the repository root, like for the benchmarks.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# The Dataset of the CSVs in the repository, loaded once per test session.
+@pytest.fixture(scope='session')
+def dataset():
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        import data_loader
+        from shared_dataset import Dataset
+        return Dataset.load(data_loader.source_fingerprint())
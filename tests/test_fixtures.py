@@ -0,0 +1,84 @@
+import datetime
+
+import pytest
+import requests
+
+import fixtures
+from fixtures import MAX_RANGE_DAYS, FixtureFetcher, date_keys
+
+
+class CountingTransport:
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, headers=None):
+        self.requests.append(url)
+        return 200, {}, f'<html>{url}</html>'
+
+
+class FailingTransport(CountingTransport):
+
+    def __init__(self, failing_date):
+        super().__init__()
+        self.failing_date = failing_date
+
+    def get(self, url, headers=None):
+        if url.endswith(self.failing_date):
+            self.requests.append(url)
+            raise requests.Timeout(f'{url} timed out')
+        return super().get(url, headers)
+
+
+def test_date_keys_clamps_long_ranges():
+    start = datetime.date(2026, 1, 1)
+    assert date_keys(start, start + datetime.timedelta(days=2)) == ['20260101', '20260102', '20260103']
+    keys = date_keys(start, start + datetime.timedelta(days=365))
+    assert len(keys) == MAX_RANGE_DAYS
+    assert keys[0] == '20260101'
+
+
+def test_fetch_rejects_too_many_dates():
+    fetcher = FixtureFetcher(CountingTransport())
+    with pytest.raises(ValueError):
+        fetcher.fetch([f'2026{day:04d}' for day in range(MAX_RANGE_DAYS + 1)])
+
+
+def test_cache_is_bounded_and_least_recently_used_first():
+    transport = CountingTransport()
+    fetcher = FixtureFetcher(transport, max_entries=2)
+    fetcher.fetch(['20260101'])
+    fetcher.fetch(['20260102'])
+    fetcher.fetch(['20260101'])
+    fetcher.fetch(['20260103'])
+    assert len(fetcher) == 2
+    assert len(transport.requests) == 3
+    # 20260102 was the least recently used page, so it is fetched again.
+    fetcher.fetch(['20260101', '20260102'])
+    assert len(transport.requests) == 4
+
+
+def test_expired_pages_are_dropped(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(fixtures.time, 'monotonic', lambda: now[0])
+    transport = CountingTransport()
+    fetcher = FixtureFetcher(transport, ttl=60)
+    fetcher.fetch(['20260101', '20260102'])
+    now[0] += 61
+    fetcher.fetch(['20260101'])
+    assert len(transport.requests) == 3
+    assert fetcher.fetch(['20260102'])['20260102'][0] == 200
+    assert len(transport.requests) == 4
+    assert len(fetcher) == 2
+
+
+def test_failed_request_only_fails_its_date():
+    transport = FailingTransport('20260102')
+    fetcher = FixtureFetcher(transport)
+    pages = fetcher.fetch(['20260101', '20260102', '20260103'])
+    assert [status for status, _ in pages.values()] == [200, None, 200]
+    assert pages['20260102'] == (None, '')
+    # The failed date is not cached, so it is requested again.
+    assert len(fetcher) == 2
+    fetcher.fetch(['20260101', '20260102', '20260103'])
+    assert len(transport.requests) == 4
@@ -0,0 +1,41 @@
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Runs the dashboard's Match Finder offline: no fixture pages (every day answers 404) and a one-city gazetteer.
+@pytest.fixture
+def find_matches(tmp_path, monkeypatch):
+    gazetteer = tmp_path / 'gazetteer.csv'
+    gazetteer.write_text('location,latitude,longitude\n"London, England",51.5072,-0.1276\n', encoding='utf-8')
+    monkeypatch.setenv('EPL_FIXTURES_DIR', str(tmp_path))
+    monkeypatch.setenv('EPL_GEOCODER_GAZETTEER', str(gazetteer))
+    monkeypatch.setenv('EPL_GEOCODER_DB', str(tmp_path / 'geocode.sqlite'))
+
+    def run(city_name):
+        at = AppTest.from_file(os.path.join(ROOT, 'streamlit_demo.py'), default_timeout=120)
+        at.run()
+        at.sidebar.text_input[0].set_value(city_name)
+        at.sidebar.button[0].click()
+        at.run()
+        return at
+    return run
+
+
+def test_unknown_city_is_reported(find_matches):
+    at = find_matches('Atlantis, Nowhere')
+    assert not at.exception
+    assert [error.value for error in at.sidebar.error] == [
+        'Could not find the location of "Atlantis, Nowhere". Enter the city and country, e.g. "London, England".'
+    ]
+    assert not at.dataframe
+
+
+def test_known_city_is_ranked(find_matches):
+    at = find_matches('london,  england')
+    assert not at.exception
+    assert not at.sidebar.error
+    assert len(at.dataframe) == 1
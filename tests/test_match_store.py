@@ -0,0 +1,87 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from match_store import COMPACT_AFTER_PARTS, MatchStore
+
+
+def match_rows(season, dates, gf=1, team='Arsenal'):
+    return pd.DataFrame({
+        'date': [f'{season}-08-{day:02d}' for day in dates],
+        'team': team,
+        'season': season,
+        'gf': gf,
+        'xg': 1.5,
+        'referee': 'Ref',
+    })
+
+
+def part_files(store, season):
+    return sorted(name for name in os.listdir(os.path.join(store.directory, f'season={season}')) if name.endswith('.parquet'))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return MatchStore(str(tmp_path / 'store'))
+
+
+def test_upsert_writes_only_new_and_changed_rows(store):
+    assert store.upsert(match_rows(2023, [1, 2])) == 2
+    rows = match_rows(2023, [1, 2, 3])
+    rows.loc[1, 'gf'] = 4
+    assert store.upsert(rows) == 2
+    read = store.read(seasons=[2023])
+    assert read['date'].tolist() == ['2023-08-01', '2023-08-02', '2023-08-03']
+    assert read['gf'].tolist() == [1, 4, 1]
+
+
+def test_upsert_of_the_same_rows_with_other_dtypes_writes_nothing(store):
+    rows = match_rows(2023, [1, 2, 3])
+    rows.loc[2, 'referee'] = None
+    store.upsert(rows)
+    version = store.version
+
+    # The same rows as read from a CSV in which the columns came out as float or with NaN.
+    again = rows.astype({'gf': 'float64'})
+    again['referee'] = again['referee'].fillna(np.nan)
+    assert store.upsert(again) == 0
+    # A store opened later hashes the rows read back from Parquet.
+    assert MatchStore(store.directory).upsert(again) == 0
+    assert store.version == version
+
+
+def test_parts_are_compacted(store):
+    store.upsert(match_rows(2023, [1]))
+    for day in range(2, COMPACT_AFTER_PARTS + 3):
+        store.upsert(match_rows(2023, [day]))
+    assert len(part_files(store, 2023)) <= 2
+    assert len(store.read(seasons=[2023])) == COMPACT_AFTER_PARTS + 2
+
+
+def test_frozen_seasons_are_compacted_and_not_changed(store):
+    store.upsert(match_rows(2022, [1]))
+    store.upsert(match_rows(2022, [2]))
+    store.freeze(2022)
+    assert store.is_frozen(2022)
+    assert part_files(store, 2022) == ['part-00002.parquet']
+    assert store.upsert(match_rows(2022, [1, 3], gf=5)) == 0
+    assert store.read(seasons=[2022])['gf'].tolist() == [1, 1]
+
+
+def test_manifest_version_counts_changes_and_is_persisted(store):
+    assert store.version == 0
+    store.upsert(match_rows(2023, [1]))
+    store.replace_season(2021, match_rows(2021, [1, 2]), frozen=True)
+    store.set_source_digest('full_data.csv', 'abc')
+    assert store.version == 3
+
+    reopened = MatchStore(store.directory)
+    assert reopened.version == 3
+    assert reopened.seasons() == [2021, 2023]
+    assert reopened.is_frozen(2021) and not reopened.is_frozen(2023)
+    assert reopened.source_digest('full_data.csv') == 'abc'
+    with open(os.path.join(store.directory, 'manifest.json'), encoding='utf-8') as f:
+        assert json.load(f)['partitions']['2021']['parts'] == ['part-00000.parquet']
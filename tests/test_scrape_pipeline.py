@@ -0,0 +1,86 @@
+import os
+
+import pandas as pd
+import pytest
+
+from web_scrape_scripts import HttpClient, SnapshotTransport, run
+from web_scrape_scripts.pipeline import END_TABLES_CSV, FRESH_TABLE_CSV, IMG_URLS_CSV, MATCHES_CSV
+
+SNAPSHOTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots', 'fbref')
+
+
+# Snapshot transport that records the URLs it serves.
+class RecordingTransport(SnapshotTransport):
+
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.urls = []
+
+    def get(self, url, headers):
+        self.urls.append(url)
+        return super().get(url, headers)
+
+
+@pytest.fixture
+def scrape(tmp_path):
+    out_dir = tmp_path / 'out'
+    out_dir.mkdir()
+
+    def scrape():
+        transport = RecordingTransport(SNAPSHOTS)
+        client = HttpClient(transport, cache_dir=str(tmp_path / 'pages'), min_interval=0)
+        summary = run(out_dir=str(out_dir), client=client, previous_seasons=1)
+        return summary, transport.urls
+    scrape.out_dir = out_dir
+    return scrape
+
+
+def passing_urls(urls):
+    return [url for url in urls if '/passing/' in url]
+
+
+def test_run_derives_the_four_datasets(scrape):
+    summary, urls = scrape()
+    assert summary['season'] == '2023/24'
+    assert summary['new_matches'] == 6
+    assert len(passing_urls(urls)) == 2
+
+    matches = pd.read_csv(scrape.out_dir / MATCHES_CSV, index_col=0)
+    assert matches.groupby('team').size().to_dict() == {'Arsenal': 3, 'Luton Town': 3}
+    # Only played Premier League matches are kept, with the pass completion of their date.
+    assert set(matches['comp']) == {'Premier League'}
+    assert matches.loc[matches['opponent'] == 'Fulham', 'cmp%'].tolist() == [86.6]
+    assert set(matches['season']) == {2023}
+
+    fresh_table = pd.read_csv(scrape.out_dir / FRESH_TABLE_CSV)
+    assert fresh_table[['Squad', 'Pts', 'Season']].values.tolist() == [['Arsenal', 7, '2023/24'], ['Luton Town', 0, '2023/24']]
+    end_tables = pd.read_csv(scrape.out_dir / END_TABLES_CSV)
+    assert end_tables[['Squad', 'Season']].values.tolist() == [['Manchester City', '2022/23'], ['Arsenal', '2022/23']]
+    crests = pd.read_csv(scrape.out_dir / IMG_URLS_CSV, index_col=0)
+    assert crests['team'].tolist() == ['Arsenal', 'Luton Town']
+    assert crests['cresturl'].str.endswith('.png').all()
+
+
+def test_second_run_fetches_no_match_pages(scrape):
+    scrape()
+    before = (scrape.out_dir / MATCHES_CSV).read_text(encoding='utf-8')
+    summary, urls = scrape()
+    assert summary['new_matches'] == 0
+    assert passing_urls(urls) == []
+    # The finished season's standings are cached for good; only the current pages are fetched again.
+    assert not any('2022-2023' in url for url in urls)
+    assert (scrape.out_dir / MATCHES_CSV).read_text(encoding='utf-8') == before
+
+
+def test_only_teams_with_newer_matches_are_fetched(scrape):
+    scrape()
+    matches_path = scrape.out_dir / MATCHES_CSV
+    stored = pd.read_csv(matches_path, index_col=0)
+    stored[stored['date'] != '2023-09-01'].reset_index(drop=True).to_csv(matches_path)
+
+    summary, urls = scrape()
+    assert summary['new_matches'] == 1
+    assert [url.rsplit('/', 1)[-1] for url in passing_urls(urls)] == ['Luton-Town-Match-Logs-All-Competitions']
+    matches = pd.read_csv(matches_path, index_col=0)
+    assert len(matches) == 6
+    assert not matches.duplicated(subset=['team', 'date']).any()
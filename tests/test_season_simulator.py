@@ -0,0 +1,91 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pytest
+
+import season_simulator
+from season_simulator import CHUNK_RUNS, ProjectionCache, simulate_season
+
+RUNS = 2 * CHUNK_RUNS
+
+
+def simulate(dataset, season_id, **kwargs):
+    return simulate_season(dataset.epl_teams_df, dataset.epl_teams_standings, season_id, **kwargs)
+
+
+def test_seeded_projection_is_reproducible_with_and_without_a_pool(dataset):
+    projection = simulate(dataset, 2023, runs=RUNS, seed=7)
+    assert len(projection) == 20
+    assert projection['title'].sum() == pytest.approx(1)
+    assert projection['relegation'].sum() == pytest.approx(3)
+    assert projection['expected_position'].is_monotonic_increasing
+
+    pd.testing.assert_frame_equal(simulate(dataset, 2023, runs=RUNS, seed=7), projection)
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context('spawn')) as pool:
+        pd.testing.assert_frame_equal(simulate(dataset, 2023, runs=RUNS, seed=7, pool=pool), projection)
+    assert not simulate(dataset, 2023, runs=RUNS, seed=8).equals(projection)
+
+
+def test_nothing_left_to_play(dataset):
+    # Every fixture of a finished season is played; 2017/18 has no standings to start from.
+    assert simulate(dataset, 2022, runs=RUNS, seed=7) is None
+    assert simulate(dataset, 2017, runs=RUNS, seed=7) is None
+
+
+class StubDataset:
+    epl_teams_df = None
+    epl_teams_standings = None
+
+    def version(self, season_label):
+        return 'v1'
+
+
+def wait_until_done(cache, dataset):
+    deadline = time.monotonic() + 10
+    while cache.pending(dataset, 2023, '2023/24'):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_failed_simulation_is_retried(monkeypatch):
+    calls = []
+    projection = pd.DataFrame({'team_id': [0], 'title': [1.0]})
+
+    def simulate_season(*args):
+        calls.append(args)
+        if len(calls) == 1:
+            raise RuntimeError('simulation failed')
+        return projection
+    monkeypatch.setattr(season_simulator, 'simulate_season', simulate_season)
+
+    cache, dataset = ProjectionCache(), StubDataset()
+    assert cache.get(dataset, 2023, '2023/24') is None
+    wait_until_done(cache, dataset)
+    # The failure is not cached: the next get() simulates again.
+    assert cache.get(dataset, 2023, '2023/24') is None
+    wait_until_done(cache, dataset)
+    assert cache.get(dataset, 2023, '2023/24') is projection
+    assert len(calls) == 2
+
+
+def test_one_worker_pool_for_concurrent_simulations(monkeypatch):
+    pools = []
+
+    class SlowPool:
+        def __init__(self, **kwargs):
+            time.sleep(0.05)
+            pools.append(self)
+    monkeypatch.setattr(season_simulator, 'ProcessPoolExecutor', SlowPool)
+
+    cache = ProjectionCache(workers=2)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache._worker_pool())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(pools) == 1
+    assert all(pool is pools[0] for pool in results)
@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from split_index import MATCH_COLUMNS, SPLITS, scan_split
+from team_registry import TEAM_REGISTRY
+
+
+# Head-to-head record of two teams read with a plain boolean mask over the match rows.
+def masked_head_to_head(df, team, opponent):
+    rows = df[(df['team_id'] == TEAM_REGISTRY.lookup(team)) & (df['opponent_id'] == TEAM_REGISTRY.lookup(opponent))]
+    return rows.sort_values('date', ascending=False, kind='mergesort')[MATCH_COLUMNS].reset_index(drop=True)
+
+
+@pytest.mark.parametrize('team, opponent', [
+    ('Arsenal', 'Tottenham Hotspur'),
+    ('Liverpool', 'Manchester City'),
+    ('Luton Town', 'Arsenal'),
+    ('Burnley', 'Sheffield United'),
+])
+def test_head_to_head_matches_a_boolean_mask(dataset, team, opponent):
+    record, matches = dataset.split_index.head_to_head(team, opponent)
+    expected = masked_head_to_head(dataset.epl_teams_df, team, opponent)
+    assert len(expected) > 0
+    pd.testing.assert_frame_equal(matches, expected)
+
+    results = expected['result'].astype(str)
+    assert record['MP'] == len(expected)
+    assert (record['W'], record['D'], record['L']) == ((results == 'W').sum(), (results == 'D').sum(), (results == 'L').sum())
+    assert (record['GF'], record['GA']) == (expected['gf'].sum(), expected['ga'].sum())
+    assert record['Pts'] == 3 * record['W'] + record['D']
+
+
+def test_teams_that_never_met(dataset):
+    record, matches = dataset.split_index.head_to_head('Luton Town', 'Huddersfield Town')
+    assert record is None
+    assert matches.empty
+
+
+@pytest.mark.parametrize('column', list(SPLITS))
+def test_split_matches_a_scan(dataset, column):
+    team_id = TEAM_REGISTRY.lookup('Arsenal')
+    split = dataset.split_index.split('Arsenal', column)
+    expected = scan_split(dataset.epl_teams_df, team_id, column)
+    assert split['MP'].tolist() == expected['MP'].tolist()
+    assert split['Pts'].sum() == expected['Pts'].sum()
+    assert len(split) == len(expected)
@@ -0,0 +1,41 @@
+import pytest
+
+from standings_engine import TABLE_COLUMNS, StandingsEngine
+
+DTYPES = {column: 'int64' for column in TABLE_COLUMNS if column != 'Team'} | {'Team': str}
+
+
+# Final tables of end_tables.csv, with the team names of the registry.
+def end_table(dataset, season):
+    standings = dataset.epl_teams_standings
+    table = standings[standings['season'] == season].rename(columns={'Rk': 'Position', 'team': 'Team'})
+    return table[TABLE_COLUMNS].astype(DTYPES).sort_values('Position').reset_index(drop=True)
+
+
+@pytest.mark.parametrize('season', ['2018/19', '2019/20', '2020/21', '2021/22', '2022/23'])
+def test_final_matchweek_matches_end_tables(dataset, season):
+    season_id = int(season[:4])
+    engine = dataset.standings_engine
+    assert engine.matchweeks(season_id) == 38
+    table = engine.table(season_id, 38).astype(DTYPES)
+    assert table.to_dict('records') == end_table(dataset, season).to_dict('records')
+
+
+def test_matchweeks_are_clamped(dataset):
+    engine = dataset.standings_engine
+    assert engine.table(2022, 0).equals(engine.table(2022, 1))
+    assert engine.table(2022, 99).equals(engine.table(2022, 38))
+    assert engine.table(2022, 1)['MP'].tolist() == [1] * 20
+    assert engine.table(1990, 5).empty
+
+
+def test_with_seasons_only_recomputes_the_given_seasons(dataset):
+    rows = dataset.epl_teams_df
+    engine = StandingsEngine(rows)
+    current = rows[rows['season_id'] == 2023]
+    first_half = current[current['matchweek'] <= 10]
+    updated = engine.with_seasons(first_half, [2023])
+    assert updated.matchweeks(2023) == 10
+    assert updated.table(2023, 10).equals(engine.table(2023, 10))
+    assert updated.table(2022, 38).equals(engine.table(2022, 38))
+    assert engine.matchweeks(2023) > 10
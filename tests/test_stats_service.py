@@ -0,0 +1,65 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from stats_service import StatsService, make_server
+
+
+class StaticDataset:
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+
+    def get(self):
+        return self.dataset
+
+
+@pytest.fixture
+def service(dataset):
+    return StatsService(StaticDataset(dataset))
+
+
+def test_stats_then_not_modified(service):
+    status, etag, body = service.respond('/stats', 'team=Arsenal&season=2022/23')
+    assert status == 200 and etag
+    stats = json.loads(body)
+    assert stats['team'] == 'Arsenal'
+    assert stats['standing']['position'] == 2
+
+    assert service.respond('/stats', 'team=Arsenal&season=2022/23', etag) == (304, etag, b'')
+    assert service.respond('/stats', 'team=Arsenal&season=2022/23', f'"other", W/{etag}')[0] == 304
+    # Another selection has another ETag.
+    assert service.respond('/stats', 'team=Arsenal&season=2021/22', etag)[0] == 200
+
+
+def test_unknown_team_season_and_path(service):
+    assert service.respond('/stats', 'team=Atlantis FC&season=2022/23')[0] == 404
+    assert service.respond('/stats', 'team=Arsenal&season=1999/00')[0] == 404
+    assert service.respond('/stats', 'season=2022/23')[0] == 400
+    assert service.respond('/players')[0] == 404
+
+
+def test_http_revalidation(service):
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = http.client.HTTPConnection(*server.server_address[:2], timeout=10)
+        connection.request('GET', '/stats?team=Arsenal&season=All+seasons')
+        response = connection.getresponse()
+        body = response.read()
+        assert response.status == 200
+        assert json.loads(body)['season'] == 'All seasons'
+        etag = response.getheader('ETag')
+
+        # Same keep-alive connection, conditional request.
+        connection.request('GET', '/stats?team=Arsenal&season=All+seasons', headers={'If-None-Match': etag})
+        response = connection.getresponse()
+        assert response.status == 304
+        assert response.read() == b''
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
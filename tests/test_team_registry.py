@@ -0,0 +1,82 @@
+import glob
+import os
+import subprocess
+import sys
+import warnings
+
+import numpy as np
+import pytest
+
+from team_registry import TEAMS, TeamRegistry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_restore_gives_saved_names_their_ids():
+    saved = TeamRegistry()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        new_id = saved.team_id('Ipswich Town')
+    assert new_id == len(TEAMS)
+
+    registry = TeamRegistry()
+    registry.restore(saved.names)
+    assert registry.lookup('Ipswich Town') == new_id
+    assert registry.team_names(np.array([new_id])).tolist() == ['Ipswich Town']
+    # Restoring again changes nothing.
+    registry.restore(saved.names)
+    assert len(registry.names) == len(saved.names)
+
+
+def test_restore_rejects_clashing_ids():
+    saved = TeamRegistry()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        saved.team_id('Ipswich Town')
+        registry = TeamRegistry()
+        registry.team_id('Leicester Fosse')
+    with pytest.raises(ValueError):
+        registry.restore(saved.names)
+
+
+def test_digest_covers_registered_teams_only():
+    registry = TeamRegistry()
+    digest = registry.digest()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        registry.team_id('Ipswich Town')
+    assert registry.digest() == digest
+    registry.register('Sunderland', ['Sunderland AFC'])
+    assert registry.digest() != digest
+    assert TeamRegistry(TEAMS[:-1]).digest() != TeamRegistry().digest()
+
+
+LOAD_SCRIPT = '''
+import warnings
+warnings.simplefilter('ignore')
+import data_loader
+from shared_dataset import Dataset
+dataset = Dataset.load(data_loader.source_fingerprint())
+team_df = dataset.team_index.slice('Ipswich Town', '2023/24')
+print(len(team_df), dataset.team_index.crest_url('Ipswich Town') is not None, len(dataset.split_index.split('Ipswich Town', 'venue')))
+'''
+
+
+# A team missing from TEAMS gets its ID while the artifact is built; a second process loading
+# that artifact must give it the same ID.
+def test_unknown_team_survives_the_artifact(tmp_path):
+    for path in glob.glob(os.path.join(ROOT, '*.csv')):
+        with open(path, encoding='utf-8', newline='') as f:
+            text = f.read()
+        with open(tmp_path / os.path.basename(path), 'w', encoding='utf-8', newline='') as f:
+            f.write(text.replace('Luton Town', 'Ipswich Town').replace('Luton', 'Ipswich'))
+
+    env = dict(os.environ, EPL_DATA_DIR=str(tmp_path))
+    outputs = [
+        subprocess.run([sys.executable, '-c', LOAD_SCRIPT], cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout.split()
+        for _ in range(2)
+    ]
+    assert glob.glob(str(tmp_path / '.epl_cache' / 'epl_teams_registry_*.json'))
+    assert outputs[0] == outputs[1]
+    matches, has_crest, venues = outputs[1]
+    assert int(matches) > 0 and has_crest == 'True' and int(venues) > 0
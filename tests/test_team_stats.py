@@ -0,0 +1,18 @@
+from team_stats import position_label, team_stats
+
+
+def test_position_label():
+    assert [position_label(p) for p in (1, 2, 3, 4, 11, 20)] == ['1st', '2nd', '3rd', '4th', '11th', '20th']
+    assert position_label(None) == '—'
+
+
+def test_team_season_with_rank(dataset):
+    standing = team_stats(dataset, 'Arsenal', '2022/23')['standing']
+    assert standing == {'position': 2, 'position_label': '2nd', 'points': 84, 'points_per_match': 2.21}
+
+
+# The 2017/18 team pages have no standings table, so the season has no rank or points.
+def test_team_season_without_rank(dataset):
+    stats = team_stats(dataset, 'Arsenal', '2017/18')
+    assert stats['standing'] == {'position': None, 'position_label': '—', 'points': None, 'points_per_match': None}
+    assert stats['points']
@@ -0,0 +1,5 @@
+# Scrapers for the FBref data behind the dashboard.
+# The notebooks in this folder are the original one-off scripts; pipeline.run replaces all four of them
+# and can be started with: python -m web_scrape_scripts
+from .http_client import FetchError, HttpClient, RequestsTransport, SnapshotTransport, snapshot_name
+from .pipeline import run
@@ -0,0 +1,26 @@
+import argparse
+
+from .http_client import DEFAULT_CACHE_DIR, DEFAULT_MAX_WORKERS, DEFAULT_MIN_INTERVAL, HttpClient, SnapshotTransport
+from .pipeline import DEFAULT_OUT_DIR, DEFAULT_PREVIOUS_SEASONS, run
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the dashboard CSVs from FBref.")
+    parser.add_argument('--out-dir', default=DEFAULT_OUT_DIR, help="directory the CSV files are written to")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help="on-disk page cache")
+    parser.add_argument('--snapshots', help="serve saved HTML snapshots from this directory instead of FBref")
+    parser.add_argument('--previous-seasons', type=int, default=DEFAULT_PREVIOUS_SEASONS)
+    parser.add_argument('--min-interval', type=float, default=DEFAULT_MIN_INTERVAL, help="seconds between request starts")
+    parser.add_argument('--max-workers', type=int, default=DEFAULT_MAX_WORKERS)
+    args = parser.parse_args()
+
+    transport = SnapshotTransport(args.snapshots) if args.snapshots else None
+    client = HttpClient(transport, cache_dir=args.cache_dir, min_interval=0 if args.snapshots else args.min_interval,
+                        max_workers=args.max_workers)
+    summary = run(out_dir=args.out_dir, client=client, previous_seasons=args.previous_seasons)
+    print(f"{summary['season']}: {summary['new_matches']} new matches, "
+          f"{summary['requests']} requests ({summary['not_modified']} not modified)")
+
+
+if __name__ == '__main__':
+    main()
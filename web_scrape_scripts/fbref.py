@@ -0,0 +1,73 @@
+import re
+from io import StringIO
+
+import pandas as pd
+
+
+FBREF_ROOT = "https://fbref.com"
+CURRENT_STANDINGS_URL = "https://fbref.com/en/comps/9/Premier-League-Stats"
+
+
+# Function to build the standings URL of a past season, e.g. 2022 -> .../2022-2023/2022-2023-Premier-League-Stats
+def season_standings_url(year):
+    return f"{FBREF_ROOT}/en/comps/9/{year}-{year + 1}/{year}-{year + 1}-Premier-League-Stats"
+
+
+# Function to find the season a standings page belongs to, as its start year.
+def page_season_year(html):
+    match = re.search(r'(\d{4})-(\d{4}) Premier League', html)
+    if match is None:
+        raise ValueError('Could not find the season of the standings page')
+    return int(match.group(1))
+
+
+def _soup(html):
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(html, 'lxml')
+
+
+# Function to read the 'Regular season' league table of a standings page and tag it with its season.
+def parse_standings(html, season):
+    standings = pd.read_html(StringIO(html), match="Regular season")[0]
+    standings['Season'] = season
+    return standings
+
+
+# Function to list the squad page URLs linked from the league table of a standings page.
+def squad_urls(html):
+    standings_table = _soup(html).select('table.stats_table')[0]
+    links = [l.get("href") for l in standings_table.find_all('a')]
+    links = [l for l in links if l and '/squads/' in l]
+    return [f"{FBREF_ROOT}{l}" for l in dict.fromkeys(links)]
+
+
+# Function to derive the team name from a squad URL, e.g. '.../Manchester-City-Stats' -> 'Manchester City'
+def team_name(team_url):
+    return team_url.split("/")[-1].replace("-Stats", "").replace("-", " ")
+
+
+# Function to extract what the pipeline needs from a squad page in one parse:
+# the played Premier League matches, the crest URL and the URL of the passing stats page.
+def parse_squad_page(html):
+    matches = pd.read_html(StringIO(html), match="Scores & Fixtures")[0]
+    matches = matches[(matches["Comp"] == "Premier League") & matches["Result"].notna()]
+
+    soup = _soup(html)
+    logo = soup.find('img', class_='teamlogo')
+    links = [l.get("href") for l in soup.find_all('a')]
+    links = [l for l in links if l and 'all_comps/passing/' in l]
+
+    return {
+        'matches': matches,
+        'crest_url': logo['src'] if logo is not None else None,
+        'passing_url': f"{FBREF_ROOT}{links[0]}" if links else None,
+    }
+
+
+# Function to read the per-match pass completion (Date, Cmp%) from a passing stats page.
+def parse_passing(html):
+    passing = pd.read_html(StringIO(html), match="Passing")[0]
+    passing.columns = passing.columns.droplevel()
+    passing = passing.iloc[:, :-18]
+    return passing[["Date", "Cmp%"]]
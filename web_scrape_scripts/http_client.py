@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from io_utils import RequestsTransport, write_text_atomic
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".epl_cache", "pages")
+
+# FBref allows about 20 requests per minute; keep request starts at least this many seconds apart.
+DEFAULT_MIN_INTERVAL = 3.0
+# At most this many requests are in flight at once.
+DEFAULT_MAX_WORKERS = 2
+
+
+class FetchError(Exception):
+
+    def __init__(self, url, status_code):
+        super().__init__(f'GET {url} failed with status code {status_code}')
+        self.url = url
+        self.status_code = status_code
+
+
+# Function to turn a URL into a file name (without extension) for the page cache and for snapshots.
+# 'https://fbref.com/en/comps/9/Premier-League-Stats' -> 'en_comps_9_Premier_League_Stats'
+def snapshot_name(url):
+    path = re.sub(r'^https?://[^/]+', '', url)
+    name = re.sub(r'[^A-Za-z0-9]+', '_', path).strip('_') or 'index'
+    if len(name) > 150:
+        name = name[:120] + '_' + hashlib.sha1(url.encode()).hexdigest()[:12]
+    return name
+
+
+# Transport serving saved HTML snapshots ('<snapshot_name(url)>.html') from a directory, with no network.
+# Unknown URLs answer with status 404.
+class SnapshotTransport:
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def get(self, url, headers):
+        path = os.path.join(self.directory, snapshot_name(url) + '.html')
+        if not os.path.exists(path):
+            return 404, {}, ''
+        with open(path, encoding='utf-8') as f:
+            return 200, {}, f.read()
+
+
+# On-disk cache of fetched pages: '<name>.html' holds the body, '<name>.json' the validators
+# (ETag / Last-Modified) and the fetch time. A cache directory doubles as a snapshot directory.
+class PageCache:
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url):
+        name = snapshot_name(url)
+        return os.path.join(self.directory, name + '.html'), os.path.join(self.directory, name + '.json')
+
+    # Function to return (metadata, text) for a cached URL, or None.
+    def load(self, url):
+        html_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(html_path, encoding='utf-8') as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None
+
+    def store(self, url, text, meta):
+        html_path, meta_path = self._paths(url)
+        if text is not None:
+            write_text_atomic(html_path, text)
+        write_text_atomic(meta_path, json.dumps(dict(meta, url=url)))
+
+
+# Shared HTTP layer for the scrapers.
+# Pages are kept in an on-disk cache and revalidated with conditional requests
+# (If-None-Match / If-Modified-Since); a 304 answer reuses the cached body.
+# Requests are polite: request starts are spaced by min_interval and at most max_workers run at once.
+class HttpClient:
+
+    def __init__(self, transport=None, cache_dir=DEFAULT_CACHE_DIR, min_interval=DEFAULT_MIN_INTERVAL, max_workers=DEFAULT_MAX_WORKERS):
+        self.transport = transport if transport is not None else RequestsTransport(pool_size=max_workers)
+        self.cache = PageCache(cache_dir)
+        self.min_interval = min_interval
+        self.max_workers = max_workers
+        self._rate_lock = threading.Lock()
+        self._next_request = 0.0
+        self.requests_made = 0
+        self.not_modified = 0
+
+    # Function to block until this thread may start the next request.
+    def _wait_turn(self):
+        with self._rate_lock:
+            now = time.monotonic()
+            start = max(now, self._next_request)
+            self._next_request = start + self.min_interval
+            self.requests_made += 1
+        if start > now:
+            time.sleep(start - now)
+
+    # Function to fetch a page.
+    # max_age: seconds a cached copy is used without asking the server (None = forever, 0 = always revalidate).
+    def get(self, url, max_age=0):
+        cached = self.cache.load(url)
+        if cached is not None:
+            meta, text = cached
+            if max_age is None or time.time() - meta.get('fetched_at', 0) < max_age:
+                return text
+
+        headers = {}
+        if cached is not None:
+            if cached[0].get('etag'):
+                headers['If-None-Match'] = cached[0]['etag']
+            if cached[0].get('last_modified'):
+                headers['If-Modified-Since'] = cached[0]['last_modified']
+
+        self._wait_turn()
+        status_code, response_headers, text = self.transport.get(url, headers)
+
+        if status_code == 304 and cached is not None:
+            self.not_modified += 1
+            self.cache.store(url, None, dict(cached[0], fetched_at=time.time()))
+            return cached[1]
+        if status_code != 200:
+            raise FetchError(url, status_code)
+
+        self.cache.store(url, text, {
+            'etag': response_headers.get('etag'),
+            'last_modified': response_headers.get('last-modified'),
+            'fetched_at': time.time(),
+        })
+        return text
+
+    # Function to fetch several pages concurrently (bounded by max_workers), in the given order.
+    def get_many(self, urls, max_age=0):
+        urls = list(urls)
+        if len(urls) <= 1 or self.max_workers <= 1:
+            return [self.get(url, max_age) for url in urls]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(lambda url: self.get(url, max_age), urls))
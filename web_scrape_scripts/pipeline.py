@@ -0,0 +1,121 @@
+import os
+
+import pandas as pd
+
+from io_utils import write_atomic
+from team_registry import season_label
+
+from .fbref import (
+    CURRENT_STANDINGS_URL,
+    page_season_year,
+    parse_passing,
+    parse_squad_page,
+    parse_standings,
+    season_standings_url,
+    squad_urls,
+    team_name,
+)
+from .http_client import HttpClient
+
+
+DEFAULT_OUT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Output files, as read by the dashboard.
+MATCHES_CSV = "2023_matches.csv"
+END_TABLES_CSV = "end_tables.csv"
+FRESH_TABLE_CSV = "fresh_table.csv"
+IMG_URLS_CSV = "imgurls.csv"
+
+# Number of finished seasons kept in end_tables.csv.
+DEFAULT_PREVIOUS_SEASONS = 5
+
+
+def _write_csv(df, path, index):
+    write_atomic(path, lambda tmp_path: df.to_csv(tmp_path, index=index))
+
+
+# Function to read the matches already stored locally, or None if there are none.
+def _read_stored_matches(path):
+    if not os.path.exists(path):
+        return None
+    return pd.read_csv(path, index_col=0)
+
+
+# Function to find, per team, the date of the latest stored match of a season.
+def _latest_match_dates(stored, season_year):
+    if stored is None or stored.empty:
+        return {}
+    season_rows = stored[stored['season'] == season_year]
+    return season_rows.groupby('team')['date'].max().to_dict()
+
+
+# Function to scrape the standings and squad pages of the current season and derive all four datasets.
+# - fresh_table.csv: the current league table (from the current standings page)
+# - end_tables.csv: final tables of the previous seasons (immutable pages, fetched once and cached)
+# - imgurls.csv: team crests (from the squad pages)
+# - 2023_matches.csv: match rows, extended only with matches newer than the latest stored one per team;
+#   passing pages are fetched only for teams that have new matches.
+# Returns a dict with the number of new match rows and the HTTP client counters.
+def run(out_dir=DEFAULT_OUT_DIR, client=None, previous_seasons=DEFAULT_PREVIOUS_SEASONS):
+    client = client if client is not None else HttpClient()
+
+    standings_html = client.get(CURRENT_STANDINGS_URL)
+    season_year = page_season_year(standings_html)
+    fresh_table = parse_standings(standings_html, season_label(season_year))
+
+    # Finished seasons never change, so their pages are served from the cache forever.
+    past_years = list(range(season_year - 1, season_year - 1 - previous_seasons, -1))
+    past_pages = client.get_many([season_standings_url(year) for year in past_years], max_age=None)
+    end_tables = pd.concat(
+        [parse_standings(html, season_label(year)) for year, html in zip(past_years, past_pages)],
+        ignore_index=True,
+    ) if past_pages else None
+
+    team_urls = squad_urls(standings_html)
+    squad_pages = [parse_squad_page(html) for html in client.get_many(team_urls)]
+
+    matches_path = os.path.join(out_dir, MATCHES_CSV)
+    stored = _read_stored_matches(matches_path)
+    latest = _latest_match_dates(stored, season_year)
+
+    crests = []
+    pending = []
+    for team_url, squad in zip(team_urls, squad_pages):
+        team = team_name(team_url)
+        crests.append({'cresturl': squad['crest_url'], 'team': team})
+
+        matches = squad['matches']
+        if team in latest:
+            matches = matches[matches['Date'] > latest[team]]
+        if len(matches) and squad['passing_url']:
+            pending.append((team, matches, squad['passing_url']))
+
+    new_rows = []
+    passing_pages = client.get_many([passing_url for _, _, passing_url in pending])
+    for (team, matches, _), passing_html in zip(pending, passing_pages):
+        team_data = matches.merge(parse_passing(passing_html), on="Date")
+        team_data["Season"] = season_year
+        team_data["Team"] = team
+        team_data.columns = [c.lower() for c in team_data.columns]
+        new_rows.append(team_data)
+
+    if new_rows:
+        frames = ([stored] if stored is not None else []) + new_rows
+        _write_csv(pd.concat(frames, ignore_index=True), matches_path, index=True)
+    _write_csv(fresh_table, os.path.join(out_dir, FRESH_TABLE_CSV), index=False)
+    if end_tables is not None:
+        _write_csv(end_tables, os.path.join(out_dir, END_TABLES_CSV), index=False)
+
+    # Keep the crests of teams that are no longer in the league
+    crests_path = os.path.join(out_dir, IMG_URLS_CSV)
+    crests = pd.DataFrame([c for c in crests if c['cresturl']], columns=['cresturl', 'team'])
+    if os.path.exists(crests_path):
+        crests = pd.concat([crests, pd.read_csv(crests_path, index_col=0)], ignore_index=True)
+    _write_csv(crests.drop_duplicates(subset='team', keep='first').reset_index(drop=True), crests_path, index=True)
+
+    return {
+        'season': season_label(season_year),
+        'new_matches': sum(len(rows) for rows in new_rows),
+        'requests': client.requests_made,
+        'not_modified': client.not_modified,
+    }